@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run the benchmark suite and write the results as JSON.
+
+Run as `python -m benchmarks [--quick] [--only NAME ...] [--output FILE]'.
+Compare two result files with `python -m benchmarks.compare'.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+
+from benchmarks import (
+    bench_canonical,
+    bench_cli,
+    bench_compression,
+    bench_e2e,
+    bench_http2,
+    bench_memory,
+    bench_session,
+    bench_signer,
+    bench_stages,
+)
+
+# Each benchmark with its arguments for a full and a --quick run.
+BENCHMARKS = {
+    "stages": (bench_stages.run, {"count": 20000}, {"count": 2000}),
+    "canonical": (bench_canonical.run, {"count": 20000}, {"count": 2000}),
+    "signer": (bench_signer.run, {"count": 20000}, {"count": 2000}),
+    "session": (bench_session.run, {"count": 200}, {"count": 50}),
+    "cli": (bench_cli.run, {"runs": 10}, {"runs": 3}),
+    "e2e": (bench_e2e.run, {"count": 1000}, {"count": 100}),
+    "memory": (bench_memory.run, {"size_mb": 256}, {"size_mb": 32}),
+    "compression": (bench_compression.run, {"count": 20}, {"count": 3}),
+    "http2": (bench_http2.run, {"count": 1000}, {"count": 100}),
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names, quick=False):
+    """
+    Run the named benchmarks and return their results with a description of
+    the environment they ran in.
+    """
+    results = {}
+    for name in names:
+        func, full_kwargs, quick_kwargs = BENCHMARKS[name]
+        print("running {0}".format(name), file=sys.stderr)
+        results[name] = func(**(quick_kwargs if quick else full_kwargs))
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def main():
+    """
+    main method
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="use smaller counts, for a fast smoke run",
+    )
+    parser.add_argument(
+        "--only",
+        choices=list(BENCHMARKS),
+        nargs="+",
+        default=list(BENCHMARKS),
+        help="run only these benchmarks",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="write the results to this file instead of stdout",
+    )
+    args = parser.parse_args()
+
+    report = json.dumps(run(args.only, args.quick), indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
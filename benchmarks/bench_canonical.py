@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Canonical requests per second of the canonicalizer against the original
+implementation, for growing header sets.
+
+Run as `python -m benchmarks.bench_canonical'.
+"""
+
+import json
+import sys
+import time
+
+from urllib.parse import urlparse
+
+from cdpcurl.cdpv1sign import (
+    create_canonical_request_bytes,
+    create_canonical_request_string,
+)
+
+URI = "https://api.us-west-1.cdp.cloudera.com/api/v1/environments2/listEnvironments"
+HEADER_COUNTS = (2, 20, 100)
+
+
+def reference_canonical_request_string(method, uri, headers, auth_method):
+    """
+    The canonicalizer as it was originally written, with one pass over the
+    headers per header of interest, kept as a baseline and test oracle.
+    """
+    headers_of_interest = []
+    for header_name in ["content-type", "x-altus-date"]:
+        found = False
+        for key in headers:
+            key_lc = key.lower()
+            if headers[key] is not None and key_lc == header_name:
+                headers_of_interest.append(headers[key].strip())
+                found = True
+        if not found:
+            headers_of_interest.append("")
+
+    uri_components = urlparse(uri)
+    path = uri_components.path
+    if not path:
+        path = "/"
+    if uri_components.query:
+        path += "?" + uri_components.query
+
+    canonical_string = method.upper() + "\n"
+    canonical_string += "\n".join(headers_of_interest) + "\n"
+    canonical_string += path + "\n"
+    canonical_string += auth_method
+
+    return canonical_string
+
+
+def make_headers(count):
+    """
+    Return count headers, two of which are signed.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "x-altus-date": "Fri, 28 Aug 2020 20:38:38 GMT",
+    }
+    for i in range(count - len(headers)):
+        headers["X-Extra-Header-{0}".format(i)] = "value-{0}".format(i)
+    return headers
+
+
+def _ops_per_second(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def run(count=20000):
+    """
+    Canonicalize count requests with each implementation for each header set
+    size and report canonical requests per second.
+    """
+    results = {}
+    for header_count in HEADER_COUNTS:
+        headers = make_headers(header_count)
+        implementations = {
+            "reference": lambda: reference_canonical_request_string(
+                "POST",
+                URI,
+                headers,
+                "ed25519v1",
+            ).encode("utf-8"),
+            "string": lambda: create_canonical_request_string(
+                "POST",
+                URI,
+                headers,
+                "ed25519v1",
+            ),
+            "bytes": lambda: create_canonical_request_bytes(
+                "POST",
+                URI,
+                headers,
+                "ed25519v1",
+            ),
+        }
+        for name, func in implementations.items():
+            results["{0}_{1}_headers_per_second".format(name, header_count)] = (
+                _ops_per_second(func, count)
+            )
+    return results
+
+
+def main():
+    """
+    main method
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(json.dumps(run(count), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
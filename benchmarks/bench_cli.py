@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cold-start time of the command line entry points.
+
+Run as `python -m benchmarks.bench_cli'.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY
+
+COMMANDS = {
+    "python": [sys.executable, "-c", "pass"],
+    "cdpcurl_help": [sys.executable, "-m", "cdpcurl", "--help"],
+    "cdpsign": [
+        sys.executable,
+        "-m",
+        "cdpcurl.cdpv1sign",
+        "-X",
+        "POST",
+        "https://api.us-west-1.cdp.cloudera.com/api/v1/iam/getAccount",
+    ],
+}
+
+
+def _startup_ms(argv, runs, env):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, env=env, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+    }
+
+
+def run(runs=10):
+    """
+    Start each entry point runs times and report the median and minimum wall
+    time. The bare interpreter start-up is included for reference.
+    """
+    env = dict(
+        os.environ,
+        CDP_ACCESS_KEY_ID=ACCESS_KEY,
+        CDP_PRIVATE_KEY=PRIVATE_KEY,
+    )
+    return {name: _startup_ms(argv, runs, env) for name, argv in COMMANDS.items()}
+
+
+def main():
+    """
+    main method
+    """
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(json.dumps(run(runs), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
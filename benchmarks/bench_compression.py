@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bytes on the wire and wall time of a large list response for each response
+encoding, and of a large upload for each request body encoding.
+
+Run as `python -m benchmarks.bench_compression'.
+"""
+
+import json
+import sys
+import time
+
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.compression import BODY_ENCODINGS, accept_encoding
+from cdpcurl.mockserver import MockCdpServer
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY
+
+
+def _request(uri, headers, data, body_encoding=None):
+    start = time.perf_counter()
+    response = make_request(
+        "POST",
+        uri,
+        dict(headers, **{"Content-Type": "application/json"}),
+        data,
+        ACCESS_KEY,
+        PRIVATE_KEY,
+        False,
+        stream=True,
+        body_encoding=body_encoding,
+    )
+    size = sum(len(chunk) for chunk in response.iter_content(65536))
+    response.timings.finish(response)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    return response.timings, size, elapsed
+
+
+def _measure(count, uri, headers, data, body_encoding=None):
+    _request(uri, headers, data, body_encoding)
+    elapsed = []
+    for _ in range(count):
+        timings, size, seconds = _request(uri, headers, data, body_encoding)
+        elapsed.append(seconds)
+    elapsed.sort()
+    return {
+        "size_download": timings.size_download,
+        "size_upload": timings.size_upload,
+        "size_decoded": size,
+        "median_ms": elapsed[len(elapsed) // 2] * 1000,
+    }
+
+
+def run(count=20, items=5000, item_size=200):
+    """
+    Download a list of items, item_size bytes each, count times with each
+    available response encoding, and upload a request body of the same size
+    with each available request body encoding.
+    """
+    available = accept_encoding()
+    with MockCdpServer(
+        items=items,
+        page_size=items,
+        item_size=item_size,
+        compress_responses=True,
+    ) as server:
+        uri = server.url + "/api/v1/iam/listUsers"
+        results = {}
+        for encoding in ("identity", "gzip", "br", "zstd"):
+            if encoding == "identity" or encoding in available:
+                results["download_" + encoding] = _measure(
+                    count, uri, {"Accept-Encoding": encoding}, "{}"
+                )
+
+        data = json.dumps({"padding": ["x" * item_size] * items})
+        uri = server.url + "/api/v1/iam/getAccount"
+        results["upload_identity"] = _measure(count, uri, {}, data)
+        for encoding in BODY_ENCODINGS:
+            if encoding in available:
+                results["upload_" + encoding] = _measure(
+                    count, uri, {}, data, body_encoding=encoding
+                )
+    return results
+
+
+def main():
+    """
+    main method
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(json.dumps(run(count), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
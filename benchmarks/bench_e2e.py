@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+End-to-end requests per second and latency percentiles against a local
+HTTPS stub.
+
+Run as `python -m benchmarks.bench_e2e'.
+"""
+
+import json
+import sys
+import time
+import warnings
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY, https_stub_server
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.session import close_sessions
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _timed_request(uri):
+    start = time.perf_counter()
+    response = make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        "{}",
+        ACCESS_KEY,
+        PRIVATE_KEY,
+        False,
+        verify=False,
+        pool_size=64,
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def _run_level(uri, count, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Warm the connection pool before measuring.
+        list(executor.map(_timed_request, [uri] * concurrency))
+        start = time.perf_counter()
+        latencies = sorted(executor.map(_timed_request, [uri] * count))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": count,
+        "requests_per_second": count / elapsed,
+        "latency_p50_ms": _percentile(latencies, 0.5) * 1000,
+        "latency_p90_ms": _percentile(latencies, 0.9) * 1000,
+        "latency_p99_ms": _percentile(latencies, 0.99) * 1000,
+        "latency_max_ms": latencies[-1] * 1000,
+    }
+
+
+def run(count=500, concurrency_levels=(1, 8)):
+    """
+    Send count signed requests at each concurrency level.
+    """
+    warnings.simplefilter("ignore")
+    close_sessions()
+    with https_stub_server() as base_uri:
+        uri = base_uri + "/api/v1/iam/getAccount"
+        results = {
+            "concurrency_%d" % concurrency: _run_level(uri, count, concurrency)
+            for concurrency in concurrency_levels
+        }
+    close_sessions()
+    return results
+
+
+def main():
+    """
+    main method
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(json.dumps(run(count), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
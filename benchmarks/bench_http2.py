@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Requests per second, latency percentiles and connections opened for
+concurrent requests over HTTP/1.1 with a connection pool and over HTTP/2
+with multiplexing, against a local h2 stub server.
+
+Run as `python -m benchmarks.bench_http2'.
+"""
+
+import json
+import sys
+import time
+import warnings
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_e2e import _percentile
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY, https_stub_server
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.session import close_sessions
+
+
+def _timed_request(uri, http2, concurrency):
+    start = time.perf_counter()
+    response = make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        "{}",
+        ACCESS_KEY,
+        PRIVATE_KEY,
+        False,
+        verify=False,
+        pool_size=concurrency,
+        http2=http2,
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start, response.timings.num_connects
+
+
+def _run_level(uri, count, concurrency, http2):
+    # Start from a cold pool, so that the cost of opening connections is
+    # part of the measurement.
+    close_sessions()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        results = list(
+            executor.map(
+                lambda _: _timed_request(uri, http2, concurrency),
+                range(count),
+            )
+        )
+        elapsed = time.perf_counter() - start
+    close_sessions()
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "requests": count,
+        "connections": sum(connects for _, connects in results),
+        "requests_per_second": count / elapsed,
+        "latency_p50_ms": _percentile(latencies, 0.5) * 1000,
+        "latency_p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def run(count=1000, concurrency_levels=(1, 32)):
+    """
+    Send count signed requests at each concurrency level over each protocol.
+    """
+    warnings.simplefilter("ignore")
+    with https_stub_server(http2=True) as base_uri:
+        uri = base_uri + "/api/v1/iam/getAccount"
+        results = {}
+        for concurrency in concurrency_levels:
+            for name, http2 in (("http1", False), ("http2", True)):
+                results["%s_concurrency_%d" % (name, concurrency)] = _run_level(
+                    uri,
+                    count,
+                    concurrency,
+                    http2,
+                )
+    return results
+
+
+def main():
+    """
+    main method
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(json.dumps(run(count), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Peak memory of cdpcurl downloading and uploading large bodies.
+
+Run as `python -m benchmarks.bench_memory'. Needs os.wait4 (Linux, macOS).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY, StubHandler, https_stub_server
+
+CHUNK = b"x" * (1024 * 1024)
+
+
+class LargeBodyHandler(StubHandler):
+    """
+    Answers GET with a body of size_mb MiB and discards POST bodies.
+    """
+
+    size_mb = 256
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(self.size_mb * len(CHUNK)))
+        self.end_headers()
+        for _ in range(self.size_mb):
+            self.wfile.write(CHUNK)
+
+    def do_POST(self):
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, len(CHUNK))))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+
+def _run_cli(args):
+    env = dict(os.environ, CDP_ACCESS_KEY_ID=ACCESS_KEY, CDP_PRIVATE_KEY=PRIVATE_KEY)
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "cdpcurl", "-k", "-o", os.devnull] + args,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    _, status, rusage = os.wait4(process.pid, 0)
+    if status != 0:
+        raise Exception("cdpcurl exited with status {0}".format(status))
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    scale = 1024 if sys.platform == "darwin" else 1
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": rusage.ru_maxrss / scale / 1024,
+    }
+
+
+def run(size_mb=256):
+    """
+    Download and upload a body of size_mb MiB through the CLI and report the
+    peak resident memory of each run.
+    """
+    warnings.simplefilter("ignore")
+    LargeBodyHandler.size_mb = size_mb
+    with https_stub_server(
+        LargeBodyHandler
+    ) as base_uri, tempfile.TemporaryDirectory() as directory:
+        upload_path = os.path.join(directory, "upload.bin")
+        with open(upload_path, "wb") as upload_file:
+            for _ in range(size_mb):
+                upload_file.write(CHUNK)
+
+        results = {
+            "body_mb": size_mb,
+            "download": _run_cli([base_uri + "/large"]),
+            "upload": _run_cli(
+                ["-X", "POST", "-d", "@" + upload_path, base_uri + "/large"]
+            ),
+        }
+    return results
+
+
+def main():
+    """
+    main method
+    """
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    print(json.dumps(run(size_mb), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare one-shot sessions against the pooled keep-alive session.
+
+Run as `python -m benchmarks.bench_session'.
+"""
+
+import json
+import sys
+import time
+import warnings
+
+import requests
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY, https_stub_server
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.session import close_sessions
+
+
+def _time_requests(uri, count, session_factory):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = make_request(
+            "POST",
+            uri,
+            {"Content-Type": "application/json"},
+            "{}",
+            ACCESS_KEY,
+            PRIVATE_KEY,
+            False,
+            verify=False,
+            session=session_factory(),
+        )
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def run(count=200):
+    """
+    Time count signed requests against a local HTTPS stub, first with a fresh
+    session (and therefore a fresh TLS handshake) per call, then through the
+    shared pool.
+    """
+    warnings.simplefilter("ignore")
+    close_sessions()
+    with https_stub_server() as base_uri:
+        uri = base_uri + "/api/v1/iam/getAccount"
+        one_shot = _time_requests(uri, count, requests.Session)
+        pooled = _time_requests(uri, count, lambda: None)
+    close_sessions()
+
+    return {
+        "requests": count,
+        "one_shot_seconds": one_shot,
+        "pooled_seconds": pooled,
+        "one_shot_ms_per_request": one_shot * 1000 / count,
+        "pooled_ms_per_request": pooled * 1000 / count,
+        "speedup": one_shot / pooled,
+    }
+
+
+def main():
+    """
+    main method
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(json.dumps(run(count), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
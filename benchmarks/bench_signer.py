@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare signatures per second of the per-call stage functions against the
+cached signer.
+
+Run as `python -m benchmarks.bench_signer'.
+"""
+
+import json
+import sys
+import time
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY
+from cdpcurl.cdpv1sign import (
+    create_canonical_request_string,
+    create_encoded_authn_params_string,
+    create_signature_header,
+    create_signature_string,
+    make_signature_header,
+    sign_many,
+)
+
+URI = "https://api.us-west-1.cdp.cloudera.com/api/v1/environments2/listEnvironments"
+HEADERS = {
+    "Content-Type": "application/json",
+    "x-altus-date": "Fri, 28 Aug 2020 20:38:38 GMT",
+}
+
+
+def _uncached_signature_header(method, uri, headers, access_key, private_key):
+    canonical_string = create_canonical_request_string(
+        method,
+        uri,
+        headers,
+        "ed25519v1",
+    )
+    signature = create_signature_string(canonical_string, private_key)
+    encoded_authn_params = create_encoded_authn_params_string(
+        access_key,
+        "ed25519v1",
+    )
+    return create_signature_header(encoded_authn_params, signature)
+
+
+def _signatures_per_second(sign, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        sign("POST", URI, HEADERS, ACCESS_KEY, PRIVATE_KEY)
+    return count / (time.perf_counter() - start)
+
+
+def _sign_many_per_second(count):
+    requests = [("POST", URI, "application/json")] * count
+    start = time.perf_counter()
+    sign_many(requests, ACCESS_KEY, PRIVATE_KEY)
+    return count / (time.perf_counter() - start)
+
+
+def run(count=20000):
+    """
+    Sign count requests with each implementation.
+    """
+    uncached = _signatures_per_second(_uncached_signature_header, count)
+    cached = _signatures_per_second(make_signature_header, count)
+    bulk = _sign_many_per_second(count)
+    return {
+        "signatures": count,
+        "uncached_per_second": uncached,
+        "cached_per_second": cached,
+        "sign_many_per_second": bulk,
+        "speedup": cached / uncached,
+    }
+
+
+def main():
+    """
+    main method
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(json.dumps(run(count), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
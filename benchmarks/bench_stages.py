@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput of each stage of the signing pipeline.
+
+Run as `python -m benchmarks.bench_stages'.
+"""
+
+import json
+import sys
+import time
+
+from email.utils import formatdate
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY
+from cdpcurl.cdpv1sign import (
+    create_canonical_request_string,
+    create_encoded_authn_params_string,
+    create_signature_header,
+    create_signature_string,
+    get_signer,
+    make_signature_header,
+)
+from cdpcurl.clock import http_date
+
+URI = "https://api.us-west-1.cdp.cloudera.com/api/v1/environments2/listEnvironments"
+HEADERS = {
+    "Content-Type": "application/json",
+    "x-altus-date": "Fri, 28 Aug 2020 20:38:38 GMT",
+}
+CANONICAL_STRING = create_canonical_request_string("POST", URI, HEADERS, "ed25519v1")
+ENCODED_AUTHN_PARAMS = create_encoded_authn_params_string(ACCESS_KEY, "ed25519v1")
+SIGNATURE = create_signature_string(CANONICAL_STRING, PRIVATE_KEY)
+
+
+def _ops_per_second(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def run(count=20000):
+    """
+    Call each stage count times and report calls per second.
+    """
+    signer = get_signer(ACCESS_KEY, PRIVATE_KEY)
+    stages = {
+        "formatdate": lambda: formatdate(usegmt=True),
+        "http_date": http_date,
+        "create_canonical_request_string": lambda: create_canonical_request_string(
+            "POST",
+            URI,
+            HEADERS,
+            "ed25519v1",
+        ),
+        "create_signature_string": lambda: create_signature_string(
+            CANONICAL_STRING,
+            PRIVATE_KEY,
+        ),
+        "create_encoded_authn_params_string": lambda: create_encoded_authn_params_string(
+            ACCESS_KEY,
+            "ed25519v1",
+        ),
+        "create_signature_header": lambda: create_signature_header(
+            ENCODED_AUTHN_PARAMS,
+            SIGNATURE,
+        ),
+        "signer_sign_canonical_string": lambda: signer.sign_canonical_string(
+            CANONICAL_STRING,
+        ),
+        "make_signature_header": lambda: make_signature_header(
+            "POST",
+            URI,
+            HEADERS,
+            ACCESS_KEY,
+            PRIVATE_KEY,
+        ),
+    }
+    return {
+        name + "_per_second": _ops_per_second(func, count)
+        for name, func in stages.items()
+    }
+
+
+def main():
+    """
+    main method
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(json.dumps(run(count), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare two benchmark result files written by `python -m benchmarks'.
+
+Run as `python -m benchmarks.compare BASELINE.json CANDIDATE.json'.
+"""
+
+import argparse
+import json
+import sys
+
+
+def flatten(results, prefix=""):
+    """
+    Flatten nested results into a dict of dotted names to numbers.
+    """
+    flat = {}
+    for key, value in results.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, candidate):
+    """
+    Return (name, baseline value, candidate value, percent change) for each
+    metric present in both results.
+    """
+    baseline = flatten(baseline["results"])
+    candidate = flatten(candidate["results"])
+    rows = []
+    for name in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[name], candidate[name]
+        change = (after - before) / before * 100 if before else None
+        rows.append((name, before, after, change))
+    return rows
+
+
+def main():
+    """
+    main method
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.candidate) as candidate_file:
+        candidate = json.load(candidate_file)
+
+    rows = compare(baseline, candidate)
+    width = max([len(row[0]) for row in rows] + [6])
+    print(
+        "{0:<{width}}  {1:>14}  {2:>14}  {3:>8}".format(
+            "metric",
+            (baseline["meta"].get("commit") or "baseline")[:12],
+            (candidate["meta"].get("commit") or "candidate")[:12],
+            "change",
+            width=width,
+        )
+    )
+    for name, before, after, change in rows:
+        print(
+            "{0:<{width}}  {1:>14.6g}  {2:>14.6g}  {3:>8}".format(
+                name,
+                before,
+                after,
+                "n/a" if change is None else "{0:+.1f}%".format(change),
+                width=width,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local HTTPS stub server for benchmarks
+"""
+
+import datetime
+import ssl
+import tempfile
+import threading
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+PRIVATE_KEY = "Mzjg58S93/qdg0HuVP6PsLSRDTe+fQZ5++v/mkUUx4k="
+ACCESS_KEY = "ABC"
+
+
+def write_self_signed_cert(directory):
+    """
+    Write a self-signed certificate and key for localhost into directory and
+    return their paths.
+    """
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.DNSName("localhost")]),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = directory + "/cert.pem"
+    key_path = directory + "/key.pem"
+    with open(cert_path, "wb") as cert_file:
+        cert_file.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as key_file:
+        key_file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ),
+        )
+    return cert_path, key_path
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive handler answering every request with a small JSON body.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b'{"ok": true}'
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def _serve_h2(sock, body):
+    # Answer every stream on one HTTP/2 connection with body, in the order
+    # the requests complete.
+    import h2.config
+    import h2.connection
+    import h2.events
+
+    connection = h2.connection.H2Connection(
+        h2.config.H2Configuration(client_side=False),
+    )
+    connection.initiate_connection()
+    sock.sendall(connection.data_to_send())
+    while True:
+        try:
+            data = sock.recv(65536)
+        except OSError:
+            return
+        if not data:
+            return
+        for event in connection.receive_data(data):
+            if isinstance(event, h2.events.DataReceived):
+                connection.acknowledge_received_data(
+                    event.flow_controlled_length,
+                    event.stream_id,
+                )
+            elif isinstance(event, h2.events.StreamEnded):
+                connection.send_headers(
+                    event.stream_id,
+                    [
+                        (":status", "200"),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(body))),
+                    ],
+                )
+                connection.send_data(event.stream_id, body, end_stream=True)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                sock.sendall(connection.data_to_send())
+                return
+        sock.sendall(connection.data_to_send())
+
+
+class _H2StubServer(ThreadingHTTPServer):
+    """
+    Serves connections that negotiated h2 with _serve_h2, and the rest with
+    the HTTP/1.1 handler.
+    """
+
+    def finish_request(self, request, client_address):
+        if request.selected_alpn_protocol() == "h2":
+            _serve_h2(request, self.RequestHandlerClass.body)
+        else:
+            super().finish_request(request, client_address)
+
+
+@contextmanager
+def https_stub_server(handler=StubHandler, http2=False):
+    """
+    Run a TLS stub server on a random localhost port for the duration of the
+    context and yield its base URL. Clients must pass verify=False.
+
+    With http2, clients that offer h2 with ALPN are answered over HTTP/2
+    with the body of handler, and other clients over HTTP/1.1 by handler.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = write_self_signed_cert(directory)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+
+        if http2:
+            context.set_alpn_protocols(["h2", "http/1.1"])
+            server = _H2StubServer(("127.0.0.1", 0), handler)
+        else:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield "https://localhost:{0}".format(server.server_address[1])
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio counterpart of make_request, built on aiohttp
+
+Install with the `async' extra: pip install cdpcurl[async]
+"""
+
+import asyncio
+import ssl
+
+from cdpcurl.cdpv1sign import make_signature_header
+from cdpcurl.clock import http_date
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_POOL_SIZE = 100
+
+
+def _require_aiohttp():
+    if aiohttp is None:
+        raise ImportError(
+            "aiohttp is required for asyncio support; "
+            "install it with 'pip install cdpcurl[async]'",
+        )
+
+
+def _ssl_setting(verify):
+    if verify is False:
+        return False
+    if isinstance(verify, str):
+        return ssl.create_default_context(cafile=verify)
+    return None
+
+
+def create_session(verify=True, pool_size=DEFAULT_POOL_SIZE):
+    """
+    Create an aiohttp session whose connector keeps up to pool_size
+    connections open. Must be called from a running event loop.
+    """
+    _require_aiohttp()
+    connector = aiohttp.TCPConnector(limit=pool_size, ssl=_ssl_setting(verify))
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def make_request(
+    method,
+    uri,
+    headers,
+    data,
+    access_key,
+    private_key,
+    data_binary,
+    session,
+    semaphore=None,
+    clock=None,
+):
+    """
+    Make HTTP request with CDP request signing on an aiohttp session
+
+    The response body is read before returning, so the connection is released
+    back to the pool and the body is available from the returned response.
+
+    clock is called for the x-altus-date, and defaults to
+    cdpcurl.clock.http_date, as in cdpcurl.cdpcurl.make_request.
+
+    :return: aiohttp.ClientResponse
+    :param method: str
+    :param uri: str
+    :param headers: dict
+    :param data: str
+    :param access_key: str
+    :param private_key: str
+    :param data_binary: bool
+    :param session: aiohttp.ClientSession
+    :param semaphore: asyncio.Semaphore
+    :param clock: callable
+    """
+
+    if "x-altus-auth" in headers:
+        raise Exception("Malformed request: x-altus-auth found in headers")
+
+    if "x-altus-date" in headers:
+        raise Exception("Malformed request: x-altus-date found in headers")
+
+    if not data_binary:
+        data = data.encode("utf-8")
+
+    if clock is None:
+        clock = http_date
+
+    if semaphore is None:
+        return await __send_request(
+            method,
+            uri,
+            headers,
+            data,
+            access_key,
+            private_key,
+            session,
+            clock,
+        )
+
+    async with semaphore:
+        return await __send_request(
+            method,
+            uri,
+            headers,
+            data,
+            access_key,
+            private_key,
+            session,
+            clock,
+        )
+
+
+async def __send_request(
+    method, uri, headers, data, access_key, private_key, session, clock
+):
+    # Sign as late as possible, so time spent waiting on the semaphore does
+    # not age the x-altus-date header.
+    headers["x-altus-date"] = clock()
+    headers["x-altus-auth"] = make_signature_header(
+        method,
+        uri,
+        headers,
+        access_key,
+        private_key,
+    )
+
+    async with session.request(method, uri, headers=headers, data=data) as response:
+        await response.read()
+        return response
+
+
+class AsyncClient:
+    """
+    Signs and sends CDP requests from asyncio code, sharing one connection
+    pool and limiting the number of requests in flight.
+
+    Use as an async context manager, or call close() when done.
+    """
+
+    def __init__(
+        self,
+        access_key,
+        private_key,
+        verify=True,
+        concurrency=DEFAULT_CONCURRENCY,
+        pool_size=DEFAULT_POOL_SIZE,
+        clock=None,
+    ):
+        _require_aiohttp()
+        self.access_key = access_key
+        self.private_key = private_key
+        self.verify = verify
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self.clock = clock
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _ensure_session(self):
+        # aiohttp sessions and semaphores must be created on the event loop
+        # that uses them, so defer creation until the first request.
+        if self._session is None:
+            self._session = create_session(self.verify, self.pool_size)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def request(self, method, uri, headers=None, data="", data_binary=False):
+        """
+        Make a signed request. headers defaults to a JSON content type.
+        """
+        self._ensure_session()
+        if headers is None:
+            headers = {"Content-Type": "application/json"}
+        return await make_request(
+            method,
+            uri,
+            headers,
+            data,
+            self.access_key,
+            self.private_key,
+            data_binary,
+            self._session,
+            self._semaphore,
+            self.clock,
+        )
+
+    async def close(self):
+        """
+        Close the underlying connection pool.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+requests authentication plugin for CDP request signing
+
+Import CdpV1Auth from cdpcurl.cdpv1sign, which loads this module, and
+requests with it, on first use.
+"""
+
+import time
+
+from urllib.parse import urljoin, urlparse
+
+from requests.auth import AuthBase
+from requests.utils import requote_uri
+
+from cdpcurl.cdpv1sign import get_signer
+from cdpcurl.clock import http_date
+from cdpcurl.timing import current_timings
+
+
+class CdpV1Auth(AuthBase):
+    """
+    Signs requests with a CDP credential as they are sent.
+
+    Pass it as the auth of a requests session or request. The x-altus-date
+    and x-altus-auth headers are computed on the prepared request, so every
+    request and every retry made through a session gets a fresh signature,
+    and the caller's headers are never modified. Redirects that requests
+    follows are signed again for the next hop; the signature is dropped
+    when a redirect leaves the host.
+
+    clock is called for the x-altus-date of each request, and defaults to
+    cdpcurl.clock.http_date. With a cdpcurl.skew.SkewEstimator as skew,
+    every response updates the skew estimate of its host, and the date is
+    offset by the estimate.
+    """
+
+    def __init__(self, access_key, private_key, clock=None, skew=None):
+        self.signer = get_signer(access_key, private_key)
+        self.clock = http_date if clock is None else clock
+        self.skew = skew
+
+    def __call__(self, request):
+        self.sign(request, request.method, request.url, request.headers)
+        if self.skew is not None:
+            request.register_hook("response", self.observe_skew)
+        request.register_hook("response", self.handle_redirect)
+        return request
+
+    def sign(self, request, method, url, signed_headers):
+        """
+        Set the signing headers of request for method, url and the
+        Content-Type of signed_headers.
+        """
+        start = time.perf_counter()
+        offset = self.skew.offset(url) if self.skew is not None else 0.0
+        date = self.clock(offset) if offset else self.clock()
+        headers = {"x-altus-date": date}
+        content_type = signed_headers.get("Content-Type")
+        if content_type is not None:
+            headers["Content-Type"] = content_type
+        request.headers["x-altus-date"] = date
+        request.headers["x-altus-auth"] = self.signer.sign(method, url, headers)
+        timings = current_timings()
+        if timings is not None:
+            timings.signing += time.perf_counter() - start
+
+    def observe_skew(self, response, **kwargs):
+        """
+        Response hook that updates the skew estimate from response.
+        """
+        self.skew.observe(response)
+        return response
+
+    def handle_redirect(self, response, **kwargs):
+        """
+        Response hook that signs the request that requests will send next
+        when response is a redirect.
+        """
+        if not response.is_redirect:
+            return response
+
+        # requests follows a redirect with a copy of the request it was
+        # sent, so sign that for the next hop, and keep a copy of what was
+        # actually sent as the request of the redirect response. The next
+        # hop's method, URL and Content-Type are worked out as in
+        # requests.Session.resolve_redirects.
+        request = response.request
+        response.request = request.copy()
+
+        location = response.headers["location"]
+        url = urljoin(response.url, requote_uri(location))
+        if urlparse(url).hostname != urlparse(request.url).hostname:
+            request.headers.pop("x-altus-date", None)
+            request.headers.pop("x-altus-auth", None)
+            return response
+
+        method = request.method
+        if response.status_code in (302, 303) and method != "HEAD":
+            method = "GET"
+        elif response.status_code == 301 and method == "POST":
+            method = "GET"
+        signed_headers = request.headers
+        if response.status_code not in (307, 308):
+            signed_headers = {}
+        self.sign(request, method, url, signed_headers)
+        return response
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Batch execution of signed requests read from a JSONL manifest
+"""
+
+import json
+import threading
+
+from collections import deque
+
+from cdpcurl.cdpconfig import load_cdp_config
+
+DEFAULT_CONCURRENCY = 4
+
+
+class CredentialResolver:
+    """
+    Resolve and cache the (access_key, private_key) pair for each profile, so
+    that the credentials file is read at most once per profile.
+    """
+
+    def __init__(self, access_key, private_key, credentials_path, profile):
+        self.credentials_path = credentials_path
+        self.default_profile = profile
+        self._default = (access_key, private_key)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, profile=None):
+        """
+        Return the credentials for profile, or the default credentials when no
+        profile is given.
+        """
+        if profile is None:
+            key = None
+            access_key, private_key = self._default
+            profile = self.default_profile
+        else:
+            key = profile
+            access_key, private_key = None, None
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = load_cdp_config(
+                    access_key,
+                    private_key,
+                    self.credentials_path,
+                    profile,
+                )
+            return self._cache[key]
+
+
+def parse_request_line(line, default_headers):
+    """
+    Parse one manifest line into the keyword arguments of a request. Returns
+    None for blank lines.
+    """
+    if not line.strip():
+        return None
+
+    spec = json.loads(line)
+    if not isinstance(spec, dict):
+        raise ValueError("Batch request must be a JSON object")
+    if "uri" not in spec:
+        raise ValueError("Batch request is missing 'uri'")
+
+    data = spec.get("data", "")
+    if data is None:
+        data = ""
+    elif not isinstance(data, str):
+        data = json.dumps(data)
+
+    headers = spec.get("headers")
+    if headers is None:
+        headers = dict(default_headers)
+    elif isinstance(headers, list):
+        headers = dict(header.split(": ", 1) for header in headers)
+    else:
+        headers = dict(headers)
+
+    return {
+        "method": spec.get("method", "GET"),
+        "uri": spec["uri"],
+        "data": data,
+        "headers": headers,
+        "profile": spec.get("profile"),
+    }
+
+
+def response_body(response):
+    """
+    Return the body of a response as parsed JSON, or as text if it is not
+    JSON.
+    """
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def format_result(line_number, response=None, error=None):
+    """
+    Build the JSON-serializable result record for one manifest line.
+    """
+    if error is not None:
+        return {"line": line_number, "error": str(error)}
+
+    return {
+        "line": line_number,
+        "status": response.status_code,
+        "body": response_body(response),
+    }
+
+
+def run_batch(
+    lines,
+    request_fn,
+    default_headers,
+    concurrency=DEFAULT_CONCURRENCY,
+    ordered=True,
+):
+    """
+    Execute the requests described by lines on a pool of concurrency workers
+    and yield one result record per request.
+
+    request_fn is called with the parsed request keyword arguments and returns
+    a response. At most twice concurrency requests are read ahead of the
+    results, so arbitrarily large manifests run in bounded memory. Results are
+    yielded in input order unless ordered is False, in which case they are
+    yielded as they complete.
+    """
+    if concurrency < 1:
+        raise ValueError("Batch concurrency must be at least 1")
+
+    def execute(line_number, line):
+        try:
+            spec = parse_request_line(line, default_headers)
+            if spec is None:
+                return None
+            return format_result(line_number, response=request_fn(**spec))
+        except Exception as error:  # pylint: disable=broad-except
+            return format_result(line_number, error=error)
+
+    window = concurrency * 2
+    from concurrent.futures import (
+        FIRST_COMPLETED,
+        ThreadPoolExecutor,
+        as_completed,
+        wait,
+    )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        if ordered:
+            pending = deque()
+            for line_number, line in enumerate(lines, 1):
+                pending.append(executor.submit(execute, line_number, line))
+                if len(pending) >= window:
+                    result = pending.popleft().result()
+                    if result is not None:
+                        yield result
+            while pending:
+                result = pending.popleft().result()
+                if result is not None:
+                    yield result
+        else:
+            pending = set()
+            for line_number, line in enumerate(lines, 1):
+                pending.add(executor.submit(execute, line_number, line))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        if result is not None:
+                            yield result
+            for future in as_completed(pending):
+                result = future.result()
+                if result is not None:
+                    yield result
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+On-disk cache of responses to read-only requests
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from cdpcurl.retry import is_read_only_operation
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 1000
+CACHE_MODES = ("use", "refresh", "bypass")
+STAT_NAMES = ("hits", "misses", "stores", "evictions", "bypasses")
+
+_ENTRY_SUFFIX = ".entry"
+_STATS_FILE = "stats.json"
+
+
+def default_cache_dir():
+    """
+    Return the default cache directory, under $XDG_CACHE_HOME or ~/.cache.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"),
+        ".cache",
+    )
+    return os.path.join(base, "cdpcurl")
+
+
+def is_cacheable(method, uri):
+    """
+    Return whether the response to a request may be cached: GET and HEAD
+    requests, and POSTs to read-only describe*, get* and list* operations.
+    """
+    method = method.upper()
+    if method in ("GET", "HEAD"):
+        return True
+    return method == "POST" and is_read_only_operation(uri)
+
+
+def cache_key(method, uri, access_key, body):
+    """
+    Compute the cache key of a request from its method, URI, access key and
+    a hash of its body.
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    digest = hashlib.sha256()
+    for part in (method.upper(), uri, access_key or ""):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(hashlib.sha256(body or b"").digest())
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    Caches successful responses to read-only requests on disk for ttl
+    seconds.
+
+    Each response is stored in its own file, written to a temporary file and
+    renamed into place, so that concurrent readers in any process see either
+    the old or the new entry, never a partial one. Reading an entry marks it
+    as recently used. Once the cache holds more than max_entries entries or
+    max_bytes bytes, the least recently used entries are evicted.
+
+    In "use" mode fresh entries are served and misses are stored. In
+    "refresh" mode entries are not served, but responses are stored. In
+    "bypass" mode the cache is not touched at all.
+
+    Hit and miss counts for this process are kept in stats; flush_stats()
+    adds them to the totals kept in the cache directory.
+    """
+
+    def __init__(
+        self,
+        directory=None,
+        ttl=60,
+        max_bytes=DEFAULT_MAX_BYTES,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        mode="use",
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError("Unknown cache mode '{0}'".format(mode))
+        self.directory = directory or default_cache_dir()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.mode = mode
+        self.stats = dict.fromkeys(STAT_NAMES, 0)
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, key):
+        """
+        Return the fresh cached response for key as a (metadata, body)
+        tuple, or None.
+        """
+        if self.mode != "use":
+            self._count("bypasses")
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                metadata = json.loads(entry_file.readline())
+                if time.time() - metadata["created"] > self.ttl:
+                    self._count("misses")
+                    return None
+                body = entry_file.read()
+        except (OSError, ValueError, KeyError):
+            self._count("misses")
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count("hits")
+        return metadata, body
+
+    def put(self, key, metadata, body):
+        """
+        Store a response under key, then evict old entries if the cache is
+        over its limits.
+        """
+        if self.mode == "bypass":
+            return
+        if len(body) > self.max_bytes:
+            return
+
+        import tempfile
+
+        metadata = dict(metadata, created=time.time())
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(json.dumps(metadata).encode("utf-8") + b"\n")
+                temp_file.write(body)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self._count("stores")
+        self.evict()
+
+    def entries(self):
+        """
+        Return (mtime, size, path) for every entry, least recently used
+        first.
+        """
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache is within
+        max_entries and max_bytes.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                self._count("evictions")
+            except FileNotFoundError:
+                # Another process evicted it first.
+                pass
+            count -= 1
+            total -= size
+
+    def flush_stats(self):
+        """
+        Add this process's counts to the totals in the cache directory and
+        reset them. Returns the updated totals, with the current number of
+        entries and bytes.
+        """
+        with self._lock:
+            counts = self.stats
+            self.stats = dict.fromkeys(STAT_NAMES, 0)
+
+        path = os.path.join(self.directory, _STATS_FILE)
+        with open(path, "a+") as stats_file:
+            if fcntl is not None:
+                fcntl.flock(stats_file, fcntl.LOCK_EX)
+            stats_file.seek(0)
+            try:
+                totals = json.loads(stats_file.read() or "{}")
+            except ValueError:
+                totals = {}
+            for name in STAT_NAMES:
+                totals[name] = totals.get(name, 0) + counts[name]
+            stats_file.seek(0)
+            stats_file.truncate()
+            stats_file.write(json.dumps(totals))
+            stats_file.flush()
+
+        entries = self.entries()
+        totals["entries"] = len(entries)
+        totals["bytes"] = sum(size for _, size, _ in entries)
+        return totals
+
+
+def cached_response(metadata, body):
+    """
+    Build a requests Response from a cache entry.
+    """
+    from requests import Response
+    from requests.structures import CaseInsensitiveDict
+
+    response = Response()
+    response.status_code = metadata["status"]
+    response.reason = metadata.get("reason")
+    response.url = metadata.get("url")
+    response.headers = CaseInsensitiveDict(metadata.get("headers") or {})
+    response.encoding = metadata.get("encoding")
+    response._content = body
+    response._content_consumed = True
+    response.from_cache = True
+    return response
+
+
+def response_metadata(response):
+    """
+    Describe a response for storing it in the cache.
+    """
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key.lower() not in ("content-encoding", "transfer-encoding", "connection")
+    }
+    headers["Content-Length"] = str(len(response.content))
+    return {
+        "status": response.status_code,
+        "reason": response.reason,
+        "url": response.url,
+        "headers": headers,
+        "encoding": response.encoding,
+    }
@@ -61,3 +61,16 @@ def load_cdp_config(
                 raise Exception(msg.format(profile))
 
     return access_key, private_key
+
+
+def list_profiles(credentials_path):
+    """
+    Return the names of the profiles in the credentials file, in file order.
+    """
+    if not os.path.exists(credentials_path):
+        msg = "Credentials file '{0}' does not exist"
+        raise Exception(msg.format(credentials_path))
+
+    config = configparser.ConfigParser()
+    config.read(credentials_path)
+    return config.sections()
@@ -19,142 +19,869 @@
 cdpcurl implementation
 """
 
-import datetime
-import http.client
-import io
+import json
 import os
-import re
+import stat
 import sys
+import threading
+import time
 
-import configargparse
-import requests
-
-from contextlib import redirect_stdout, redirect_stderr
-from email.utils import formatdate
+from contextlib import ExitStack
 
 from cdpcurl.cdpv1sign import make_signature_header
-from cdpcurl.cdpconfig import load_cdp_config
+from cdpcurl.cache import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    ResponseCache,
+    cache_key,
+    cached_response,
+    default_cache_dir,
+    is_cacheable,
+    response_metadata,
+)
+from cdpcurl.clock import http_date
+from cdpcurl.compression import BODY_ENCODINGS, accept_encoding, compress_body
+from cdpcurl.fanout import (
+    expand_profiles,
+    fanout_targets,
+    is_profile_pattern,
+    run_fanout,
+    split_list,
+)
+from cdpcurl.batch import DEFAULT_CONCURRENCY, CredentialResolver, run_batch
+from cdpcurl.paginate import iter_items, paginate
+from cdpcurl.ratelimit import parse_rate
+from cdpcurl.retry import (
+    DEFAULT_RETRY_METHODS,
+    DEFAULT_RETRY_ON,
+    RetryPolicy,
+    RetryState,
+)
+from cdpcurl.session import DEFAULT_POOL_SIZE, get_session
+from cdpcurl.skew import SkewEstimator
+from cdpcurl.timing import Timings, timing, write_out
+from cdpcurl.trace import Tracer, tracing
+
+INPUT_CHUNK_SIZE = 64 * 1024
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+
+def __send_request(
+    uri,
+    data,
+    headers,
+    method,
+    verify,
+    tracer,
+    timings,
+    session,
+    stream,
+    auth=None,
+):
+    kwargs = {}
+    if auth is not None:
+        kwargs["auth"] = auth
+    with tracing(tracer), timing(timings):
+        return session.request(
+            method,
+            uri,
+            headers=headers,
+            data=data,
+            verify=verify,
+            stream=stream,
+            **kwargs,
+        )
 
 
-def __format_logs(data):
-    formatted_output = ""
-    lines = data.strip().split("\n")
+def make_request(
+    method,
+    uri,
+    headers,
+    data,
+    access_key,
+    private_key,
+    data_binary,
+    verify=True,
+    verbose=False,
+    session=None,
+    pool_size=DEFAULT_POOL_SIZE,
+    stream=False,
+    tracer=None,
+    retry=None,
+    rate_limiter=None,
+    concurrency=None,
+    cache=None,
+    body_encoding=None,
+    http2=False,
+    auth=None,
+    clock=None,
+    skew=None,
+):
+    """
+    Make HTTP request with CDP request signing
 
-    send_re = r"^(send: b'|send: )(.*?)'(\r\n)?$"
-    reply_re = r"^reply: '(.*?)'$"
-    header_re = r"^header: (.*?)[:]\s(.*)$"
+    Requests are sent through a keep-alive session so that repeated calls to
+    the same host reuse warm connections. Unless a session is given, the shared
+    session for the scheme, host and TLS settings of the uri is used. With
+    stream, the response body is not read until the caller consumes it.
 
-    for line in lines:
-        if not line:
-            continue
+    With verbose, or when a tracer is given, connection, request and response
+    events are traced as they happen. Tracing requires a session whose
+    adapter is a CdpHTTPAdapter, as the pooled sessions are; verbose traces
+    to stdout.
 
-        match = re.match(send_re, line)
-        if match:
-            decoded_bytes = match.group(2).encode("latin-1").decode("unicode_escape")
-            for subline in decoded_bytes.splitlines():
-                formatted_output += f"> {subline}\n"
-            continue
+    The returned response carries a cdpcurl.timing.Timings breakdown of the
+    request as response.timings. For streamed responses, call
+    response.timings.finish(response) once the body has been consumed.
 
-        match = re.match(reply_re, line)
-        if match:
-            decoded_bytes = match.group(1).encode("latin-1").decode("unicode_escape")
-            for subline in decoded_bytes.splitlines():
-                formatted_output += f"< {subline}\n"
-            continue
+    With a cdpcurl.retry.RetryPolicy as retry, throttled and failed requests
+    are retried as the policy allows, each attempt signed with a fresh
+    x-altus-date. Bodies that can only be read once, such as generators, are
+    never retried. The number of retries and the time spent backing off are
+    reported in response.timings.
 
-        match = re.match(header_re, line)
-        if match:
-            formatted_output += f"< {match.group(1)}: {match.group(2)}\n"
-            continue
+    A cdpcurl.ratelimit.TokenBucket as rate_limiter limits how often
+    requests are sent, and a cdpcurl.ratelimit.AdaptiveConcurrency as
+    concurrency limits how many are in flight at once and learns from each
+    response. Share them between requests, for instance with get_rate_limiter
+    and get_concurrency_controller. Every attempt waits for both; the time
+    spent waiting is reported as response.timings.time_queued. A streamed
+    request counts as in flight until its response headers arrive.
 
-        formatted_output += f"* {line}\n"
+    With a cdpcurl.cache.ResponseCache as cache, a fresh cached response to
+    a read-only request with the same method, URI, access key and body is
+    returned without signing or sending anything; such responses have
+    from_cache set. Successful responses to read-only requests are stored;
+    streamed responses only when their Content-Length is within the cache's
+    max_bytes, in which case the body is read into memory until its decoded
+    size is over max_bytes too.
 
-    return formatted_output.strip()
+    With body_encoding, gzip or zstd, the body is compressed, as it is read
+    for streamed bodies, and sent with a matching Content-Encoding.
+    Responses are decoded as they are read, whatever their Content-Encoding.
 
+    With http2, the shared session sends requests over HTTP/2 where the
+    server agrees to it during the TLS handshake, multiplexing concurrent
+    requests over a single connection, and over HTTP/1.1 otherwise. It needs
+    the httpx and h2 packages.
 
-def __send_request(uri, data, headers, method, verify, verbose):
+    The x-altus-date and x-altus-auth headers are added to headers before
+    each attempt is sent, unless a cdpcurl.cdpv1sign.CdpV1Auth for the same
+    credential is given as auth, in which case the request is signed as it
+    is sent, redirects are signed for each hop, and headers is not modified
+    by signing. access_key is still used for the cache, rate limiter and
+    concurrency controller.
 
-    if verbose:
-        http.client.HTTPConnection.debuglevel = 1
+    clock is called for the x-altus-date of each attempt, and defaults to
+    cdpcurl.clock.http_date, which formats the current time once per second.
+    Pass a cdpcurl.clock.DateProvider with its own time source to control
+    the date, for instance in tests. It is not used with auth, which has its
+    own clock.
 
-        output_buffer = io.StringIO()
+    With a cdpcurl.skew.SkewEstimator as skew, every response updates the
+    skew estimate of its host from its Date header, and the x-altus-date is
+    offset by the estimate; give the auth the same estimator. A request
+    rejected because its date was too far off is sent again at once with a
+    corrected date, once, and counted in timings.num_skew_rejections.
 
-        with redirect_stdout(output_buffer), redirect_stderr(output_buffer):
-            response = requests.request(
-                method,
+    :return: http request object
+    :param method: str
+    :param uri: str
+    :param headers: dict
+    :param data: str, bytes, file object or iterable of bytes
+    :param profile: str
+    :param access_key: str
+    :param private_key: str
+    :param data_binary: bool
+    :param verify: bool
+    :param verbose: bool
+    :param session: requests.Session
+    :param pool_size: int
+    :param stream: bool
+    :param tracer: cdpcurl.trace.Tracer
+    :param retry: cdpcurl.retry.RetryPolicy
+    :param rate_limiter: cdpcurl.ratelimit.TokenBucket
+    :param concurrency: cdpcurl.ratelimit.AdaptiveConcurrency
+    :param cache: cdpcurl.cache.ResponseCache
+    :param body_encoding: str
+    :param http2: bool
+    :param auth: cdpcurl.cdpv1sign.CdpV1Auth
+    :param clock: callable
+    :param skew: cdpcurl.skew.SkewEstimator
+    """
+
+    if "x-altus-auth" in headers:
+        raise Exception("Malformed request: x-altus-auth found in headers")
+
+    if "x-altus-date" in headers:
+        raise Exception("Malformed request: x-altus-date found in headers")
+
+    key = None
+    if (
+        cache is not None
+        and isinstance(data, (bytes, str, type(None)))
+        and is_cacheable(method, uri)
+    ):
+        key = cache_key(method, uri, access_key, data)
+        entry = cache.get(key)
+        if entry is not None:
+            response = cached_response(*entry)
+            response.timings = Timings()
+            response.timings.begin()
+            response.timings.finish(response)
+            return response
+
+    if session is None:
+        session = get_session(uri, verify, pool_size, http2)
+
+    if clock is None:
+        clock = http_date
+
+    if not data_binary and isinstance(data, str):
+        data = data.encode("utf-8")
+
+    if body_encoding is not None:
+        # Content-Encoding is not part of the canonical request string, so
+        # the signature is unaffected.
+        data = compress_body(data, body_encoding)
+        headers["Content-Encoding"] = body_encoding
+
+    if verbose and tracer is None:
+        tracer = Tracer(sys.stdout)
+
+    retry_state = None
+    replayable = True
+    body_start = None
+    if (retry is not None and retry.retries > 0) or skew is not None:
+        # A body that can be read only once cannot be sent again. File
+        # bodies are rewound to where they started for each attempt.
+        if hasattr(data, "read"):
+            try:
+                body_start = data.tell() if data.seekable() else None
+            except (AttributeError, OSError):
+                body_start = None
+            replayable = body_start is not None
+        elif data is not None and not isinstance(data, (bytes, str)):
+            replayable = False
+        if retry is not None and retry.retries > 0 and replayable:
+            retry_state = RetryState(retry)
+    skew_retried = False
+
+    timings = Timings()
+    while True:
+        # Wait for the rate limit and a concurrency slot before signing, so
+        # that the x-altus-date is not stale by the time the request is sent.
+        queued_start = time.perf_counter()
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        slot = concurrency.acquire() if concurrency is not None else None
+        timings.time_queued += time.perf_counter() - queued_start
+
+        signing_start = time.perf_counter()
+        try:
+            if auth is None:
+                offset = skew.offset(uri) if skew is not None else 0.0
+                headers["x-altus-date"] = clock(offset) if offset else clock()
+
+                headers["x-altus-auth"] = make_signature_header(
+                    method,
+                    uri,
+                    headers,
+                    access_key,
+                    private_key,
+                )
+        except Exception:
+            if concurrency is not None:
+                concurrency.release(slot)
+            raise
+
+        # With auth, the request is signed as it is sent, and the time that
+        # takes is added to timings.signing then.
+        timings.signing = time.perf_counter() - signing_start if auth is None else 0.0
+
+        timings.begin()
+        try:
+            response = __send_request(
                 uri,
-                headers=headers,
-                data=data,
-                verify=verify,
+                data,
+                headers,
+                method,
+                verify,
+                tracer,
+                timings,
+                session,
+                stream,
+                auth,
             )
+        except Exception as error:  # pylint: disable=broad-except
+            if concurrency is not None:
+                concurrency.release(slot, error=True)
+            if retry_state is None:
+                raise
+            delay = __backoff(retry_state, method, uri, tracer, error=error)
+            if delay is None:
+                raise
+        else:
+            if concurrency is not None:
+                concurrency.release(
+                    slot,
+                    response.status_code,
+                    time.perf_counter() - timings.start,
+                )
+            if skew is not None and __skew_rejected(skew, auth, response, tracer):
+                timings.num_skew_rejections += 1
+                retry_now = replayable and not skew_retried
+            else:
+                retry_now = False
+            if retry_now:
+                # The estimate now reflects the server's clock, so send the
+                # request again at once with a corrected date, once.
+                skew_retried = True
+                response.close()
+            else:
+                if retry_state is None:
+                    break
+                delay = __backoff(
+                    retry_state,
+                    method,
+                    uri,
+                    tracer,
+                    response=response,
+                )
+                if delay is None:
+                    break
+                response.close()
 
-        print(__format_logs(output_buffer.getvalue()))
+        # Sign the next attempt afresh, so that its x-altus-date is current.
+        if auth is None:
+            del headers["x-altus-date"]
+            del headers["x-altus-auth"]
+        if hasattr(data, "read"):
+            data.seek(body_start)
 
-        return response
-    else:
-        return requests.request(
-            method,
-            uri,
-            headers=headers,
-            data=data,
-            verify=verify,
+    if retry_state is not None:
+        timings.num_retries = retry_state.num_retries
+        timings.time_backoff = retry_state.time_backoff
+    response.timings = timings
+    response.from_cache = False
+    if key is not None and response.status_code == 200:
+        # A streamed body is only read into memory for the cache when its
+        # length is known to be within the cap, so that large responses stay
+        # streamed.
+        length = response.headers.get("Content-Length")
+        if not stream:
+            cache.put(key, response_metadata(response), response.content)
+        elif length is not None and length.isdigit() and int(length) <= cache.max_bytes:
+            # The length is that of the encoded body, so the decoded body may
+            # still be over the cap.
+            if __read_content(response, cache.max_bytes):
+                cache.put(key, response_metadata(response), response.content)
+    if not stream:
+        timings.finish(response)
+    return response
+
+
+class _PartlyReadRaw:
+    """
+    Stands in for the raw stream of a response whose decoded body has been
+    partly read: stream() yields the chunks already read, then the rest.
+    """
+
+    def __init__(self, raw, chunks, rest):
+        self._raw = raw
+        self._chunks = chunks
+        self._rest = rest
+
+    def stream(self, amt=None, decode_content=True):  # pylint: disable=unused-argument
+        """
+        Yield the rest of the body, decoded as requests asks for.
+        """
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+        yield from self._rest
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+def __read_content(response, max_bytes):
+    # Reads the decoded body of a streamed response into response.content
+    # and returns True, unless it is over max_bytes. Then the chunks read so
+    # far are put back in front of the rest of the body, which is left to
+    # stream, and False is returned.
+    chunks = []
+    size = 0
+    body = response.iter_content(OUTPUT_CHUNK_SIZE)
+    for chunk in body:
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            response.raw = _PartlyReadRaw(response.raw, chunks, body)
+            return False
+    # pylint: disable=protected-access
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    return True
+
+
+def __skew_rejected(skew, auth, response, tracer):
+    # An auth with the same estimator has already observed the response.
+    if getattr(auth, "skew", None) is not skew:
+        skew.observe(response)
+    if not skew.is_rejection(response):
+        return False
+    if tracer is not None:
+        estimate = skew.estimate(response.url)
+        tracer.info(
+            "Request rejected for clock skew; server clock is {0:+.0f} "
+            "seconds from ours".format(estimate),
+            skew=estimate,
         )
+    return True
 
 
-def __now():
-    return datetime.datetime.now(datetime.timezone.utc)
+def __backoff(retry_state, method, uri, tracer, response=None, error=None):
+    retries_left = retry_state.policy.retries - retry_state.num_retries - 1
+    delay = retry_state.backoff(method, uri, response, error)
+    if delay is not None and tracer is not None:
+        if response is not None:
+            problem = "HTTP error {0}".format(response.status_code)
+        else:
+            problem = str(error)
+        tracer.info(
+            "Problem: {0}. Retried after {1:.3f} seconds, {2} retries left".format(
+                problem,
+                delay,
+                retries_left,
+            ),
+            retry=retry_state.num_retries,
+            delay=delay,
+        )
+    return delay
 
 
-def make_request(
+def make_paginated_request(
     method,
     uri,
     headers,
     data,
     access_key,
     private_key,
-    data_binary,
     verify=True,
     verbose=False,
+    session=None,
+    pool_size=DEFAULT_POOL_SIZE,
+    page_size=None,
+    tracer=None,
+    retry=None,
+    rate_limiter=None,
+    concurrency=None,
+    cache=None,
+    body_encoding=None,
+    http2=False,
+    auth=None,
+    clock=None,
+    skew=None,
 ):
     """
-    Make HTTP request with CDP request signing
+    Make a CDP list* request and follow nextToken through every page, signing
+    each page request afresh
 
-    :return: http request object
+    Yields each page as parsed JSON. The next page is requested while the
+    current one is being consumed. headers is not modified.
+
+    :return: generator of dict
     :param method: str
     :param uri: str
     :param headers: dict
     :param data: str
-    :param profile: str
     :param access_key: str
     :param private_key: str
-    :param data_binary: bool
     :param verify: bool
     :param verbose: bool
+    :param session: requests.Session
+    :param pool_size: int
+    :param page_size: int
+    :param tracer: cdpcurl.trace.Tracer
+    :param retry: cdpcurl.retry.RetryPolicy
+    :param rate_limiter: cdpcurl.ratelimit.TokenBucket
+    :param concurrency: cdpcurl.ratelimit.AdaptiveConcurrency
+    :param cache: cdpcurl.cache.ResponseCache
+    :param body_encoding: str
+    :param http2: bool
+    :param auth: cdpcurl.cdpv1sign.CdpV1Auth
+    :param clock: callable
+    :param skew: cdpcurl.skew.SkewEstimator
     """
 
-    if "x-altus-auth" in headers:
-        raise Exception("Malformed request: x-altus-auth found in headers")
+    def send_page(page_data):
+        return make_request(
+            method,
+            uri,
+            dict(headers),
+            page_data,
+            access_key,
+            private_key,
+            False,
+            verify,
+            verbose,
+            session,
+            pool_size,
+            tracer=tracer,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            concurrency=concurrency,
+            cache=cache,
+            body_encoding=body_encoding,
+            http2=http2,
+            auth=auth,
+            clock=clock,
+            skew=skew,
+        )
 
-    if "x-altus-date" in headers:
-        raise Exception("Malformed request: x-altus-date found in headers")
+    return paginate(send_page, data, page_size)
+
+
+def __run_paginated(args, client, headers, data, tracer):
+    pages = client.paginate(
+        args.uri,
+        data,
+        page_size=args.page_size,
+        headers=headers,
+        method=args.request,
+        tracer=tracer,
+    )
+    if args.paginate_items is not None:
+        pages = iter_items(pages, args.paginate_items)
+
+    from requests import HTTPError
+
+    try:
+        for page in pages:
+            print(json.dumps(page), flush=True)
+    except HTTPError as error:
+        print(error.response.text)
+        raise
+
+    return 0
+
+
+def __iter_chunks(input_file):
+    while True:
+        chunk = input_file.read(INPUT_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def __open_data(data, exit_stack):
+    # "-d @file" and "-d @-" stream the body from the file or stdin as raw
+    # bytes. Regular files are sent with a Content-Length; pipes are sent
+    # with chunked transfer encoding, since their size is not known up front.
+    if data is None or not data.startswith("@"):
+        return data
+
+    filename = data[1:]
+    if filename == "-":
+        stdin = sys.stdin.buffer
+        if stat.S_ISREG(os.fstat(stdin.fileno()).st_mode):
+            return stdin
+        return __iter_chunks(stdin)
+
+    return exit_stack.enter_context(open(filename, "rb"))
+
+
+def __escape_bytes_literal(chunk):
+    # Escape as the body of a single-quoted bytes literal, matching repr().
+    literal = repr(chunk)
+    if literal.startswith('b"'):
+        return literal[2:-1].replace("'", "\\'")
+    return literal[2:-1]
+
+
+def __write_response(response, output_format, output):
+    if output is None:
+        sys.stdout.flush()
+        output_file = sys.stdout.buffer
+    else:
+        output_file = open(output, "wb")
+
+    try:
+        if output_format == "bytes-literal":
+            output_file.write(b"b'")
+        for chunk in response.iter_content(OUTPUT_CHUNK_SIZE):
+            if output_format == "bytes-literal":
+                chunk = __escape_bytes_literal(chunk).encode("ascii")
+            output_file.write(chunk)
+        if output_format == "bytes-literal":
+            output_file.write(b"'")
+        if output is None or output_format == "bytes-literal":
+            output_file.write(b"\n")
+        output_file.flush()
+    finally:
+        if output is not None:
+            output_file.close()
+
+
+def __response_cache(args):
+    if args.cache_ttl is None:
+        return None
+    mode = "use"
+    if args.cache_bypass:
+        mode = "bypass"
+    elif args.cache_refresh:
+        mode = "refresh"
+    return ResponseCache(
+        args.cache_dir,
+        args.cache_ttl,
+        max_bytes=args.cache_max_size,
+        max_entries=args.cache_max_entries,
+        mode=mode,
+    )
+
+
+def __retry_policy(args):
+    if not args.retry:
+        return None
+    return RetryPolicy(
+        retries=args.retry,
+        max_time=args.retry_max_time,
+        retry_on=args.retry_on,
+        retry_methods=args.retry_methods,
+    )
+
+
+def __parse_rate(value):
+    import configargparse
+
+    try:
+        return parse_rate(value)
+    except ValueError as error:
+        raise configargparse.ArgumentTypeError(str(error)) from None
+
+
+def __parse_status_list(value):
+    import configargparse
+
+    try:
+        return frozenset(int(status) for status in value.split(",") if status)
+    except ValueError:
+        raise configargparse.ArgumentTypeError(
+            "expected a comma-separated list of HTTP status codes, got '{0}'".format(
+                value
+            )
+        ) from None
+
+
+def __parse_method_list(value):
+    return frozenset(method.strip().upper() for method in value.split(",") if method)
+
+
+def __client(args, cache, skew, **credentials):
+    from cdpcurl.client import CdpClient
+
+    return CdpClient(
+        verify=args.insecure,
+        pool_size=args.concurrency,
+        retry=__retry_policy(args),
+        rate=args.rate,
+        burst=args.burst,
+        adaptive_concurrency=args.concurrency if args.adaptive_concurrency else None,
+        cache=cache,
+        body_encoding=args.compress_body,
+        http2=args.http2,
+        skew=skew,
+        **credentials,
+    )
+
+
+def __request_fn(args, resolver, cache, skew):
+    # One client per credential, shared by every request made with it.
+    clients = {}
+    clients_lock = threading.Lock()
+
+    def request_fn(method, uri, data, headers, profile):
+        credentials = resolver.resolve(profile)
+        with clients_lock:
+            client = clients.get(credentials)
+            if client is None:
+                access_key, private_key = credentials
+                client = __client(
+                    args,
+                    cache,
+                    skew,
+                    access_key=access_key,
+                    private_key=private_key,
+                )
+                clients[credentials] = client
+        return client.request(
+            method,
+            uri,
+            data,
+            headers,
+            data_binary=args.data_binary,
+        )
+
+    return request_fn
+
+
+def __credential_resolver(args, credentials_path):
+    return CredentialResolver(
+        args.access_key,
+        args.private_key,
+        credentials_path,
+        args.profile,
+    )
+
+
+def __run_batch(args, default_headers, credentials_path, cache, skew):
+    request_fn = __request_fn(
+        args,
+        __credential_resolver(args, credentials_path),
+        cache,
+        skew,
+    )
+
+    if args.batch == "-":
+        batch_file = sys.stdin
+    else:
+        batch_file = open(args.batch, "r")
+
+    failed = False
+    with batch_file:
+        for result in run_batch(
+            batch_file,
+            request_fn,
+            default_headers,
+            args.concurrency,
+            ordered=not args.unordered,
+        ):
+            if "error" in result or result["status"] >= 400:
+                failed = True
+            print(json.dumps(result), flush=True)
+
+    return 1 if failed else 0
 
-    headers["x-altus-date"] = formatdate(
-        timeval=__now().timestamp(),
-        usegmt=True,
+
+def __run_fanout(args, headers, credentials_path, cache, skew):
+    if is_profile_pattern(args.profile):
+        profiles = expand_profiles(args.profile, credentials_path)
+    else:
+        profiles = [args.profile]
+    targets = fanout_targets(
+        args.uri,
+        profiles,
+        hosts=split_list(args.hosts) if args.hosts else None,
+        regions=split_list(args.region) if args.region else None,
     )
+    request_fn = __request_fn(
+        args,
+        __credential_resolver(args, credentials_path),
+        cache,
+        skew,
+    )
+
+    def send(profile, **kwargs):
+        # A single profile is resolved as the default one, so that
+        # --access_key and --private_key still apply.
+        if len(profiles) == 1:
+            profile = None
+        return request_fn(profile=profile, **kwargs)
+
+    with ExitStack() as exit_stack:
+        # Every target is sent the same body, so read it into memory.
+        data = __open_data(args.data, exit_stack)
+        if hasattr(data, "read"):
+            data = data.read()
+        elif data is not None and not isinstance(data, str):
+            data = b"".join(data)
+
+        results = run_fanout(
+            targets,
+            send,
+            args.request,
+            data,
+            headers,
+            args.concurrency,
+            ordered=not args.unordered,
+        )
+        if args.merge:
+            results = list(results)
+
+        failed = False
+        for result in results:
+            if "error" in result or result["status"] >= 400:
+                failed = True
+            if not args.merge:
+                print(json.dumps(result), flush=True)
 
-    headers["x-altus-auth"] = make_signature_header(
-        method,
-        uri,
-        headers,
-        access_key,
-        private_key,
+    if args.merge:
+        print(json.dumps(results, indent=2), flush=True)
+
+    return 1 if failed else 0
+
+
+def __run_request(args, headers, credentials_path, cache, skew):
+    if args.batch is not None:
+        return __run_batch(args, headers, credentials_path, cache, skew)
+
+    if is_profile_pattern(args.profile) or args.hosts or args.region:
+        return __run_fanout(args, headers, credentials_path, cache, skew)
+
+    client = __client(
+        args,
+        cache,
+        skew,
+        access_key=args.access_key,
+        private_key=args.private_key,
+        profile=args.profile,
+        credentials_path=credentials_path,
     )
 
-    if data_binary:
-        return __send_request(uri, data, headers, method, verify, verbose)
+    with ExitStack() as exit_stack:
+        data = __open_data(args.data, exit_stack)
+
+        tracer = None
+        if args.verbose:
+            trace_output = sys.stdout
+            if args.trace_file is not None:
+                trace_output = exit_stack.enter_context(open(args.trace_file, "w"))
+            tracer = Tracer(trace_output, args.trace_format)
+
+        if args.paginate or args.paginate_items is not None:
+            # Every page is sent with the same small JSON body, so read it
+            # into memory.
+            if hasattr(data, "read"):
+                data = data.read()
+            elif not isinstance(data, str):
+                data = b"".join(data)
+            return __run_paginated(args, client, headers, data, tracer)
+
+        response = client.request(
+            args.request,
+            args.uri,
+            data,
+            headers,
+            stream=True,
+            data_binary=args.data_binary,
+            tracer=tracer,
+        )
+
+        with response:
+            __write_response(response, args.output_format, args.output)
+        response.timings.finish(response)
+
+    if args.write_out is not None:
+        format_string = args.write_out
+        if format_string.startswith("@"):
+            with open(format_string[1:], "r") as format_file:
+                format_string = format_file.read()
+        sys.stdout.write(write_out(format_string, response.timings.variables()))
+        sys.stdout.flush()
 
-    return __send_request(uri, data.encode("utf-8"), headers, method, verify, verbose)
+    response.raise_for_status()
+
+    return 0
 
 
 def inner_main(argv):
@@ -163,6 +890,8 @@ def inner_main(argv):
     """
     default_headers = ["Content-Type: application/json"]
 
+    import configargparse
+
     parser = configargparse.ArgumentParser(
         description="CURL with CDP request signing",
         formatter_class=configargparse.ArgumentDefaultsHelpFormatter,
@@ -175,6 +904,17 @@ def inner_main(argv):
         help="log request and response headers",
         default=False,
     )
+    parser.add_argument(
+        "--trace-format",
+        help="format of verbose output",
+        choices=["text", "json"],
+        default="text",
+    )
+    parser.add_argument(
+        "--trace-file",
+        metavar="FILE",
+        help="Write verbose output to FILE instead of stdout",
+    )
     parser.add_argument(
         "-f",
         "--output-format",
@@ -182,6 +922,42 @@ def inner_main(argv):
         choices=["string", "bytes-literal"],
         default="string",
     )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="Write the response body to FILE instead of stdout",
+    )
+    parser.add_argument(
+        "-w",
+        "--write-out",
+        metavar="FORMAT",
+        help="Write FORMAT to stdout after the response body, replacing "
+        "curl-style variables such as %%{http_code}, %%{time_total} and "
+        "%%{time_signing}; %%{json} writes all of them as JSON. "
+        "@FILE reads FORMAT from FILE.",
+    )
+    parser.add_argument(
+        "--compressed",
+        action="store_true",
+        help="Request a compressed response, offering every encoding that can "
+        "be decoded (gzip, deflate, and br and zstd when installed), and "
+        "decode it as it streams",
+        default=False,
+    )
+    parser.add_argument(
+        "--compress-body",
+        choices=BODY_ENCODINGS,
+        help="Compress the request body and send it with a matching "
+        "Content-Encoding",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use HTTP/2 where the server supports it, falling back to "
+        "HTTP/1.1. Batch requests to one host share a single connection",
+        default=False,
+    )
     parser.add_argument(
         "-X",
         "--request",
@@ -207,23 +983,220 @@ def inner_main(argv):
     )
     parser.add_argument(
         "--profile",
-        help="CDP profile",
+        help="CDP profile, or a comma-separated list of profiles and glob "
+        "patterns such as 'prod-*' to send the request with each of",
         default="default",
         env_var="CDP_PROFILE",
     )
     parser.add_argument("--access_key", env_var="CDP_ACCESS_KEY_ID")
     parser.add_argument("--private_key", env_var="CDP_PRIVATE_KEY")
 
-    parser.add_argument("uri")
+    parser.add_argument(
+        "--retry",
+        metavar="NUM",
+        type=int,
+        help="Retry throttled (429) requests, and idempotent requests that "
+        "fail with a --retry-on status or a connection error, up to NUM "
+        "times, backing off exponentially with jitter or as Retry-After "
+        "asks. Each attempt is signed afresh.",
+        default=0,
+    )
+    parser.add_argument(
+        "--retry-max-time",
+        metavar="SECONDS",
+        type=float,
+        help="Do not start a retry more than SECONDS after the first attempt",
+    )
+    parser.add_argument(
+        "--retry-on",
+        metavar="CODES",
+        type=__parse_status_list,
+        help="Comma-separated HTTP status codes to retry idempotent requests on",
+        default=",".join(str(status) for status in sorted(DEFAULT_RETRY_ON)),
+    )
+    parser.add_argument(
+        "--retry-methods",
+        metavar="METHODS",
+        type=__parse_method_list,
+        help="Comma-separated HTTP methods that are safe to retry. POSTs to "
+        "describe*, get* and list* operations are always safe.",
+        default=",".join(sorted(DEFAULT_RETRY_METHODS)),
+    )
+
+    parser.add_argument(
+        "--rate",
+        metavar="N/s",
+        type=__parse_rate,
+        help="Send at most N requests per second (or N/m per minute) to each "
+        "host with each access key",
+    )
+    parser.add_argument(
+        "--burst",
+        metavar="N",
+        type=int,
+        help="Allow bursts of up to N requests at once when limiting the "
+        "rate; unset means one second's worth",
+    )
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Adapt the number of requests in flight to each host, up to "
+        "--concurrency, growing it while responses are healthy and halving "
+        "it on 429, 503, errors or rising latency",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--cache-ttl",
+        metavar="SECONDS",
+        type=float,
+        help="Cache successful responses to GET requests and to describe*, "
+        "get* and list* calls for SECONDS, and answer repeated calls with "
+        "the same URI, credential and body from the cache",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Directory to cache responses in",
+        default=default_cache_dir(),
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        metavar="BYTES",
+        type=int,
+        help="Evict the least recently used responses beyond this many bytes",
+        default=DEFAULT_MAX_BYTES,
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        metavar="N",
+        type=int,
+        help="Evict the least recently used responses beyond this many",
+        default=DEFAULT_MAX_ENTRIES,
+    )
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument(
+        "--cache-bypass",
+        action="store_true",
+        help="Neither read nor write the response cache",
+        default=False,
+    )
+    cache_mode.add_argument(
+        "--cache-refresh",
+        action="store_true",
+        help="Ignore cached responses, but cache the new ones",
+        default=False,
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Write cumulative cache hit and miss counts to stderr as JSON",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--skew-correction",
+        action="store_true",
+        help="Offset x-altus-date by the clock skew of each host, learned "
+        "from the Date of its responses, and send a request rejected for "
+        "clock skew once more at once with a corrected date",
+        default=False,
+    )
+    parser.add_argument(
+        "--skew-state",
+        metavar="FILE",
+        help="Keep the estimated clock skew of each host in FILE, so that "
+        "later runs sign with a corrected x-altus-date from the start; "
+        "implies --skew-correction",
+    )
+
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Read one JSON request per line from FILE ('-' for stdin) and "
+        "write one JSON result per line, tagged with the input line number. "
+        "Each request may set method, uri, data, headers and profile.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Number of batch or fan-out requests to run concurrently",
+        default=DEFAULT_CONCURRENCY,
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write batch and fan-out results in completion order instead of "
+        "input order",
+        default=False,
+    )
+
+    fanout_hosts = parser.add_mutually_exclusive_group()
+    fanout_hosts.add_argument(
+        "--hosts",
+        metavar="HOSTS",
+        help="Comma-separated hosts, with optional ports, to send the "
+        "request to in place of the host of the URI",
+    )
+    fanout_hosts.add_argument(
+        "--region",
+        metavar="REGIONS",
+        help="Comma-separated CDP regions to send the request to, replacing "
+        "the region of an api.REGION.cdp.cloudera.com URI or a {region} "
+        "placeholder",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="When sending to several profiles, hosts or regions, write one "
+        "JSON array of results instead of one JSON result per line",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--paginate",
+        action="store_true",
+        help="Follow nextToken through every page of a list call, writing "
+        "each page as one line of JSON as it arrives",
+        default=False,
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        help="pageSize to request for each page when paginating",
+    )
+    parser.add_argument(
+        "--paginate-items",
+        metavar="KEY",
+        help="When paginating, write each element of the array KEY of every "
+        "page as one line of JSON instead of whole pages",
+    )
+
+    parser.add_argument("uri", nargs="?")
 
     args = parser.parse_args(argv)
 
-    data = args.data
+    if args.batch is None and args.uri is None:
+        parser.error("the following arguments are required: uri")
 
-    if data is not None and data.startswith("@"):
-        filename = data[1:]
-        with open(filename, "r") as post_data_file:
-            data = post_data_file.read()
+    several = is_profile_pattern(args.profile) or args.hosts or args.region
+    if args.batch is not None or several:
+        # Each of these describes a single request.
+        if args.verbose or args.trace_file is not None or args.write_out is not None:
+            parser.error(
+                "-v, --trace-file and -w cannot be combined with --batch or "
+                "with several profiles, hosts or regions"
+            )
+
+    if several:
+        if args.batch is not None:
+            parser.error(
+                "--batch cannot be combined with several profiles, hosts or regions"
+            )
+        if args.paginate or args.paginate_items is not None:
+            parser.error(
+                "pagination cannot be combined with several profiles, hosts or regions"
+            )
 
     if args.header is None:
         args.header = default_headers
@@ -231,48 +1204,39 @@ def inner_main(argv):
     # pylint: disable=unnecessary-comprehension
     headers = {k: v for (k, v) in map(lambda s: s.split(": "), args.header)}
 
+    if args.compressed:
+        headers["Accept-Encoding"] = accept_encoding()
+
     # TODO Enable credential path per argument
     credentials_path = os.path.expanduser("~") + "/.cdp/credentials"
-    args.access_key, args.private_key = load_cdp_config(
-        args.access_key,
-        args.private_key,
-        credentials_path,
-        args.profile,
-    )
-
-    if args.access_key is None:
-        raise ValueError("No access key is available")
 
-    if args.private_key is None:
-        raise ValueError("No private key is available")
-
-    response = make_request(
-        args.request,
-        args.uri,
-        headers,
-        data,
-        args.access_key,
-        args.private_key,
-        args.data_binary,
-        args.insecure,
-        args.verbose,
-    )
-
-    if args.output_format == "bytes-literal":
-        print(response.text.encode("utf-8"))
-    else:
-        print(response.text)
-
-    response.raise_for_status()
-
-    return 0
+    cache = __response_cache(args)
+    skew = None
+    if args.skew_correction or args.skew_state is not None:
+        skew = SkewEstimator(state_path=args.skew_state)
+    try:
+        return __run_request(args, headers, credentials_path, cache, skew)
+    finally:
+        if cache is not None:
+            stats = cache.flush_stats()
+            if args.cache_stats:
+                print(json.dumps(stats), file=sys.stderr)
+        if skew is not None:
+            if skew.rejections:
+                print(
+                    "cdpcurl: {0} request(s) rejected for clock skew".format(
+                        skew.rejections
+                    ),
+                    file=sys.stderr,
+                )
+            skew.save()
 
 
 def main():
     """
     main method
     """
-    inner_main(sys.argv[1:])
+    return inner_main(sys.argv[1:])
 
 
 if __name__ == "__main__":
@@ -19,41 +19,25 @@
 Implementation of the CDP API signature specification, V1
 """
 
+import functools
+import itertools
 import json
 import os
 import sys
 
-import configargparse
-
 from base64 import b64decode, urlsafe_b64encode
 from collections import OrderedDict
-from cryptography.hazmat.primitives.asymmetric import ed25519
-from email.utils import formatdate
 from urllib.parse import urlparse
 
 from cdpcurl.cdpconfig import load_cdp_config
+from cdpcurl.clock import http_date
 
+BATCH_CHUNK_SIZE = 50000
+PARALLEL_SIGN_CHUNK_SIZE = 2000
 
-def create_canonical_request_string(
-    method,
-    uri,
-    headers,
-    auth_method,
-):
-    """
-    Create a canonical request string from aspects of the request.
-    """
-    headers_of_interest = []
-    for header_name in ["content-type", "x-altus-date"]:
-        found = False
-        for key in headers:
-            key_lc = key.lower()
-            if headers[key] is not None and key_lc == header_name:
-                headers_of_interest.append(headers[key].strip())
-                found = True
-        if not found:
-            headers_of_interest.append("")
 
+@functools.lru_cache(maxsize=1024)
+def _canonical_path(uri):
     # Our signature verification with treat a query with no = as part of the
     # path, so we do as well. It appears to be a behavior left to the server
     # implementation, and python and our java servlet implementation disagree.
@@ -63,13 +47,58 @@ def create_canonical_request_string(
         path = "/"
     if uri_components.query:
         path += "?" + uri_components.query
+    return path
+
+
+def _canonical_parts(method, uri, headers, auth_method):
+    # Scan the headers once. A header may appear more than once under keys
+    # that differ only in case, in which case every value is kept, in order.
+    content_types = []
+    dates = []
+    for key in headers:
+        key_lc = key.lower()
+        if key_lc == "content-type":
+            values = content_types
+        elif key_lc == "x-altus-date":
+            values = dates
+        else:
+            continue
+        value = headers[key]
+        if value is not None:
+            values.append(value.strip())
+
+    parts = [method.upper()]
+    parts.extend(content_types or ("",))
+    parts.extend(dates or ("",))
+    parts.append(_canonical_path(uri))
+    parts.append(auth_method)
+    return parts
+
+
+def create_canonical_request_string(
+    method,
+    uri,
+    headers,
+    auth_method,
+):
+    """
+    Create a canonical request string from aspects of the request.
+    """
+    return "\n".join(_canonical_parts(method, uri, headers, auth_method))
 
-    canonical_string = method.upper() + "\n"
-    canonical_string += "\n".join(headers_of_interest) + "\n"
-    canonical_string += path + "\n"
-    canonical_string += auth_method
 
-    return canonical_string
+def create_canonical_request_bytes(
+    method,
+    uri,
+    headers,
+    auth_method,
+):
+    """
+    Create the UTF-8 encoded canonical request string, ready to be signed.
+    """
+    return "\n".join(_canonical_parts(method, uri, headers, auth_method)).encode(
+        "utf-8"
+    )
 
 
 def create_signature_string(
@@ -83,6 +112,8 @@ def create_signature_string(
     seed = b64decode(private_key)
     if len(seed) != 32:
         raise Exception("Not an Ed25519 private key!")
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+
     parsed_private_key = ed25519.Ed25519PrivateKey.from_private_bytes(seed)
 
     signature = parsed_private_key.sign(
@@ -116,6 +147,85 @@ def create_signature_header(
     return "%s.%s" % (encoded_authn_params.decode("utf-8"), signature)
 
 
+class CdpV1Signer:
+    """
+    Signs requests with one CDP credential.
+
+    The private key is decoded and parsed, and the authentication parameters
+    are encoded, once when the signer is created rather than for every
+    request.
+    """
+
+    auth_method = "ed25519v1"
+
+    def __init__(self, access_key, private_key):
+        if len(private_key) != 44:
+            raise Exception("Only ed25519v1 keys are supported!")
+
+        seed = b64decode(private_key)
+        if len(seed) != 32:
+            raise Exception("Not an Ed25519 private key!")
+
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+
+        self.access_key = access_key
+        self._private_key = ed25519.Ed25519PrivateKey.from_private_bytes(seed)
+        self._encoded_authn_params = create_encoded_authn_params_string(
+            access_key,
+            self.auth_method,
+        ).decode("utf-8")
+
+    def sign(self, method, uri, headers):
+        """
+        Generates the value to be used for the x-altus-auth header in the
+        service call.
+        """
+        return self.sign_canonical_bytes(
+            create_canonical_request_bytes(
+                method,
+                uri,
+                headers,
+                self.auth_method,
+            ),
+        )
+
+    def sign_canonical_string(self, canonical_string):
+        """
+        Generates the x-altus-auth header value for an already canonicalized
+        request.
+        """
+        return self.sign_canonical_bytes(canonical_string.encode("utf-8"))
+
+    def sign_canonical_bytes(self, canonical_bytes):
+        """
+        Generates the x-altus-auth header value for an already canonicalized
+        and encoded request.
+        """
+        signature = self._private_key.sign(canonical_bytes)
+        return "%s.%s" % (
+            self._encoded_authn_params,
+            urlsafe_b64encode(signature).strip().decode("utf-8"),
+        )
+
+
+def __getattr__(name):
+    # CdpV1Auth is a requests auth plugin, and requests is slow to import, so
+    # it is only loaded when it is asked for.
+    if name == "CdpV1Auth":
+        from cdpcurl.auth import CdpV1Auth
+
+        return CdpV1Auth
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+@functools.lru_cache(maxsize=32)
+def get_signer(access_key, private_key):
+    """
+    Return the cached signer for a credential, creating it on first use.
+    """
+    return CdpV1Signer(access_key, private_key)
+
+
 def make_signature_header(
     method,
     uri,
@@ -127,30 +237,148 @@ def make_signature_header(
     Generates the value to be used for the x-altus-auth header in the service
     call.
     """
-    if len(private_key) != 44:
-        raise Exception("Only ed25519v1 keys are supported!")
+    return get_signer(access_key, private_key).sign(method, uri, headers)
 
-    auth_method = "ed25519v1"
 
-    canonical_string = create_canonical_request_string(
-        method,
-        uri,
-        headers,
-        auth_method,
-    )
-    signature = create_signature_string(canonical_string, private_key)
-    encoded_authn_params = create_encoded_authn_params_string(
-        access_key,
-        auth_method,
+_worker_signer = None
+
+
+def _init_sign_worker(access_key, private_key):
+    global _worker_signer  # pylint: disable=global-statement
+    _worker_signer = CdpV1Signer(access_key, private_key)
+
+
+def _sign_chunk(canonical_strings):
+    return [_worker_signer.sign_canonical_string(s) for s in canonical_strings]
+
+
+def sign_many(
+    requests,
+    access_key,
+    private_key,
+    date=None,
+    workers=None,
+):
+    """
+    Generate the signing headers for many requests at once.
+
+    requests is an iterable of (method, uri, content_type) tuples, where
+    content_type may be None. Returns a list with one dict of headers per
+    request, in order. All requests share one x-altus-date, so generate new
+    headers for each batch.
+
+    Every request is canonicalized first, then the canonical strings are
+    signed, spread across a pool of worker processes (one per available core
+    unless workers is given) when there are enough of them to pay for it.
+    """
+    if date is None:
+        date = http_date()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    signer = get_signer(access_key, private_key)
+
+    headers_list = []
+    canonical_strings = []
+    for method, uri, content_type in requests:
+        headers = {}
+        if content_type is not None:
+            headers["Content-Type"] = content_type
+        headers["x-altus-date"] = date
+        headers_list.append(headers)
+        canonical_strings.append(
+            create_canonical_request_string(
+                method,
+                uri,
+                headers,
+                signer.auth_method,
+            ),
+        )
+
+    chunk_size = max(PARALLEL_SIGN_CHUNK_SIZE, -(-len(canonical_strings) // workers))
+    if workers > 1 and len(canonical_strings) > chunk_size:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [
+            canonical_strings[i : i + chunk_size]
+            for i in range(0, len(canonical_strings), chunk_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_sign_worker,
+            initargs=(access_key, private_key),
+        ) as executor:
+            signatures = [
+                s for chunk in executor.map(_sign_chunk, chunks) for s in chunk
+            ]
+    else:
+        signatures = [signer.sign_canonical_string(s) for s in canonical_strings]
+
+    for headers, signature in zip(headers_list, signatures):
+        headers["x-altus-auth"] = signature
+    return headers_list
+
+
+def parse_sign_request_line(line):
+    """
+    Parse one `cdpsign --batch' input line into a (method, uri, content_type)
+    tuple. Returns None for blank lines.
+    """
+    if not line.strip():
+        return None
+
+    spec = json.loads(line)
+    if not isinstance(spec, dict):
+        raise ValueError("Batch request must be a JSON object")
+    if "uri" not in spec:
+        raise ValueError("Batch request is missing 'uri'")
+    request = (
+        spec.get("method", "GET"),
+        spec["uri"],
+        spec.get("content_type", "application/json"),
     )
-    signature_header = create_signature_header(encoded_authn_params, signature)
-    return signature_header
+    for field, value in zip(("method", "uri", "content_type"), request):
+        if not isinstance(value, str):
+            raise ValueError("Batch request '{0}' must be a string".format(field))
+    return request
+
+
+def __run_batch(batch_file, access_key, private_key, workers):
+    # Read and sign the input in chunks so output starts early and memory
+    # stays bounded for arbitrarily long inputs.
+    lines = enumerate(batch_file, 1)
+    while True:
+        chunk = list(itertools.islice(lines, BATCH_CHUNK_SIZE))
+        if not chunk:
+            break
+
+        results = []
+        requests = []
+        for line_number, line in chunk:
+            try:
+                request = parse_sign_request_line(line)
+            except ValueError as error:
+                results.append({"line": line_number, "error": str(error)})
+                continue
+            if request is not None:
+                results.append({"line": line_number})
+                requests.append(request)
+
+        signed = iter(sign_many(requests, access_key, private_key, workers=workers))
+        for result in results:
+            if "error" not in result:
+                result["headers"] = next(signed)
+            print(json.dumps(result))
+
+    return 0
 
 
 def inner_main(argv):
     """
     cdpv1sign main entry point
     """
+    import configargparse
+
     parser = configargparse.ArgumentParser(
         description="Curl with CDP request signing",
         formatter_class=configargparse.ArgumentDefaultsHelpFormatter,
@@ -171,11 +399,27 @@ def inner_main(argv):
     parser.add_argument("--access_key", env_var="CDP_ACCESS_KEY_ID")
     parser.add_argument("--private_key", env_var="CDP_PRIVATE_KEY")
     # date???
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Read one JSON request per line from FILE ('-' for stdin), each "
+        "with method, uri and optionally content_type, and write the signing "
+        "headers for each as one JSON object per line",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of processes to sign batches with "
+        "(default: number of available cores)",
+    )
 
-    parser.add_argument("uri")
+    parser.add_argument("uri", nargs="?")
 
     args = parser.parse_args(argv)
 
+    if args.batch is None and args.uri is None:
+        parser.error("the following arguments are required: uri")
+
     credentials_path = os.path.expanduser("~") + "/.cdp/credentials"
     args.access_key, args.private_key = load_cdp_config(
         args.access_key,
@@ -190,8 +434,18 @@ def inner_main(argv):
     if args.private_key is None:
         raise ValueError("No private key is available")
 
+    if args.batch is not None:
+        if args.batch == "-":
+            return __run_batch(
+                sys.stdin, args.access_key, args.private_key, args.workers
+            )
+        with open(args.batch, "r") as batch_file:
+            return __run_batch(
+                batch_file, args.access_key, args.private_key, args.workers
+            )
+
     headers = {"Content-Type": "application/json"}
-    headers["x-altus-date"] = formatdate(usegmt=True)
+    headers["x-altus-date"] = http_date()
     headers["x-altus-auth"] = make_signature_header(
         args.request,
         args.uri,
@@ -210,7 +464,7 @@ def main():
     """
     main method
     """
-    inner_main(sys.argv[1:])
+    return inner_main(sys.argv[1:])
 
 
 if __name__ == "__main__":
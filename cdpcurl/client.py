@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Thread-safe CDP API client for long-lived programs
+"""
+
+import json
+import os
+
+from cdpcurl.batch import DEFAULT_CONCURRENCY
+from cdpcurl.cdpconfig import load_cdp_config
+from cdpcurl.cdpcurl import make_paginated_request, make_request
+from cdpcurl.cdpv1sign import CdpV1Auth
+from cdpcurl.ratelimit import get_concurrency_controller, get_rate_limiter
+from cdpcurl.session import DEFAULT_POOL_SIZE
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class CdpClient:
+    """
+    Calls the CDP API with one credential.
+
+    The credential is resolved once, when the client is created: access_key
+    and private_key when both are given, and otherwise the missing ones
+    from profile in the credentials file. Every request is signed as it is
+    sent by the client's CdpV1Auth, through the shared keep-alive session
+    for its host, so calls after the first pay no setup cost.
+
+    endpoint is the base URL that relative service paths are resolved
+    against, such as https://api.us-west-1.cdp.cloudera.com. The remaining
+    options apply to every request and are described with make_request:
+    retry is a cdpcurl.retry.RetryPolicy; rate and burst limit how often
+    requests are sent to each host; adaptive_concurrency is the most
+    requests allowed in flight to each host while the limit adapts; cache is
+    a cdpcurl.cache.ResponseCache; clock returns each x-altus-date, such as
+    a cdpcurl.clock.DateProvider; skew is a cdpcurl.skew.SkewEstimator that
+    corrects the date for each host's clock.
+
+    A client holds no per-call state, so one client can be shared by any
+    number of threads.
+    """
+
+    def __init__(
+        self,
+        endpoint=None,
+        access_key=None,
+        private_key=None,
+        profile="default",
+        credentials_path=None,
+        verify=True,
+        pool_size=DEFAULT_POOL_SIZE,
+        retry=None,
+        rate=None,
+        burst=None,
+        adaptive_concurrency=None,
+        cache=None,
+        body_encoding=None,
+        http2=False,
+        tracer=None,
+        clock=None,
+        skew=None,
+    ):
+        if credentials_path is None:
+            credentials_path = os.path.expanduser("~") + "/.cdp/credentials"
+        access_key, private_key = load_cdp_config(
+            access_key,
+            private_key,
+            credentials_path,
+            profile,
+        )
+
+        if access_key is None:
+            raise ValueError("No access key is available")
+
+        if private_key is None:
+            raise ValueError("No private key is available")
+
+        # The key is parsed here, so that a bad key fails now and not on the
+        # first call.
+        self.auth = CdpV1Auth(access_key, private_key, clock, skew)
+        self.endpoint = endpoint
+        self.access_key = access_key
+        self.private_key = private_key
+        self.verify = verify
+        self.pool_size = pool_size
+        self.retry = retry
+        self.rate = rate
+        self.burst = burst
+        self.adaptive_concurrency = adaptive_concurrency
+        self.cache = cache
+        self.body_encoding = body_encoding
+        self.http2 = http2
+        self.tracer = tracer
+        self.skew = skew
+
+    def url(self, service_path):
+        """
+        Return the URL for service_path, which may also be a full URL.
+        """
+        if "://" in service_path:
+            return service_path
+        if self.endpoint is None:
+            raise ValueError(
+                "A relative service path needs a client endpoint: '{0}'".format(
+                    service_path
+                )
+            )
+        return self.endpoint.rstrip("/") + "/" + service_path.lstrip("/")
+
+    def _options(self, uri, tracer):
+        options = {
+            "auth": self.auth,
+            "verify": self.verify,
+            "pool_size": self.pool_size,
+            "tracer": self.tracer if tracer is None else tracer,
+            "retry": self.retry,
+            "cache": self.cache,
+            "body_encoding": self.body_encoding,
+            "http2": self.http2,
+            "skew": self.skew,
+        }
+        if self.rate is not None:
+            options["rate_limiter"] = get_rate_limiter(
+                uri,
+                self.access_key,
+                self.rate,
+                self.burst,
+            )
+        if self.adaptive_concurrency is not None:
+            options["concurrency"] = get_concurrency_controller(
+                uri,
+                self.access_key,
+                initial=min(DEFAULT_CONCURRENCY, self.adaptive_concurrency),
+                maximum=self.adaptive_concurrency,
+            )
+        return options
+
+    def request(
+        self,
+        method,
+        uri,
+        data=None,
+        headers=None,
+        stream=False,
+        data_binary=False,
+        tracer=None,
+    ):
+        """
+        Send a signed request and return the response, whatever its status.
+        uri may be relative to the endpoint. headers defaults to a JSON
+        Content-Type and is not modified. data and stream are as for
+        make_request.
+        """
+        uri = self.url(uri)
+        if headers is None:
+            headers = JSON_HEADERS
+        if self.body_encoding is not None:
+            # Compression sets Content-Encoding on the headers.
+            headers = dict(headers)
+        return make_request(
+            method,
+            uri,
+            headers,
+            data,
+            self.access_key,
+            self.private_key,
+            data_binary,
+            stream=stream,
+            **self._options(uri, tracer),
+        )
+
+    def call(self, service_path, payload=None, stream=False):
+        """
+        POST payload, an empty object by default, as JSON to a CDP operation
+        such as /api/v1/iam/listUsers and return the parsed JSON response.
+        HTTP errors raise requests.HTTPError. With stream, the response is
+        returned as it arrives instead, unread and unchecked.
+        """
+        response = self.request(
+            "POST",
+            service_path,
+            json.dumps({} if payload is None else payload),
+            stream=stream,
+        )
+        if stream:
+            return response
+        response.raise_for_status()
+        return response.json()
+
+    def paginate(
+        self,
+        service_path,
+        payload=None,
+        page_size=None,
+        headers=None,
+        method="POST",
+        tracer=None,
+    ):
+        """
+        Call a CDP list* operation and yield every page of the result as
+        parsed JSON, following nextToken. payload is a dict or a JSON string.
+        """
+        uri = self.url(service_path)
+        if payload is None:
+            payload = {}
+        if not isinstance(payload, (str, bytes)):
+            payload = json.dumps(payload)
+        return make_paginated_request(
+            method,
+            uri,
+            JSON_HEADERS if headers is None else headers,
+            payload,
+            self.access_key,
+            self.private_key,
+            page_size=page_size,
+            **self._options(uri, tracer),
+        )
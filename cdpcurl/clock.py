@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Clock for the x-altus-date header
+"""
+
+import math
+import time
+
+from email.utils import formatdate
+
+
+class DateProvider:
+    """
+    Returns the current time formatted as an RFC 2822 date for the
+    x-altus-date header.
+
+    The date only has a resolution of one second, so each wall-clock second
+    is formatted once and the string reused until the second changes.
+    Instances are safe to share between threads.
+
+    now is called for the current time in seconds since the epoch, and
+    defaults to time.time. Pass another callable to control time, for
+    instance in tests. Calling the provider with an offset in seconds
+    returns the date that much later, to correct for a server whose clock
+    differs from ours.
+    """
+
+    def __init__(self, now=None):
+        self.now = time.time if now is None else now
+        self._cached = (None, None)
+
+    def __call__(self, offset=0.0):
+        second = math.floor(self.now() + offset)
+        # The second and its formatted date are read and replaced together as
+        # one tuple, so a thread never pairs one second with another's date.
+        # Threads racing on a new second may each format it, which is
+        # harmless.
+        cached_second, date = self._cached
+        if cached_second != second:
+            date = formatdate(second, usegmt=True)
+            self._cached = (second, date)
+        return date
+
+
+# The provider used when none is given.
+http_date = DateProvider()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Request and response body compression
+"""
+
+import sys
+import zlib
+
+BODY_ENCODINGS = ("gzip", "zstd")
+COMPRESS_CHUNK_SIZE = 64 * 1024
+
+
+def _zstd():
+    # The same zstd bindings that urllib3 decodes responses with.
+    try:
+        if sys.version_info >= (3, 14):
+            from compression import zstd
+        else:
+            from backports import zstd
+    except ImportError:
+        return None
+    return zstd
+
+
+def accept_encoding():
+    """
+    Return an Accept-Encoding value listing every content encoding that
+    responses can be decoded from: gzip and deflate, plus br and zstd when
+    their optional packages are installed.
+    """
+    from urllib3.util import make_headers
+
+    return make_headers(accept_encoding=True)["accept-encoding"].replace(",", ", ")
+
+
+def _compressor(encoding, level=None):
+    if encoding == "gzip":
+        return zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+            zlib.DEFLATED,
+            31,
+        )
+    if encoding == "zstd":
+        zstd = _zstd()
+        if zstd is None:
+            raise Exception(
+                "zstd compression needs the backports.zstd package; install "
+                "cdpcurl[compression]"
+            )
+        return zstd.ZstdCompressor(level=level)
+    raise ValueError("Unknown body encoding '{0}'".format(encoding))
+
+
+def _compress_stream(chunks, compressor):
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _iter_file(input_file):
+    while True:
+        chunk = input_file.read(COMPRESS_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def compress_body(data, encoding, level=None):
+    """
+    Compress a request body with encoding, gzip or zstd. bytes and str
+    bodies are compressed at once and returned as bytes; file objects and
+    iterables of bytes are compressed as they are read, and returned as a
+    generator, so large bodies are never held in memory.
+    """
+    compressor = _compressor(encoding, level)
+    if data is None:
+        data = b""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if isinstance(data, bytes):
+        return compressor.compress(data) + compressor.flush()
+    if hasattr(data, "read"):
+        data = _iter_file(data)
+    return _compress_stream(data, compressor)
+
+
+def decompress_body(data, encoding):
+    """
+    Decompress a whole request or response body encoded with gzip, deflate
+    or zstd.
+    """
+    if encoding in (None, "", "identity"):
+        return data
+    if encoding == "gzip":
+        return zlib.decompress(data, 47)
+    if encoding == "deflate":
+        return zlib.decompress(data)
+    if encoding == "zstd":
+        zstd = _zstd()
+        if zstd is not None:
+            return zstd.decompress(data)
+    raise ValueError("Unsupported content encoding '{0}'".format(encoding))
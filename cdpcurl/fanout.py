@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Concurrent fan-out of one request to many profiles and hosts
+"""
+
+import fnmatch
+import re
+import time
+
+from urllib.parse import urlsplit, urlunsplit
+
+from cdpcurl.batch import DEFAULT_CONCURRENCY, response_body
+from cdpcurl.cdpconfig import list_profiles
+
+# Control plane API hosts have the form api.<region>.cdp.cloudera.com.
+_REGIONAL_HOST_RE = re.compile(r"^api\.[a-z0-9-]+\.(cdp\.cloudera\.com)$")
+
+
+def split_list(value):
+    """
+    Split a comma-separated command line value into its non-empty items.
+    """
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def is_profile_pattern(value):
+    """
+    Return True if a --profile value names more than one profile.
+    """
+    return "," in value or any(char in value for char in "*?[")
+
+
+def expand_profiles(value, credentials_path):
+    """
+    Expand a comma-separated list of profile names and glob patterns, such
+    as "prod-*,staging", into profile names, in the order they are first
+    matched. Patterns are matched against the profiles in the credentials
+    file, and must match at least one.
+    """
+    profiles = []
+    available = None
+    for item in split_list(value):
+        if any(char in item for char in "*?["):
+            if available is None:
+                available = list_profiles(credentials_path)
+            matches = fnmatch.filter(available, item)
+            if not matches:
+                raise Exception("No CDP profile matches '{0}'".format(item))
+        else:
+            matches = [item]
+        for profile in matches:
+            if profile not in profiles:
+                profiles.append(profile)
+    return profiles
+
+
+def host_uri(uri, host):
+    """
+    Return uri with its host and port replaced by host.
+    """
+    parts = urlsplit(uri)
+    return urlunsplit(parts._replace(netloc=host))
+
+
+def region_uri(uri, region):
+    """
+    Return uri for region: a "{region}" placeholder in uri is replaced by
+    region, and otherwise the region of a CDP API host such as
+    api.us-west-1.cdp.cloudera.com is.
+    """
+    if "{region}" in uri:
+        return uri.replace("{region}", region)
+
+    parts = urlsplit(uri)
+    match = _REGIONAL_HOST_RE.match(parts.hostname or "")
+    if match is None:
+        raise ValueError(
+            "Cannot target region '{0}': '{1}' is not a regional CDP API host "
+            "and the URI has no {{region}} placeholder".format(region, parts.netloc)
+        )
+    host = "api.{0}.{1}".format(region, match.group(1))
+    if parts.port is not None:
+        host += ":{0}".format(parts.port)
+    return urlunsplit(parts._replace(netloc=host))
+
+
+def fanout_targets(uri, profiles, hosts=None, regions=None):
+    """
+    Return one (profile, uri) target for every combination of profile and
+    host, or of profile and region. Without hosts or regions, every profile
+    is sent to uri.
+    """
+    if hosts:
+        uris = [host_uri(uri, host) for host in hosts]
+    elif regions:
+        uris = [region_uri(uri, region) for region in regions]
+    else:
+        uris = [uri]
+    return [(profile, target_uri) for profile in profiles for target_uri in uris]
+
+
+def format_target_result(profile, uri, latency, response=None, error=None):
+    """
+    Build the JSON-serializable result record for one target, tagged with
+    its profile and host.
+    """
+    result = {"profile": profile, "host": urlsplit(uri).netloc}
+    if error is not None:
+        result.update(error=str(error), latency=latency)
+    else:
+        result.update(
+            status=response.status_code,
+            latency=latency,
+            body=response_body(response),
+        )
+    return result
+
+
+def run_fanout(
+    targets,
+    request_fn,
+    method,
+    data,
+    headers,
+    concurrency=DEFAULT_CONCURRENCY,
+    ordered=True,
+):
+    """
+    Send the same request to every (profile, uri) target on a pool of
+    concurrency workers and yield one result record per target.
+
+    request_fn is called with the method, uri, data, a copy of headers and
+    profile keyword arguments, and returns a response; each target is signed
+    with the credentials of its own profile. latency is the time in seconds
+    from the start of the call to the end of the response. Results are
+    yielded in target order unless ordered is False, in which case they are
+    yielded as they complete.
+    """
+    if concurrency < 1:
+        raise ValueError("Fan-out concurrency must be at least 1")
+
+    def execute(profile, uri):
+        start = time.perf_counter()
+        try:
+            response = request_fn(
+                method=method,
+                uri=uri,
+                data=data,
+                headers=dict(headers),
+                profile=profile,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            return format_target_result(
+                profile,
+                uri,
+                time.perf_counter() - start,
+                error=error,
+            )
+        return format_target_result(
+            profile,
+            uri,
+            time.perf_counter() - start,
+            response=response,
+        )
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(execute, *target) for target in targets]
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
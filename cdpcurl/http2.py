@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+requests transport adapter that sends requests over HTTP/2 with httpx
+"""
+
+import functools
+import ssl
+
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import h2  # noqa: F401 pylint: disable=unused-import
+import httpx
+
+from requests import exceptions
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from cdpcurl.session import DEFAULT_POOL_SIZE
+from cdpcurl.timing import current_timings
+from cdpcurl.trace import current_tracer
+
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Headers that describe an HTTP/1.1 connection and must not be sent over
+# HTTP/2. httpx frames the body itself.
+_CONNECTION_HEADERS = frozenset(
+    (
+        "connection",
+        "keep-alive",
+        "proxy-connection",
+        "transfer-encoding",
+        "upgrade",
+    )
+)
+
+_HTTP_VERSIONS = {"HTTP/1.0": 10, "HTTP/1.1": 11, "HTTP/2": 20}
+
+
+class _CountingBody:
+    """
+    Iterates over a request body in chunks, counting the bytes sent.
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self.size = 0
+
+    def __iter__(self):
+        if hasattr(self.body, "read"):
+            while True:
+                chunk = self.body.read(BODY_CHUNK_SIZE)
+                if not chunk:
+                    return
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                self.size += len(chunk)
+                yield chunk
+        else:
+            for chunk in self.body:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                self.size += len(chunk)
+                yield chunk
+
+
+class HTTP2RawResponse:
+    """
+    The raw body of an httpx response, with the part of the urllib3 response
+    interface that requests and cdpcurl use.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.version = _HTTP_VERSIONS.get(response.http_version, 11)
+
+    def stream(self, amt=BODY_CHUNK_SIZE, decode_content=True):
+        """
+        Yield the body in chunks of about amt bytes, decoded according to
+        its Content-Encoding unless decode_content is False.
+        """
+        if decode_content:
+            chunks = self._response.iter_bytes(amt)
+        else:
+            chunks = self._response.iter_raw(amt)
+        try:
+            yield from chunks
+        except httpx.TransportError as error:
+            raise exceptions.ChunkedEncodingError(error) from error
+
+    def tell(self):
+        """
+        Return the number of body bytes received, before decoding.
+        """
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+
+    release_conn = close
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends requests with an HTTP/2-capable httpx
+    client, so that concurrent requests to one host are multiplexed over a
+    single connection. HTTP/2 is negotiated with ALPN; servers that do not
+    agree to it are spoken to over HTTP/1.1 instead. Plain http:// requests
+    always use HTTP/1.1.
+
+    Connection events are reported to the active tracer and timings. Name
+    lookup is not timed apart from the TCP connect.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        super().__init__()
+        self.pool_size = pool_size
+        self._clients = {}
+
+    def _client(self, verify, cert):
+        key = (verify, cert)
+        client = self._clients.get(key)
+        if client is None:
+            if isinstance(verify, str):
+                verify = ssl.create_default_context(cafile=verify)
+            client = httpx.Client(
+                http2=True,
+                verify=verify,
+                cert=cert,
+                timeout=None,
+                # Like the session's own jar, keep no cookies: the client is
+                # shared by every credential that talks to the host.
+                cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+            client = self._clients.setdefault(key, client)
+        return client
+
+    def send(
+        self,
+        request,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ):  # pylint: disable=too-many-arguments
+        """
+        Send a prepared request and return its response with the body not
+        yet read.
+        """
+        headers = [
+            (key, value)
+            for key, value in request.headers.items()
+            if key.lower() not in _CONNECTION_HEADERS
+        ]
+        body = request.body
+        counted = None
+        if body is not None and not isinstance(body, (bytes, str)):
+            body = counted = _CountingBody(body)
+
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(None, connect=timeout[0], read=timeout[1])
+        else:
+            timeout = httpx.Timeout(timeout)
+
+        client = self._client(verify, cert if cert is None else tuple(cert))
+        httpx_request = client.build_request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=body,
+            timeout=timeout,
+            extensions={
+                "trace": functools.partial(_trace, httpx.URL(request.url).host)
+            },
+        )
+        try:
+            httpx_response = client.send(httpx_request, stream=True)
+        except httpx.ConnectTimeout as error:
+            raise exceptions.ConnectTimeout(error, request=request) from error
+        except httpx.TimeoutException as error:
+            raise exceptions.ReadTimeout(error, request=request) from error
+        except httpx.TransportError as error:
+            raise exceptions.ConnectionError(error, request=request) from error
+
+        timings = current_timings()
+        if timings is not None:
+            if counted is not None:
+                timings.size_upload = counted.size
+            elif body is not None:
+                timings.size_upload = len(body)
+        return self.build_response(request, httpx_response)
+
+    def build_response(self, request, httpx_response):
+        """
+        Wrap an httpx response as a requests response.
+        """
+        response = Response()
+        response.status_code = httpx_response.status_code
+        response.headers = CaseInsensitiveDict()
+        for key, value in httpx_response.headers.multi_items():
+            if key in response.headers:
+                value = response.headers[key] + ", " + value
+            response.headers[key] = value
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = httpx_response.reason_phrase
+        response.raw = HTTP2RawResponse(httpx_response)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+def _trace(host, event, info):
+    timings = current_timings()
+    tracer = current_tracer()
+    if timings is None and tracer is None:
+        return
+
+    if event == "connection.connect_tcp.complete":
+        if timings is not None:
+            timings.num_connects += 1
+            timings.mark("connect")
+        if tracer is not None:
+            sock = info["return_value"].get_extra_info("socket")
+            address, port = sock.getpeername()[:2]
+            tracer.info(
+                "Connected to {0} ({1}) port {2}".format(host, address, port),
+                host=host,
+                address=address,
+                port=port,
+            )
+    elif event == "connection.start_tls.complete":
+        if timings is not None:
+            timings.mark("appconnect")
+        if tracer is not None:
+            ssl_object = info["return_value"].get_extra_info("ssl_object")
+            protocol = ssl_object.selected_alpn_protocol()
+            tracer.info(
+                "TLS connection using {0} / {1}".format(
+                    ssl_object.version(),
+                    ssl_object.cipher()[0],
+                ),
+                tls_version=ssl_object.version(),
+                cipher=ssl_object.cipher()[0],
+            )
+            tracer.info(
+                "ALPN: server accepted {0}".format(protocol or "no protocol"),
+                alpn=protocol,
+            )
+    elif event.endswith(".send_request_headers.started"):
+        if timings is not None:
+            timings.mark("pretransfer")
+        if tracer is not None:
+            request = info["request"]
+            headers = [
+                (key.decode("latin-1"), value.decode("latin-1"))
+                for key, value in request.headers
+            ]
+            if event.startswith("http2."):
+                # As h2 sends them.
+                version = "HTTP/2"
+                headers = [
+                    (key.lower(), value)
+                    for key, value in headers
+                    if key.lower() not in _CONNECTION_HEADERS
+                ]
+            else:
+                version = "HTTP/1.1"
+            lines = [
+                "{0} {1} {2}".format(
+                    request.method.decode("ascii"),
+                    request.url.target.decode("ascii"),
+                    version,
+                ),
+            ] + ["{0}: {1}".format(key, value) for key, value in headers]
+            tracer.request_headers("\r\n".join(lines).encode("latin-1"))
+    elif event.endswith(".receive_response_headers.complete"):
+        if timings is not None:
+            timings.mark("starttransfer")
+        if tracer is not None:
+            if event.startswith("http2."):
+                status, headers = info["return_value"]
+                version, reason = 20, ""
+            else:
+                http_version, status, reason, headers = info["return_value"]
+                version = _HTTP_VERSIONS.get(http_version.decode("ascii"), 11)
+                reason = reason.decode("latin-1")
+            tracer.response_headers(
+                version,
+                status,
+                reason,
+                [
+                    (key.decode("latin-1"), value.decode("latin-1"))
+                    for key, value in headers
+                ],
+            )
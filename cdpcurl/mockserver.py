@@ -0,0 +1,654 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local mock of the CDP API for load and regression testing.
+
+The server verifies x-altus-auth signatures and x-altus-date skew the way
+the CDP API does, and answers list* calls with generated paginated
+responses. Latency, server errors, throttling and body sizes are
+configurable. Run it with `python -m cdpcurl.mockserver'.
+"""
+
+import functools
+import json
+import os
+import random
+import ssl
+import sys
+import threading
+import time
+
+from base64 import b64decode, b64encode, urlsafe_b64decode
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import configargparse
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from cdpcurl.cdpconfig import load_cdp_config
+from cdpcurl.cdpv1sign import create_canonical_request_bytes
+from cdpcurl.compression import compress_body, decompress_body
+
+DEFAULT_MAX_SKEW = 300
+DEFAULT_PAGE_SIZE = 100
+STATS_PATH = "/_mock/stats"
+RESPONSE_ENCODINGS = ("zstd", "br", "gzip")
+
+
+def public_key_from_private_key(private_key):
+    """
+    Derive the base 64 encoded Ed25519 public key of a CDP private key.
+    """
+    seed = b64decode(private_key)
+    if len(seed) != 32:
+        raise Exception("Not an Ed25519 private key!")
+    public_key = ed25519.Ed25519PrivateKey.from_private_bytes(seed).public_key()
+    return b64encode(
+        public_key.public_bytes(
+            serialization.Encoding.Raw,
+            serialization.PublicFormat.Raw,
+        ),
+    ).decode("utf-8")
+
+
+def _decode_urlsafe(value):
+    return urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def verify_request(
+    method,
+    path,
+    headers,
+    public_keys,
+    max_skew=DEFAULT_MAX_SKEW,
+    now=None,
+):
+    """
+    Verify the signature and date of a request. headers must look up keys
+    case-insensitively, like the headers of a BaseHTTPRequestHandler.
+    public_keys maps access key IDs to base 64 encoded Ed25519 public keys.
+    The date is checked against now, which defaults to the current time.
+    Returns None if the request is valid, or a message saying why it is
+    not.
+    """
+    auth = headers.get("x-altus-auth")
+    if not auth:
+        return "missing x-altus-auth header"
+    date = headers.get("x-altus-date")
+    if not date:
+        return "missing x-altus-date header"
+
+    try:
+        encoded_authn_params, signature = auth.split(".", 1)
+        authn_params = json.loads(_decode_urlsafe(encoded_authn_params))
+        access_key = authn_params["access_key_id"]
+        auth_method = authn_params["auth_method"]
+        signature = _decode_urlsafe(signature)
+    except (ValueError, KeyError, TypeError):
+        return "malformed x-altus-auth header"
+
+    if auth_method != "ed25519v1":
+        return "unsupported auth method '{0}'".format(auth_method)
+    if access_key not in public_keys:
+        return "unknown access key '{0}'".format(access_key)
+
+    if now is None:
+        now = time.time()
+    try:
+        skew = abs(now - parsedate_to_datetime(date).timestamp())
+    except (TypeError, ValueError):
+        return "malformed x-altus-date header"
+    if skew > max_skew:
+        return "x-altus-date is {0:.0f} seconds from server time".format(skew)
+
+    canonical_bytes = create_canonical_request_bytes(
+        method,
+        path,
+        headers,
+        auth_method,
+    )
+    public_key = ed25519.Ed25519PublicKey.from_public_bytes(
+        b64decode(public_keys[access_key]),
+    )
+    try:
+        public_key.verify(signature, canonical_bytes)
+    except InvalidSignature:
+        return "signature does not match"
+    return None
+
+
+def list_key(path):
+    """
+    Return the name of the array in the response of a list* call, such as
+    `environments' for /api/v1/environments2/listEnvironments, or None if path
+    is not a list call.
+    """
+    operation = urlparse(path).path.rstrip("/").rsplit("/", 1)[-1]
+    if not operation.startswith("list") or len(operation) <= 4:
+        return None
+    return operation[4].lower() + operation[5:]
+
+
+def response_encoding(accept_encoding):
+    """
+    Choose the best response encoding offered in an Accept-Encoding header
+    that the server can produce, or None.
+    """
+    offered = set()
+    for token in (accept_encoding or "").split(","):
+        name, _, params = token.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        offered.add(name.strip().lower())
+    for encoding in RESPONSE_ENCODINGS:
+        if encoding in offered and _can_encode(encoding):
+            return encoding
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _can_encode(encoding):
+    try:
+        encode_response(b"", encoding)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def encode_response(data, encoding):
+    """
+    Compress a response body with encoding.
+    """
+    if encoding == "br":
+        import brotli
+
+        # The default quality of 11 is meant for static assets and takes
+        # seconds per megabyte, which would dominate any measurement.
+        return brotli.compress(data, quality=5)
+    return compress_body(data, encoding)
+
+
+class MockCdpHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive request handler for MockCdpServer.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "cdpcurl-mockserver"
+
+    def setup(self):
+        # Do the TLS handshake on the handler thread, so that slow handshakes
+        # do not hold up accepting other connections.
+        if self.server.ssl_context is not None:
+            self.request = self.server.ssl_context.wrap_socket(
+                self.request,
+                server_side=True,
+            )
+        super().setup()
+
+    def date_time_string(self, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time() + self.server.mock.clock_offset
+        return super().date_time_string(timestamp)
+
+    def _read_body(self):
+        if "chunked" not in self.headers.get("Transfer-Encoding", "").lower():
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";", 1)[0], 16)
+            if size == 0:
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def _send_json(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        encoding = None
+        if self.server.mock.compress_responses:
+            encoding = response_encoding(self.headers.get("Accept-Encoding"))
+            if encoding is not None:
+                data = encode_response(data, encoding)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _send_error(self, status, code, message, headers=()):
+        self._send_json(status, {"code": code, "message": message}, headers)
+
+    def _handle(self):
+        data = self._read_body()
+
+        mock = self.server.mock
+        if self.path == STATS_PATH:
+            self._send_json(200, mock.stats())
+            return
+
+        mock.count("requests")
+        if mock.latency:
+            time.sleep(mock.latency + mock.random.uniform(0, mock.jitter))
+
+        if mock.public_keys is not None:
+            error = verify_request(
+                self.command,
+                self.path,
+                self.headers,
+                mock.public_keys,
+                mock.max_skew,
+                time.time() + mock.clock_offset,
+            )
+            if error is not None:
+                mock.count("rejected")
+                self._send_error(401, "UNAUTHENTICATED", error)
+                return
+
+        if mock.throttle():
+            mock.count("throttled")
+            self._send_error(
+                429,
+                "RESOURCE_EXHAUSTED",
+                "Rate limit exceeded",
+                [("Retry-After", str(mock.retry_after))],
+            )
+            return
+
+        if mock.error_rate and mock.random.random() < mock.error_rate:
+            mock.count("errors")
+            self._send_error(500, "INTERNAL", "Injected server error")
+            return
+
+        try:
+            data = decompress_body(data, self.headers.get("Content-Encoding"))
+        except Exception:  # pylint: disable=broad-except
+            mock.count("errors")
+            self._send_error(400, "INVALID_ARGUMENT", "Cannot decode request body")
+            return
+        try:
+            body = json.loads(data) if data else {}
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            mock.count("errors")
+            self._send_error(
+                400, "INVALID_ARGUMENT", "Request body is not a JSON object"
+            )
+            return
+
+        mock.count("ok")
+        self._send_json(200, mock.respond(self.path, body))
+
+    do_GET = _handle
+    do_HEAD = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if self.server.mock.log:
+            super().log_message(format, *args)
+
+
+class MockCdpServer:
+    """
+    A mock CDP API server running on a background thread.
+
+    public_keys maps access key IDs to base 64 encoded public keys; requests
+    signed by any other key are rejected with 401. If it is None, signatures
+    are not checked. Every response is delayed by latency seconds plus up to
+    jitter seconds. A fraction error_rate of requests fail with 500 and a
+    fraction throttle_rate are throttled with 429; requests beyond max_rps in
+    any one second are throttled too. List calls page through `items'
+    generated items, each padded with item_size bytes, and other calls get
+    an object padded to body_size bytes, unless responses has a canned body
+    for the request path. Compressed request bodies are decoded, and with
+    compress_responses, responses are compressed with the best encoding the
+    client accepts. The server clock, used for the Date header and to check
+    x-altus-date, runs clock_offset seconds ahead of the system clock.
+    Statistics are served at /_mock/stats.
+
+    Use it as a context manager, or call start() and stop().
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        public_keys=None,
+        max_skew=DEFAULT_MAX_SKEW,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        max_rps=None,
+        retry_after=1,
+        items=250,
+        page_size=DEFAULT_PAGE_SIZE,
+        item_size=0,
+        body_size=0,
+        responses=None,
+        certfile=None,
+        keyfile=None,
+        seed=None,
+        log=False,
+        compress_responses=False,
+        clock_offset=0.0,
+    ):
+        self.public_keys = public_keys
+        self.max_skew = max_skew
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.items = items
+        self.page_size = page_size
+        self.item_size = item_size
+        self.body_size = body_size
+        self.responses = responses or {}
+        self.random = random.Random(seed)
+        self.log = log
+        self.compress_responses = compress_responses
+        self.clock_offset = clock_offset
+
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._window = None
+        self._window_count = 0
+
+        self._server = ThreadingHTTPServer((host, port), MockCdpHandler)
+        self._server.daemon_threads = True
+        self._server.request_queue_size = 1024
+        self._server.mock = self
+        self._server.ssl_context = None
+        if certfile is not None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self._server.ssl_context = context
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        The base URL of the server.
+        """
+        scheme = "https" if self._server.ssl_context is not None else "http"
+        host, port = self._server.server_address[:2]
+        if scheme == "https" and host == "127.0.0.1":
+            host = "localhost"
+        return "{0}://{1}:{2}".format(scheme, host, port)
+
+    def start(self):
+        """
+        Start serving on a background thread.
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        Serve on the calling thread until interrupted.
+        """
+        self._server.serve_forever()
+
+    def stop(self):
+        """
+        Stop serving and close the listening socket.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, name):
+        """
+        Increment the named statistic.
+        """
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def stats(self):
+        """
+        Return a copy of the request statistics.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def throttle(self):
+        """
+        Decide whether to throttle the current request.
+        """
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            return True
+        if self.max_rps is None:
+            return False
+        window = int(time.monotonic())
+        with self._lock:
+            if window != self._window:
+                self._window = window
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > self.max_rps
+
+    def respond(self, path, body):
+        """
+        Build the response body for a successful request.
+        """
+        request_path = urlparse(path).path
+        if request_path in self.responses:
+            return self.responses[request_path]
+
+        key = list_key(path)
+        if key is None:
+            response = {"path": request_path}
+            if self.body_size:
+                response["padding"] = "x" * self.body_size
+            return response
+
+        start = int(body.get("startingToken") or 0)
+        page_size = int(body.get("pageSize") or self.page_size)
+        end = min(self.items, start + page_size)
+        page = []
+        for index in range(start, end):
+            item = {"id": "{0}-{1:06d}".format(key, index), "index": index}
+            if self.item_size:
+                item["padding"] = "x" * self.item_size
+            page.append(item)
+        response = {key: page}
+        if end < self.items:
+            response["nextToken"] = str(end)
+        return response
+
+
+def __parse_public_key(value):
+    access_key, sep, public_key = value.partition("=")
+    if not sep:
+        raise configargparse.ArgumentTypeError(
+            "expected ACCESS_KEY=PUBLIC_KEY, got '{0}'".format(value)
+        )
+    return access_key, public_key
+
+
+def inner_main(argv):
+    """
+    mock server main entry point
+    """
+    parser = configargparse.ArgumentParser(
+        description="Mock CDP API server that verifies request signatures",
+        formatter_class=configargparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--public-key",
+        action="append",
+        type=__parse_public_key,
+        metavar="ACCESS_KEY=PUBLIC_KEY",
+        help="Accept requests signed by this key; may be repeated",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Accept requests signed by the credential of this CDP profile",
+        env_var="CDP_PROFILE",
+    )
+    parser.add_argument("--access_key", env_var="CDP_ACCESS_KEY_ID")
+    parser.add_argument(
+        "--private_key",
+        env_var="CDP_PRIVATE_KEY",
+        help="Accept requests signed by this credential",
+    )
+    parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Do not check request signatures",
+    )
+    parser.add_argument(
+        "--max-skew",
+        type=float,
+        default=DEFAULT_MAX_SKEW,
+        help="Reject requests whose x-altus-date is further than this many "
+        "seconds from server time",
+    )
+    parser.add_argument(
+        "--clock-offset",
+        type=float,
+        default=0.0,
+        help="Run the server clock this many seconds ahead of the system "
+        "clock, or behind if negative",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=int, help="Throttle above this rate")
+    parser.add_argument("--retry-after", type=int, default=1, help="Seconds")
+    parser.add_argument("--items", type=int, default=250, help="Items per list")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--item-size", type=int, default=0, help="Bytes")
+    parser.add_argument("--body-size", type=int, default=0, help="Bytes")
+    parser.add_argument(
+        "--responses",
+        metavar="FILE",
+        help="JSON file mapping request paths to canned response bodies",
+    )
+    parser.add_argument("--certfile", help="Serve HTTPS with this certificate")
+    parser.add_argument("--keyfile")
+    parser.add_argument(
+        "--compress-responses",
+        action="store_true",
+        help="Compress responses with the best encoding the client accepts",
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("-v", "--verbose", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    public_keys = None
+    if not args.no_verify:
+        public_keys = dict(args.public_key or ())
+        if args.profile is not None or not public_keys:
+            try:
+                args.access_key, args.private_key = load_cdp_config(
+                    args.access_key,
+                    args.private_key,
+                    os.path.expanduser("~") + "/.cdp/credentials",
+                    args.profile or "default",
+                )
+            except Exception:  # pylint: disable=broad-except
+                if args.profile is not None:
+                    raise
+        if args.access_key is not None and args.private_key is not None:
+            public_keys[args.access_key] = public_key_from_private_key(args.private_key)
+        if not public_keys:
+            parser.error(
+                "give --public-key, --profile or --access_key and --private_key, "
+                "or --no-verify"
+            )
+
+    responses = None
+    if args.responses is not None:
+        with open(args.responses, "r") as responses_file:
+            responses = json.load(responses_file)
+
+    server = MockCdpServer(
+        host=args.host,
+        port=args.port,
+        public_keys=public_keys,
+        max_skew=args.max_skew,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+        retry_after=args.retry_after,
+        items=args.items,
+        page_size=args.page_size,
+        item_size=args.item_size,
+        body_size=args.body_size,
+        responses=responses,
+        certfile=args.certfile,
+        keyfile=args.keyfile,
+        seed=args.seed,
+        compress_responses=args.compress_responses,
+        clock_offset=args.clock_offset,
+        log=args.verbose,
+    )
+    print("Serving on {0}".format(server.url), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+def main():
+    """
+    main method
+    """
+    return inner_main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
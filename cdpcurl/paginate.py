@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Automatic pagination of CDP list* calls
+"""
+
+import json
+
+
+def _fetch_page(send_page, body):
+    response = send_page(json.dumps(body))
+    response.raise_for_status()
+    return response.json()
+
+
+def paginate(send_page, data, page_size=None):
+    """
+    Follow nextToken through every page of a CDP list call and yield each
+    page as it arrives.
+
+    send_page is called with the JSON request body of each page and returns
+    the response; it must sign every request afresh. The request for the next
+    page is sent while the current page is being consumed. HTTP errors are
+    raised as requests.HTTPError, with the failing response attached.
+    """
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    body = json.loads(data) if data else {}
+    if not isinstance(body, dict):
+        raise ValueError("Paginated requests need a JSON object body")
+    if page_size is not None:
+        body["pageSize"] = page_size
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(_fetch_page, send_page, body)
+        while future is not None:
+            page = future.result()
+            token = page.get("nextToken")
+            if token:
+                body = dict(body, startingToken=token)
+                future = executor.submit(_fetch_page, send_page, body)
+            else:
+                future = None
+            yield page
+    finally:
+        executor.shutdown(wait=False)
+
+
+def iter_items(pages, key):
+    """
+    Yield each element of the array key from every page.
+    """
+    for page in pages:
+        for item in page.get(key) or ():
+            yield item
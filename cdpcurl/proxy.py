@@ -0,0 +1,619 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local signing proxy.
+
+Listens on localhost for plain HTTP requests, signs each one and forwards it
+to CDP over pooled keep-alive connections, streaming the response back. Run
+it with `cdpcurl-proxy' or `python -m cdpcurl.proxy'.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+from collections import deque
+from fnmatch import fnmatchcase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.cdpconfig import load_cdp_config
+from cdpcurl.cdpv1sign import get_signer
+from cdpcurl.session import DEFAULT_POOL_SIZE
+
+DEFAULT_PORT = 8081
+STATS_PATH = "/_cdpcurl/stats"
+PROXY_CHUNK_SIZE = 64 * 1024
+LATENCY_SAMPLES = 1024
+
+# Headers that apply to a single connection and are not forwarded, from RFC
+# 9110 section 7.6.1, plus those that requests computes itself.
+HOP_BY_HOP_HEADERS = frozenset(
+    [
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "proxy-connection",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "content-length",
+    ]
+)
+SIGNING_HEADERS = frozenset(["x-altus-auth", "x-altus-date"])
+# Hosts that absolute-form requests may be forwarded to, as fnmatch patterns.
+DEFAULT_ALLOWED_HOSTS = ("api.*.cdp.cloudera.com",)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ProxyStats:
+    """
+    Thread-safe throughput and latency counters for the proxy.
+
+    Latency to first byte is the time from receiving a request to receiving
+    the upstream response headers; duration also includes streaming the
+    response body back. Percentiles are computed over the most recent
+    requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._counts = {
+            "requests": 0,
+            "in_flight": 0,
+            "upstream_errors": 0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+        }
+        self._statuses = {}
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._latency_total = 0.0
+        self._duration_total = 0.0
+
+    def request_started(self):
+        """
+        Record that a request was received.
+        """
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["in_flight"] += 1
+
+    def request_finished(self, status, latency, duration, bytes_sent, bytes_received):
+        """
+        Record the outcome of a request. status is None if the upstream
+        request failed.
+        """
+        with self._lock:
+            self._counts["in_flight"] -= 1
+            self._counts["bytes_sent"] += bytes_sent
+            self._counts["bytes_received"] += bytes_received
+            if status is None:
+                self._counts["upstream_errors"] += 1
+                return
+            key = str(status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+            self._latencies.append(latency)
+            self._latency_total += latency
+            self._duration_total += duration
+
+    def snapshot(self):
+        """
+        Return the current counters as a dict.
+        """
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            completed = sum(self._statuses.values())
+            latencies = sorted(self._latencies)
+            snapshot = dict(self._counts)
+            snapshot.update(
+                {
+                    "uptime_seconds": uptime,
+                    "requests_per_second": self._counts["requests"] / uptime,
+                    "statuses": dict(self._statuses),
+                    "latency_mean_ms": (
+                        self._latency_total / completed * 1000 if completed else 0.0
+                    ),
+                    "latency_p50_ms": _percentile(latencies, 0.5) * 1000,
+                    "latency_p90_ms": _percentile(latencies, 0.9) * 1000,
+                    "latency_p99_ms": _percentile(latencies, 0.99) * 1000,
+                    "duration_mean_ms": (
+                        self._duration_total / completed * 1000 if completed else 0.0
+                    ),
+                }
+            )
+            return snapshot
+
+
+class _RequestBody:
+    """
+    Iterates over a request body in chunks, counting the bytes read.
+    """
+
+    def __init__(self, rfile):
+        self.rfile = rfile
+        self.bytes_read = 0
+        self.exhausted = False
+
+    def _read(self, size):
+        data = self.rfile.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class _SizedBody(_RequestBody):
+    """
+    A request body with a Content-Length, which is forwarded as is.
+    """
+
+    def __init__(self, rfile, length):
+        super().__init__(rfile)
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        remaining = self.length
+        while remaining > 0:
+            data = self._read(min(remaining, PROXY_CHUNK_SIZE))
+            if not data:
+                return
+            remaining -= len(data)
+            yield data
+        self.exhausted = True
+
+
+class _ChunkedBody(_RequestBody):
+    """
+    A request body sent with chunked transfer encoding, which is forwarded
+    chunked.
+    """
+
+    def __iter__(self):
+        while True:
+            size = int(self.rfile.readline().split(b";", 1)[0], 16)
+            if size == 0:
+                # Skip any trailers up to the final empty line.
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                self.exhausted = True
+                return
+            yield self._read(size)
+            self.rfile.readline()
+
+
+class SigningProxyHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive request handler for SigningProxy.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "cdpcurl-proxy"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _target_uri(self):
+        proxy = self.server.proxy
+        if not self.path.startswith(("http://", "https://")):
+            if proxy.upstream is None:
+                return None
+            return proxy.upstream + self.path
+        if not proxy.is_allowed(self.path):
+            return False
+        components = urlsplit(self.path)
+        if not proxy.is_upstream(self.path) and components.scheme != "https":
+            # Forward-proxy clients name http:// URIs, as CONNECT is not
+            # supported, but signed requests only go to CDP over TLS.
+            return urlunsplit(components._replace(scheme="https"))
+        return self.path
+
+    def _request_body(self):
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            return _ChunkedBody(self.rfile)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length < 0:
+            raise ValueError("negative Content-Length")
+        if length == 0:
+            return None
+        return _SizedBody(self.rfile, length)
+
+    def _forward(self):
+        proxy = self.server.proxy
+        if self.path == STATS_PATH:
+            self._send_json(200, proxy.stats.snapshot())
+            return
+
+        uri = self._target_uri()
+        if uri is None:
+            self._send_json(
+                400,
+                {
+                    "message": "Request an absolute URI, or start the proxy "
+                    "with --upstream"
+                },
+            )
+            return
+        if uri is False:
+            # The signature does not cover the host, so signing requests for
+            # arbitrary hosts would hand out signatures that CDP accepts.
+            self.close_connection = True
+            self._send_json(
+                403,
+                {"message": "The proxy does not forward requests to this host"},
+            )
+            return
+
+        try:
+            body = self._request_body()
+        except ValueError:
+            self.close_connection = True
+            self._send_json(400, {"message": "Malformed Content-Length"})
+            return
+
+        proxy.stats.request_started()
+        start = time.perf_counter()
+        status, latency, bytes_sent = None, 0.0, 0
+        try:
+            status, latency, bytes_sent = self._relay(uri, body, start)
+        finally:
+            proxy.stats.request_finished(
+                status,
+                latency,
+                time.perf_counter() - start,
+                bytes_sent,
+                body.bytes_read if body is not None else 0,
+            )
+
+    def _relay(self, uri, body, start):
+        # Returns the upstream status, or None if the upstream request
+        # failed, the latency to first byte and the number of bytes sent.
+        proxy = self.server.proxy
+        headers = {
+            key: value
+            for key, value in self.headers.items()
+            if key.lower() not in HOP_BY_HOP_HEADERS
+            and key.lower() not in SIGNING_HEADERS
+        }
+        # The body is relayed as the upstream sent it, so only ask for the
+        # encodings that the client accepts.
+        if not any(key.lower() == "accept-encoding" for key in headers):
+            headers["Accept-Encoding"] = "identity"
+
+        try:
+            response = make_request(
+                self.command,
+                uri,
+                headers,
+                body,
+                proxy.access_key,
+                proxy.private_key,
+                True,
+                proxy.verify,
+                pool_size=proxy.pool_size,
+                stream=True,
+            )
+        except requests.RequestException as error:
+            self.close_connection = True
+            self._send_json(
+                502, {"message": "Upstream request failed: {0}".format(error)}
+            )
+            return None, 0.0, 0
+        except Exception as error:  # pylint: disable=broad-except
+            # Signing errors, which would otherwise kill the handler thread
+            # and drop the connection without a response.
+            self.close_connection = True
+            self._send_json(
+                500, {"message": "Could not sign request: {0}".format(error)}
+            )
+            return None, 0.0, 0
+
+        latency = time.perf_counter() - start
+        bytes_sent = 0
+        with response:
+            self.send_response(response.status_code, response.reason)
+            length = response.headers.get("Content-Length")
+            for key, value in response.raw.headers.items():
+                if key.lower() not in HOP_BY_HOP_HEADERS:
+                    self.send_header(key, value)
+            chunked = (
+                length is None
+                and self.command != "HEAD"
+                and response.status_code not in (204, 304)
+            )
+            if chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+            elif length is not None:
+                self.send_header("Content-Length", length)
+            self.end_headers()
+
+            try:
+                for chunk in response.raw.stream(
+                    PROXY_CHUNK_SIZE, decode_content=False
+                ):
+                    if not chunk:
+                        continue
+                    if chunked:
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    else:
+                        self.wfile.write(chunk)
+                    bytes_sent += len(chunk)
+                if chunked:
+                    self.wfile.write(b"0\r\n\r\n")
+            except Exception:  # pylint: disable=broad-except
+                # The response has started, so the only way to report a
+                # failure is to drop the connection.
+                self.close_connection = True
+
+        if body is not None and not body.exhausted:
+            # Upstream answered without reading the whole request body, so the
+            # rest of it is still waiting on the client connection.
+            self.close_connection = True
+        return response.status_code, latency, bytes_sent
+
+    do_GET = _forward
+    do_HEAD = _forward
+    do_POST = _forward
+    do_PUT = _forward
+    do_PATCH = _forward
+    do_DELETE = _forward
+
+    def do_CONNECT(self):
+        self.close_connection = True
+        self._send_json(
+            501,
+            {
+                "message": "CONNECT is not supported: send plain HTTP requests "
+                "to the proxy, which connects to CDP over TLS itself"
+            },
+        )
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if self.server.proxy.log:
+            super().log_message(format, *args)
+
+
+class SigningProxy:
+    """
+    A local HTTP server that signs requests with one CDP credential and
+    forwards them.
+
+    Requests in origin form go to upstream, a base URL such as
+    https://api.us-west-1.cdp.cloudera.com. Requests in absolute form (as
+    sent to a forward proxy) go to the URI they name, but only if it is on
+    the upstream host or its host matches one of the allowed_hosts
+    patterns, by default the CDP API hosts; others are refused with 403.
+    Requests for allowed hosts other than upstream are always sent over
+    https, whatever scheme the client named.
+    Any x-altus-auth or x-altus-date headers sent by the client are
+    replaced. Upstream connections are kept
+    alive in the shared session pool, with up to pool_size connections per
+    host. Counters are served at /_cdpcurl/stats.
+
+    Use it as a context manager, or call start() and stop().
+    """
+
+    def __init__(
+        self,
+        access_key,
+        private_key,
+        upstream=None,
+        host="127.0.0.1",
+        port=DEFAULT_PORT,
+        verify=True,
+        pool_size=DEFAULT_POOL_SIZE,
+        log=False,
+        allowed_hosts=DEFAULT_ALLOWED_HOSTS,
+    ):
+        if upstream is not None:
+            upstream = upstream.rstrip("/")
+            if urlsplit(upstream).scheme not in ("http", "https"):
+                raise ValueError("Upstream must be an http or https URL")
+        # Fail now on a malformed credential, not on every request.
+        get_signer(access_key, private_key)
+        self.access_key = access_key
+        self.private_key = private_key
+        self.upstream = upstream
+        self.allowed_hosts = tuple(host.lower() for host in allowed_hosts)
+        self.verify = verify
+        self.pool_size = pool_size
+        self.log = log
+        self.stats = ProxyStats()
+
+        self._server = ThreadingHTTPServer((host, port), SigningProxyHandler)
+        self._server.daemon_threads = True
+        self._server.request_queue_size = 1024
+        self._server.proxy = self
+        self._thread = None
+
+    def is_allowed(self, uri):
+        """
+        Return whether the proxy may sign and forward a request for uri.
+        """
+        if self.is_upstream(uri):
+            return True
+        hostname = urlsplit(uri).hostname or ""
+        return any(fnmatchcase(hostname, pattern) for pattern in self.allowed_hosts)
+
+    def is_upstream(self, uri):
+        """
+        Return whether uri has the scheme and host of upstream.
+        """
+        if self.upstream is None:
+            return False
+        components = urlsplit(uri)
+        upstream = urlsplit(self.upstream)
+        return (components.scheme, components.netloc.lower()) == (
+            upstream.scheme,
+            upstream.netloc.lower(),
+        )
+
+    @property
+    def url(self):
+        """
+        The base URL of the proxy.
+        """
+        host, port = self._server.server_address[:2]
+        return "http://{0}:{1}".format(host, port)
+
+    def start(self):
+        """
+        Start serving on a background thread.
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        Serve on the calling thread until interrupted.
+        """
+        self._server.serve_forever()
+
+    def stop(self):
+        """
+        Stop serving and close the listening socket.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def inner_main(argv):
+    """
+    cdpcurl-proxy main entry point
+    """
+    import configargparse
+
+    parser = configargparse.ArgumentParser(
+        description="Local proxy that signs requests with CDP request signing",
+        formatter_class=configargparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--listen",
+        default="127.0.0.1",
+        help="Address to listen on",
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--upstream",
+        metavar="URL",
+        help="Base URL to forward origin-form requests to, such as "
+        "https://api.us-west-1.cdp.cloudera.com",
+    )
+    parser.add_argument(
+        "--allow-host",
+        action="append",
+        metavar="PATTERN",
+        help="Also forward absolute-form requests to hosts matching the "
+        "fnmatch PATTERN; may be repeated. Without it, only the upstream "
+        "host and CDP API hosts are allowed",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Number of keep-alive connections per upstream host",
+    )
+    parser.add_argument(
+        "-k",
+        "--insecure",
+        action="store_false",
+        help="Do not verify upstream TLS certificates",
+    )
+    parser.add_argument(
+        "--profile",
+        help="CDP profile",
+        default="default",
+        env_var="CDP_PROFILE",
+    )
+    parser.add_argument("--access_key", env_var="CDP_ACCESS_KEY_ID")
+    parser.add_argument("--private_key", env_var="CDP_PRIVATE_KEY")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log requests")
+
+    args = parser.parse_args(argv)
+
+    credentials_path = os.path.expanduser("~") + "/.cdp/credentials"
+    access_key, private_key = load_cdp_config(
+        args.access_key,
+        args.private_key,
+        credentials_path,
+        args.profile,
+    )
+
+    proxy = SigningProxy(
+        access_key,
+        private_key,
+        upstream=args.upstream,
+        host=args.listen,
+        port=args.port,
+        verify=args.insecure,
+        pool_size=args.pool_size,
+        log=args.verbose,
+        allowed_hosts=DEFAULT_ALLOWED_HOSTS + tuple(args.allow_host or ()),
+    )
+    print("Signing proxy listening on {0}".format(proxy.url), file=sys.stderr)
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+    return 0
+
+
+def main():
+    """
+    main method
+    """
+    return inner_main(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
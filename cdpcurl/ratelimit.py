@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Client-side rate limiting and adaptive concurrency control, shared by all
+requests to the same host with the same access key
+"""
+
+import threading
+import time
+
+from urllib.parse import urlparse
+
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 64
+CONGESTION_STATUSES = frozenset([429, 503])
+
+_limiters = {}
+_controllers = {}
+_registry_lock = threading.Lock()
+
+
+def limiter_key(uri, access_key):
+    """
+    Compute the key that rate limiters and concurrency controllers are
+    shared by: scheme, host, port and access key.
+    """
+    uri_components = urlparse(uri)
+    return (
+        uri_components.scheme.lower(),
+        (uri_components.hostname or "").lower(),
+        uri_components.port,
+        access_key,
+    )
+
+
+def parse_rate(value):
+    """
+    Parse a rate such as `10', `10/s', `600/m' or `3600/h' into requests per
+    second.
+    """
+    count, _, unit = value.partition("/")
+    seconds = {"": 1, "s": 1, "m": 60, "h": 3600}.get(unit.strip().lower())
+    if seconds is None:
+        raise ValueError("Unknown rate unit '{0}'".format(unit))
+    rate = float(count) / seconds
+    if rate <= 0:
+        raise ValueError("Rate must be positive")
+    return rate
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Tokens accrue at rate per second up to burst, and each request takes
+    one, so that over time requests go out at no more than rate per second,
+    with bursts of up to burst at once. Waiting requests are served in the
+    order they arrived.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._updated = clock()
+        self.configure(rate, burst)
+        self._tokens = float(self.burst)
+
+    def configure(self, rate, burst=None):
+        """
+        Change the rate and burst size. burst defaults to one second's worth
+        of tokens, and at least one.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        if burst is None:
+            burst = max(1, int(rate))
+        if burst < 1:
+            raise ValueError("Burst must be at least 1")
+        with self._lock:
+            self.rate = rate
+            self.burst = burst
+
+    def acquire(self):
+        """
+        Take a token, waiting for one to accrue if there are none. Returns
+        the number of seconds waited.
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            # Reserve the token now, going into debt if need be, so that
+            # waiters are served in order without holding the lock.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase, multiplicative-decrease (AIMD) limit on the number of
+    requests in flight.
+
+    While responses are healthy the limit grows by about one for every
+    limit responses. On a 429 or 503, a connection error, or when the
+    smoothed latency rises above latency_tolerance times the lowest smoothed
+    latency seen, the limit is multiplied by decrease. The limit only
+    decreases once for requests that were in flight together, so that one
+    burst of throttling does not collapse it to the minimum.
+    """
+
+    def __init__(
+        self,
+        initial=4,
+        minimum=DEFAULT_MIN_CONCURRENCY,
+        maximum=DEFAULT_MAX_CONCURRENCY,
+        decrease=0.5,
+        latency_tolerance=2.0,
+        smoothing=0.2,
+    ):
+        if not minimum <= initial <= maximum:
+            raise ValueError("Initial concurrency must be between the limits")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._epoch = 0
+        self._latency = None
+        self._baseline = None
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """
+        The current number of requests allowed in flight.
+        """
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """
+        The number of requests in flight.
+        """
+        return self._in_flight
+
+    def acquire(self):
+        """
+        Wait until there is room for another request in flight, and claim
+        it. Returns a token to pass to release().
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return self._epoch
+
+    def release(self, token, status=None, latency=None, error=False):
+        """
+        Release a claim made by acquire() and adjust the limit for the
+        outcome of the request: its response status, its latency in seconds,
+        or whether it failed with a connection error.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            congested = error or status in CONGESTION_STATUSES
+            if latency is not None and not congested:
+                congested = self._latency_congested(latency)
+
+            if congested:
+                if token == self._epoch:
+                    self._epoch += 1
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+            elif status is not None and status < 500:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def _latency_congested(self, latency):
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += self.smoothing * (latency - self._latency)
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
+        return self._latency > self._baseline * self.latency_tolerance
+
+
+def get_rate_limiter(uri, access_key, rate, burst=None):
+    """
+    Return the token bucket shared by requests to the host of uri with
+    access_key, creating it on first use or updating its rate and burst.
+    """
+    key = limiter_key(uri, access_key)
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _limiters[key] = limiter
+    if limiter.rate != rate or (burst is not None and limiter.burst != burst):
+        limiter.configure(rate, burst)
+    return limiter
+
+
+def get_concurrency_controller(uri, access_key, **kwargs):
+    """
+    Return the adaptive concurrency controller shared by requests to the
+    host of uri with access_key, creating it with kwargs on first use.
+    """
+    key = limiter_key(uri, access_key)
+    with _registry_lock:
+        controller = _controllers.get(key)
+        if controller is None:
+            controller = AdaptiveConcurrency(**kwargs)
+            _controllers[key] = controller
+    return controller
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Retry policy for signed requests
+"""
+
+import random
+import time
+
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+DEFAULT_RETRY_ON = frozenset([429, 500, 502, 503, 504])
+DEFAULT_RETRY_METHODS = frozenset(["DELETE", "GET", "HEAD", "OPTIONS", "PUT"])
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_MAX_RETRY_AFTER = 120.0
+
+# CDP API operations are all POSTs; those with these name prefixes only
+# read, so they are as safe to repeat as a GET.
+READ_ONLY_OPERATION_PREFIXES = ("describe", "get", "list")
+
+
+def is_read_only_operation(uri):
+    """
+    Return whether uri names a CDP operation that does not modify anything,
+    such as /api/v1/environments2/listEnvironments.
+    """
+    operation = urlparse(uri).path.rstrip("/").rsplit("/", 1)[-1]
+    return operation.startswith(READ_ONLY_OPERATION_PREFIXES)
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date,
+    into a number of seconds to wait. Returns None if value is not valid.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    if now is None:
+        now = time.time()
+    return max(0.0, retry_at - now)
+
+
+class RetryPolicy:
+    """
+    When and for how long to back off before retrying a request.
+
+    A request is retried up to retries times. Throttled (429) requests were
+    not processed, so they are always retried. Other statuses in retry_on,
+    and connection errors and timeouts, are only retried for idempotent
+    requests: those whose method is in retry_methods, and POSTs to read-only
+    CDP operations (describe*, get* and list*).
+
+    The wait before retry n (counting from zero) is drawn uniformly between
+    zero and backoff * 2 ** n seconds, capped at max_backoff, unless the
+    response has a Retry-After header, which is honored instead. No retry is
+    made if it would start more than max_time seconds after the first
+    attempt. Without a max_time, a Retry-After is honored for at most
+    max_retry_after seconds, so that a server cannot stall the client
+    indefinitely.
+    """
+
+    def __init__(
+        self,
+        retries=3,
+        max_time=None,
+        retry_on=DEFAULT_RETRY_ON,
+        retry_methods=DEFAULT_RETRY_METHODS,
+        backoff=DEFAULT_BACKOFF,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+        max_retry_after=DEFAULT_MAX_RETRY_AFTER,
+        sleep=time.sleep,
+    ):
+        self.retries = retries
+        self.max_time = max_time
+        self.retry_on = frozenset(retry_on)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.sleep = sleep
+
+    def is_idempotent(self, method, uri):
+        """
+        Return whether a request may be repeated without changing its
+        outcome.
+        """
+        method = method.upper()
+        if method in self.retry_methods:
+            return True
+        return method == "POST" and is_read_only_operation(uri)
+
+    def is_retryable(self, method, uri, status=None, error=None):
+        """
+        Return whether a request that got response status, or failed with
+        error, should be retried.
+        """
+        if status == 429:
+            return True
+        if not self.is_idempotent(method, uri):
+            return False
+        if error is not None:
+            from requests import ConnectionError, Timeout
+
+            return isinstance(error, (ConnectionError, Timeout))
+        return status in self.retry_on
+
+    def delay(self, retry_number, response=None):
+        """
+        Return how many seconds to wait before retry retry_number, counting
+        from zero.
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if self.max_time is None:
+                    return min(retry_after, self.max_retry_after)
+                return retry_after
+        ceiling = min(self.max_backoff, self.backoff * 2**retry_number)
+        return random.uniform(0, ceiling)
+
+
+class RetryState:
+    """
+    Tracks the retries made for one request under a policy.
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.num_retries = 0
+        self.time_backoff = 0.0
+        self._started = time.monotonic()
+
+    def backoff(self, method, uri, response=None, error=None):
+        """
+        Decide whether to retry after a response or error. If so, wait and
+        return the number of seconds waited; otherwise return None.
+        """
+        policy = self.policy
+        if self.num_retries >= policy.retries:
+            return None
+        status = response.status_code if response is not None else None
+        if not policy.is_retryable(method, uri, status, error):
+            return None
+
+        delay = policy.delay(self.num_retries, response)
+        if policy.max_time is not None:
+            elapsed = time.monotonic() - self._started
+            if elapsed + delay > policy.max_time:
+                return None
+
+        policy.sleep(delay)
+        self.num_retries += 1
+        self.time_backoff += delay
+        return delay
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Process-wide pool of keep-alive HTTP sessions
+"""
+
+import threading
+
+from urllib.parse import urlparse
+
+DEFAULT_POOL_SIZE = 10
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def session_key(uri, verify=True, http2=False):
+    """
+    Compute the pool key for a request: scheme, host (including port), TLS
+    verification settings and HTTP version.
+    """
+    uri_components = urlparse(uri)
+    key = (
+        uri_components.scheme.lower(),
+        (uri_components.hostname or "").lower(),
+        uri_components.port,
+        verify,
+    )
+    if http2:
+        key += ("h2",)
+    return key
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE, http2=False):
+    """
+    Create a session whose connection pools keep up to pool_size connections
+    alive per host. Its connections report to the active tracer. With http2,
+    requests are sent over HTTP/2 where the server supports it, multiplexed
+    over as few connections as possible.
+
+    The session keeps no cookies: pooled sessions are shared by every
+    credential that talks to a host, so a cookie set for one must not be
+    sent with another.
+    """
+    # requests and urllib3 are slow to import, and not every code path that
+    # imports this module sends a request.
+    from http.cookiejar import DefaultCookiePolicy
+
+    import requests
+
+    if http2:
+        try:
+            from cdpcurl.http2 import HTTP2Adapter
+        except ImportError:
+            raise Exception(
+                "HTTP/2 needs the httpx and h2 packages; install cdpcurl[http2]"
+            ) from None
+
+        adapter = HTTP2Adapter(pool_size)
+    else:
+        from cdpcurl.transport import CdpHTTPAdapter
+
+        adapter = CdpHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session = requests.Session()
+    # No domain is allowed, so no cookie is ever stored or returned.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(uri, verify=True, pool_size=DEFAULT_POOL_SIZE, http2=False):
+    """
+    Return the shared session for the scheme, host, TLS settings and HTTP
+    version of uri, creating it on first use. pool_size only applies when the
+    session is created.
+    """
+    key = session_key(uri, verify, http2)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = create_session(pool_size, http2)
+                _sessions[key] = session
+    return session
+
+
+def close_sessions():
+    """
+    Close every pooled session and drop it from the pool.
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
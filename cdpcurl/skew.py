@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Clock skew estimation from the Date header of server responses
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+DEFAULT_ALPHA = 0.3
+# CDP rejects an x-altus-date more than five minutes from its own clock.
+DEFAULT_TOLERANCE = 300
+# Dates have a resolution of one second, so smaller offsets are noise.
+MIN_OFFSET = 1.0
+# A sample this far from the estimate means the clock was stepped, and
+# replaces the estimate rather than being smoothed into it.
+JUMP = 5.0
+STATE_MAX_AGE = 24 * 60 * 60
+REJECTION_STATUSES = frozenset([401, 403])
+
+
+def _host(url):
+    return urlparse(url).netloc.lower()
+
+
+def _parse_date(value):
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return date.timestamp()
+
+
+def response_skew(response, now=None):
+    """
+    Return how many seconds the clock of the server that sent response is
+    ahead of ours, judging by its Date header, or None if it has none.
+    """
+    server_time = _parse_date(response.headers.get("Date"))
+    if server_time is None:
+        return None
+    if now is None:
+        now = time.time()
+    elapsed = getattr(response, "elapsed", None)
+    elapsed = elapsed.total_seconds() if elapsed is not None else 0.0
+    # The server stamped the Date somewhere between sending the request and
+    # receiving the response headers, and truncated it to the second.
+    return server_time + 0.5 - (now - elapsed / 2)
+
+
+class SkewEstimator:
+    """
+    Keeps a smoothed estimate of the clock skew of each host, learned from
+    the Date header of its responses, and the offset to apply to the
+    x-altus-date of requests to it.
+
+    Each response updates an exponentially weighted moving average with
+    weight alpha, except that a sample more than a few seconds from the
+    estimate, as after a clock step, replaces it. Offsets under a second
+    are below the resolution of the date and are not applied.
+
+    A response with status 401 or 403 whose x-altus-date was more than
+    tolerance seconds from the server's Date counts as a rejection for
+    clock skew; rejections holds their number.
+
+    With state_path, estimates are loaded from that JSON file, ignoring
+    those more than a day old, and save writes them back, so that the next
+    process starts already corrected. Estimators are safe to share between
+    threads.
+    """
+
+    def __init__(
+        self,
+        alpha=DEFAULT_ALPHA,
+        tolerance=DEFAULT_TOLERANCE,
+        state_path=None,
+    ):
+        if not 0 < alpha <= 1:
+            raise ValueError("Skew smoothing factor must be in (0, 1]")
+        self.alpha = alpha
+        self.tolerance = tolerance
+        self.state_path = state_path
+        self.rejections = 0
+        self._estimates = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if state_path is not None:
+            self.load()
+
+    def offset(self, url):
+        """
+        Return the number of seconds to add to the x-altus-date of a
+        request to url.
+        """
+        estimate = self._estimates.get(_host(url))
+        if estimate is None or abs(estimate[0]) < MIN_OFFSET:
+            return 0.0
+        return estimate[0]
+
+    def estimate(self, url):
+        """
+        Return the estimated skew of the host of url in seconds, or None if
+        nothing is known about it.
+        """
+        estimate = self._estimates.get(_host(url))
+        return None if estimate is None else estimate[0]
+
+    def is_rejection(self, response):
+        """
+        Return whether response rejected its request because its
+        x-altus-date was too far from the server's clock.
+        """
+        if response.status_code not in REJECTION_STATUSES:
+            return False
+        server_time = _parse_date(response.headers.get("Date"))
+        sent_time = _parse_date(response.request.headers.get("x-altus-date"))
+        if server_time is None or sent_time is None:
+            return False
+        return abs(server_time - sent_time) > self.tolerance
+
+    def observe(self, response):
+        """
+        Update the estimate for the host of response from its Date header.
+        Returns whether it was a rejection for clock skew.
+        """
+        sample = response_skew(response)
+        rejected = self.is_rejection(response)
+        if sample is None:
+            return rejected
+
+        host = _host(response.url)
+        with self._lock:
+            estimate = self._estimates.get(host)
+            if estimate is None or abs(sample - estimate[0]) > JUMP:
+                skew = sample
+            else:
+                skew = estimate[0] + self.alpha * (sample - estimate[0])
+            self._estimates[host] = (skew, time.time())
+            self._dirty = True
+            if rejected:
+                self.rejections += 1
+        return rejected
+
+    def load(self):
+        """
+        Load the estimates saved in the state file. A missing or unreadable
+        file is ignored.
+        """
+        try:
+            with open(self.state_path, "r") as state_file:
+                state = json.load(state_file)
+            now = time.time()
+            estimates = {
+                host: (float(entry["skew"]), float(entry["updated"]))
+                for host, entry in state.items()
+                if now - float(entry["updated"]) <= STATE_MAX_AGE
+            }
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return
+        with self._lock:
+            for host, estimate in estimates.items():
+                self._estimates.setdefault(host, estimate)
+
+    def save(self):
+        """
+        Write the estimates to the state file, if there is one and they
+        changed since they were loaded.
+        """
+        if self.state_path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            state = {
+                host: {"skew": skew, "updated": updated}
+                for host, (skew, updated) in self._estimates.items()
+            }
+            self._dirty = False
+
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as temp_file:
+                json.dump(state, temp_file)
+            os.replace(temp_path, self.state_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
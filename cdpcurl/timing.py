@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Request timing breakdown and curl-style --write-out formatting
+"""
+
+import contextvars
+import json
+import re
+import time
+
+from contextlib import contextmanager
+
+_current_timings = contextvars.ContextVar("cdpcurl_timings", default=None)
+
+_WRITE_OUT_RE = re.compile(r"%{(\w+)}|%%|\\[nrt\\]")
+_ESCAPES = {"\\n": "\n", "\\r": "\r", "\\t": "\t", "\\\\": "\\", "%%": "%"}
+
+
+def current_timings():
+    """
+    Return the timings being recorded in the current context, or None.
+    """
+    return _current_timings.get()
+
+
+@contextmanager
+def timing(timings):
+    """
+    Record connection events for requests sent within the context into
+    timings. Each thread or task records into its own timings.
+    """
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+class Timings:
+    """
+    Timing breakdown of one request.
+
+    Phase times are measured from begin(), which is called once the request
+    has been signed, and are cumulative, as in curl: time_connect includes
+    time_namelookup, and so on. Phases that did not happen, such as name
+    lookup on a reused connection, are reported as zero. time_signing is the
+    time spent signing the request, before begin().
+
+    When a request is retried, the phase times and time_signing describe the
+    last attempt, and num_retries and time_backoff how many retries were made
+    and how long was spent waiting between them. time_queued is the time
+    spent waiting for client-side rate and concurrency limits.
+    num_skew_rejections is the number of attempts rejected because their
+    x-altus-date was too far from the server's clock.
+    """
+
+    def __init__(self):
+        self.start = None
+        self.namelookup = None
+        self.connect = None
+        self.appconnect = None
+        self.pretransfer = None
+        self.starttransfer = None
+        self.total = None
+        self.signing = 0.0
+        self.size_download = 0
+        self.size_upload = 0
+        self.http_code = 0
+        self.num_connects = 0
+        self.num_retries = 0
+        self.time_backoff = 0.0
+        self.time_queued = 0.0
+        self.num_skew_rejections = 0
+
+    def begin(self):
+        """
+        Start the transfer clock, discarding the phase times of any previous
+        attempt.
+        """
+        self.namelookup = None
+        self.connect = None
+        self.appconnect = None
+        self.pretransfer = None
+        self.starttransfer = None
+        self.total = None
+        self.start = time.perf_counter()
+
+    def mark(self, phase):
+        """
+        Record that phase completed now.
+        """
+        setattr(self, phase, time.perf_counter())
+
+    def finish(self, response):
+        """
+        Record the end of the transfer, once the response body has been
+        consumed.
+        """
+        self.mark("total")
+        self.http_code = response.status_code
+        raw = getattr(response, "raw", None)
+        try:
+            size = raw.tell()
+        except (AttributeError, TypeError, OSError):
+            size = None
+        if not isinstance(size, int):
+            # Without a raw stream that counts, fall back to the body, if it
+            # was read into memory.
+            content = getattr(response, "content", None)
+            size = len(content) if isinstance(content, bytes) else 0
+        self.size_download = size
+
+    def _elapsed(self, phase):
+        mark = getattr(self, phase)
+        if mark is None or self.start is None:
+            return 0.0
+        return mark - self.start
+
+    def variables(self):
+        """
+        Return the write-out variables as a dict.
+        """
+        total = self._elapsed("total")
+        return {
+            "time_namelookup": self._elapsed("namelookup"),
+            "time_connect": self._elapsed("connect"),
+            "time_appconnect": self._elapsed("appconnect"),
+            "time_pretransfer": self._elapsed("pretransfer"),
+            "time_starttransfer": self._elapsed("starttransfer"),
+            "time_total": total,
+            "time_signing": self.signing,
+            "size_download": self.size_download,
+            "size_upload": self.size_upload,
+            "speed_download": self.size_download / total if total else 0.0,
+            "http_code": self.http_code,
+            "num_connects": self.num_connects,
+            "num_retries": self.num_retries,
+            "time_backoff": self.time_backoff,
+            "time_queued": self.time_queued,
+            "num_skew_rejections": self.num_skew_rejections,
+        }
+
+
+def write_out(format_string, variables):
+    """
+    Expand a curl-style --write-out format string. %{name} is replaced by
+    the variable name, %{json} by all variables as a JSON object, and \\n,
+    \\r, \\t and %% are unescaped.
+    """
+
+    def replace(match):
+        name = match.group(1)
+        if name is None:
+            return _ESCAPES[match.group(0)]
+        if name == "json":
+            return json.dumps(variables)
+        if name not in variables:
+            return match.group(0)
+        value = variables[name]
+        if isinstance(value, float):
+            return "%.6f" % value
+        return str(value)
+
+    return _WRITE_OUT_RE.sub(replace, format_string)
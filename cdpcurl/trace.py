@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Live request tracing for verbose output
+"""
+
+import contextvars
+import json
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+
+_current_tracer = contextvars.ContextVar("cdpcurl_tracer", default=None)
+
+
+def current_tracer():
+    """
+    Return the tracer active in the current context, or None.
+    """
+    return _current_tracer.get()
+
+
+@contextmanager
+def tracing(tracer):
+    """
+    Make tracer the active tracer for requests sent within the context.
+    Each thread or task has its own active tracer.
+    """
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+class Tracer:
+    """
+    Writes connection, request and response events as they happen.
+
+    The text format prefixes connection information with `*', request lines
+    with `>' and response lines with `<'. The json format writes one JSON
+    object per event. Events are written immediately, so memory use does not
+    grow with the size of the trace.
+    """
+
+    def __init__(self, output=None, trace_format="text"):
+        if trace_format not in ("text", "json"):
+            raise ValueError("Unknown trace format '{0}'".format(trace_format))
+        self.output = output
+        self.trace_format = trace_format
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _write(self, text_lines, event):
+        output = self.output if self.output is not None else sys.stdout
+        if self.trace_format == "json":
+            event["time"] = round(time.monotonic() - self._start, 6)
+            text = json.dumps(event) + "\n"
+        else:
+            text = "".join(line + "\n" for line in text_lines)
+        with self._lock:
+            output.write(text)
+            output.flush()
+
+    def info(self, message, **fields):
+        """
+        Record connection-level information.
+        """
+        fields["event"] = "info"
+        fields["message"] = message
+        self._write(["* " + message], fields)
+
+    def request_headers(self, header_block):
+        """
+        Record the request line and headers, as sent on the wire.
+        """
+        lines = header_block.decode("latin-1").split("\r\n")
+        lines = [line for line in lines if line]
+        request_line = lines[0] if lines else ""
+        self._write(
+            ["> " + line for line in lines],
+            {
+                "event": "request",
+                "request_line": request_line,
+                "headers": [line.split(": ", 1) for line in lines[1:]],
+            },
+        )
+
+    def request_body(self, size):
+        """
+        Record the number of request body bytes sent.
+        """
+        self._write(
+            ["* request body: {0} bytes sent".format(size)],
+            {"event": "request_body", "bytes": size},
+        )
+
+    def response_headers(self, version, status, reason, headers):
+        """
+        Record the status line and headers of a response.
+        """
+        version = {10: "HTTP/1.0", 11: "HTTP/1.1", 20: "HTTP/2"}.get(
+            version,
+            "HTTP/{0}".format(version),
+        )
+        status_line = "{0} {1} {2}".format(version, status, reason)
+        self._write(
+            ["< " + status_line]
+            + ["< {0}: {1}".format(key, value) for key, value in headers],
+            {
+                "event": "response",
+                "status_line": status_line,
+                "status": status,
+                "headers": [list(header) for header in headers],
+            },
+        )
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+requests transport adapter with connection-level hooks
+"""
+
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from cdpcurl.timing import current_timings
+from cdpcurl.trace import current_tracer
+
+
+class _HookedConnectionMixin:
+    """
+    Reports connection events to the tracer and timings active in the calling
+    context. When neither is active the hooks only cost context variable
+    lookups.
+    """
+
+    _hook_header_block_pending = False
+    _hook_body_bytes = 0
+    _hook_used = False
+
+    def _new_conn(self):
+        timings = current_timings()
+        if timings is None:
+            return super()._new_conn()
+
+        # Resolve the host here, so that name lookup can be timed apart from
+        # the TCP connect, and have urllib3 connect to each resolved address
+        # in turn, as it would itself.
+        timings.num_connects += 1
+        dns_host = self._dns_host
+        try:
+            addresses = socket.getaddrinfo(dns_host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            addresses = []
+        timings.mark("namelookup")
+
+        if not addresses:
+            sock = super()._new_conn()
+        else:
+            try:
+                for index, address in enumerate(addresses):
+                    self._dns_host = address[4][0]
+                    try:
+                        sock = super()._new_conn()
+                        break
+                    except Exception:  # pylint: disable=broad-except
+                        if index == len(addresses) - 1:
+                            raise
+            finally:
+                self._dns_host = dns_host
+        timings.mark("connect")
+        return sock
+
+    def connect(self):
+        super().connect()
+        timings = current_timings()
+        if timings is not None and hasattr(self.sock, "version"):
+            timings.mark("appconnect")
+        tracer = current_tracer()
+        if tracer is None:
+            return
+        try:
+            address, port = self.sock.getpeername()[:2]
+        except (AttributeError, OSError):
+            address, port = None, self.port
+        tracer.info(
+            "Connected to {0} ({1}) port {2}".format(self.host, address, port),
+            host=self.host,
+            address=address,
+            port=port,
+        )
+        version = getattr(self.sock, "version", None)
+        if version is not None:
+            cipher = self.sock.cipher()
+            tracer.info(
+                "TLS connection using {0} / {1}".format(version(), cipher[0]),
+                tls_version=version(),
+                cipher=cipher[0],
+            )
+
+    def close(self):
+        super().close()
+        self._hook_used = False
+
+    def putrequest(self, *args, **kwargs):
+        tracer = current_tracer()
+        if tracer is not None and self._hook_used and self.sock is not None:
+            tracer.info(
+                "Re-using existing connection to {0} port {1}".format(
+                    self.host,
+                    self.port,
+                ),
+                host=self.host,
+                port=self.port,
+            )
+        timings = current_timings()
+        if timings is not None:
+            # Plain HTTP connections would otherwise connect lazily when the
+            # headers are sent, after the request has started.
+            if self.sock is None and self.auto_open:
+                self.connect()
+            timings.mark("pretransfer")
+        self._hook_used = True
+        self._hook_header_block_pending = True
+        self._hook_body_bytes = 0
+        return super().putrequest(*args, **kwargs)
+
+    def send(self, data):
+        super().send(data)
+        if self._hook_header_block_pending:
+            self._hook_header_block_pending = False
+            header_block, _, body = bytes(data).partition(b"\r\n\r\n")
+            tracer = current_tracer()
+            if tracer is not None:
+                tracer.request_headers(header_block)
+            self._hook_body_bytes += len(body)
+        elif hasattr(data, "__len__"):
+            self._hook_body_bytes += len(data)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        timings = current_timings()
+        if timings is not None:
+            timings.mark("starttransfer")
+            timings.size_upload = self._hook_body_bytes
+        tracer = current_tracer()
+        if tracer is not None:
+            if self._hook_body_bytes:
+                tracer.request_body(self._hook_body_bytes)
+            tracer.response_headers(
+                response.version,
+                response.status,
+                response.reason,
+                list(response.headers.items()),
+            )
+        return response
+
+
+class HookedHTTPConnection(_HookedConnectionMixin, HTTPConnection):
+    """
+    HTTP connection with tracing hooks.
+    """
+
+
+class HookedHTTPSConnection(_HookedConnectionMixin, HTTPSConnection):
+    """
+    HTTPS connection with tracing hooks.
+    """
+
+
+class HookedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = HookedHTTPConnection
+
+
+class HookedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = HookedHTTPSConnection
+
+
+class CdpHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections report to the active tracer and timings.
+    Mount it on a session to trace and time requests made through that
+    session.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": HookedHTTPConnectionPool,
+            "https": HookedHTTPSConnectionPool,
+        }
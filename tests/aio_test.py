@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from cdpcurl.cdpv1sign import make_signature_header
+from cdpcurl.clock import DateProvider
+
+web = pytest.importorskip("aiohttp.web")
+
+from cdpcurl.aio import AsyncClient, create_session, make_request  # noqa: E402
+from tests.conftest import PRIVATE_KEY  # noqa: E402
+
+ACCESS_KEY = "ABC"
+
+
+async def _start_server(handler):
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, "http://127.0.0.1:{0}".format(port)
+
+
+def test_make_request_signs_request():
+    seen = {}
+
+    async def handler(request):
+        seen["method"] = request.method
+        seen["headers"] = dict(request.headers)
+        seen["body"] = await request.read()
+        return web.json_response({"ok": True})
+
+    async def scenario():
+        runner, base_uri = await _start_server(handler)
+        try:
+            async with create_session() as session:
+                response = await make_request(
+                    "POST",
+                    base_uri + "/api/v1/iam/getAccount",
+                    {"Content-Type": "application/json"},
+                    "{}",
+                    ACCESS_KEY,
+                    PRIVATE_KEY,
+                    False,
+                    session,
+                )
+                return base_uri, response.status, await response.json()
+        finally:
+            await runner.cleanup()
+
+    base_uri, status, body = asyncio.run(scenario())
+
+    assert status == 200
+    assert body == {"ok": True}
+    assert seen["method"] == "POST"
+    assert seen["body"] == b"{}"
+    expected_auth = make_signature_header(
+        "POST",
+        base_uri + "/api/v1/iam/getAccount",
+        {
+            "Content-Type": "application/json",
+            "x-altus-date": seen["headers"]["x-altus-date"],
+        },
+        ACCESS_KEY,
+        PRIVATE_KEY,
+    )
+    assert seen["headers"]["x-altus-auth"] == expected_auth
+
+
+def test_make_request_uses_clock():
+    seen = {}
+
+    async def handler(request):
+        seen["date"] = request.headers["x-altus-date"]
+        return web.json_response({})
+
+    async def scenario():
+        runner, base_uri = await _start_server(handler)
+        try:
+            async with AsyncClient(
+                ACCESS_KEY, PRIVATE_KEY, clock=DateProvider(now=lambda: 0)
+            ) as client:
+                await client.request("GET", base_uri + "/")
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(scenario())
+
+    assert seen["date"] == "Thu, 01 Jan 1970 00:00:00 GMT"
+
+
+def test_make_request_rejects_presigned_headers():
+    async def scenario():
+        await make_request(
+            "GET",
+            "http://127.0.0.1/",
+            {"x-altus-date": "Thu, 01 Jan 1970 00:00:00 GMT"},
+            "",
+            ACCESS_KEY,
+            PRIVATE_KEY,
+            False,
+            None,
+        )
+
+    with pytest.raises(Exception, match="x-altus-date found in headers"):
+        asyncio.run(scenario())
+
+
+def test_async_client_limits_concurrency():
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return web.json_response({})
+
+    async def scenario():
+        runner, base_uri = await _start_server(handler)
+        try:
+            async with AsyncClient(ACCESS_KEY, PRIVATE_KEY, concurrency=3) as client:
+                responses = await asyncio.gather(
+                    *[
+                        client.request("POST", base_uri + "/api/v1/x", data="{}")
+                        for _ in range(20)
+                    ],
+                )
+            return [response.status for response in responses]
+        finally:
+            await runner.cleanup()
+
+    statuses = asyncio.run(scenario())
+
+    assert statuses == [200] * 20
+    assert state["max_in_flight"] == 3
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for CdpV1Auth.
+"""
+
+import subprocess
+import sys
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from cdpcurl import cdpv1sign
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.cdpv1sign import CdpV1Auth
+from cdpcurl.mockserver import public_key_from_private_key, verify_request
+from tests.conftest import PRIVATE_KEY
+
+PUBLIC_KEYS = {"ABC": public_key_from_private_key(PRIVATE_KEY)}
+
+
+class VerifyingHandler(BaseHTTPRequestHandler):
+    """
+    Redirects /redirect/CODE?to=LOCATION with status CODE, and answers every
+    other request with whether its signature verified.
+    """
+
+    protocol_version = "HTTP/1.1"
+    received = []
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        error = verify_request(self.command, self.path, self.headers, PUBLIC_KEYS)
+        self.received.append((self.command, self.path, error))
+
+        if self.path.startswith("/redirect/"):
+            code, _, location = self.path[len("/redirect/") :].partition("?to=")
+            self.send_response(int(code))
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = (error or "ok").encode()
+        self.send_response(200 if error is None else 401)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture()
+def server(http_server):
+    VerifyingHandler.received = []
+    return http_server(VerifyingHandler)
+
+
+@pytest.fixture()
+def session():
+    with requests.Session() as session:
+        session.auth = CdpV1Auth("ABC", PRIVATE_KEY)
+        yield session
+
+
+def test_auth_signs_requests(server, session):
+    headers = {"Content-Type": "application/json"}
+
+    response = session.post(server + "/api/v1/iam/getAccount", "{}", headers=headers)
+
+    assert response.text == "ok"
+    assert headers == {"Content-Type": "application/json"}
+    assert response.request.headers["x-altus-auth"].startswith("eyJ")
+
+
+def test_auth_signs_every_request_afresh(server):
+    dates = iter(["Thu, 01 Jan 1970 00:00:00 GMT", "Fri, 02 Jan 1970 00:00:00 GMT"])
+    auth = CdpV1Auth("ABC", PRIVATE_KEY, clock=lambda: next(dates))
+
+    first = requests.Request("POST", server + "/a", auth=auth).prepare()
+    second = requests.Request("POST", server + "/a", auth=auth).prepare()
+
+    assert first.headers["x-altus-date"] != second.headers["x-altus-date"]
+    assert first.headers["x-altus-auth"] != second.headers["x-altus-auth"]
+
+
+@pytest.mark.parametrize(
+    "code,method",
+    [(301, "GET"), (302, "GET"), (303, "GET"), (307, "POST"), (308, "POST")],
+)
+def test_auth_signs_redirects(server, session, code, method):
+    response = session.post(
+        server + "/redirect/{0}?to=/api/v1/iam/getAccount".format(code),
+        "{}",
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.text == "ok"
+    assert VerifyingHandler.received == [
+        ("POST", "/redirect/{0}?to=/api/v1/iam/getAccount".format(code), None),
+        (method, "/api/v1/iam/getAccount", None),
+    ]
+    # The redirect response keeps the request that was actually sent.
+    sent = response.history[0].request
+    assert verify_request("POST", sent.path_url, sent.headers, PUBLIC_KEYS) is None
+
+
+def test_auth_drops_signature_on_redirect_to_other_host(server, session, http_server):
+    other = http_server(VerifyingHandler).replace("127.0.0.1", "localhost")
+
+    response = session.get(server + "/redirect/302?to=" + other + "/target")
+
+    assert response.status_code == 401
+    assert VerifyingHandler.received[-1] == (
+        "GET",
+        "/target",
+        "missing x-altus-auth header",
+    )
+
+
+def test_make_request_with_auth(server):
+    headers = {"Content-Type": "application/json"}
+
+    response = make_request(
+        "POST",
+        server + "/api/v1/iam/getAccount",
+        headers,
+        "{}",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        auth=CdpV1Auth("ABC", PRIVATE_KEY),
+    )
+
+    assert response.text == "ok"
+    assert headers == {"Content-Type": "application/json"}
+    assert response.timings.signing > 0
+
+
+def test_cdpv1sign_loads_auth_lazily():
+    script = (
+        "import sys\n"
+        "import cdpcurl.cdpv1sign as cdpv1sign\n"
+        "assert 'requests' not in sys.modules\n"
+        "assert cdpv1sign.CdpV1Auth.__name__ == 'CdpV1Auth'\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    with pytest.raises(AttributeError):
+        cdpv1sign.NoSuchThing  # pylint: disable=pointless-statement
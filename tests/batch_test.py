@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from requests import Response
+
+from cdpcurl.batch import CredentialResolver, parse_request_line, run_batch
+from cdpcurl.cdpcurl import inner_main
+from tests.conftest import PRIVATE_KEY
+
+DEFAULT_HEADERS = {"Content-Type": "application/json"}
+
+
+def _response(status_code, text):
+    response = Response()
+    response.status_code = status_code
+    response._content = text.encode("utf-8")
+    return response
+
+
+def test_parse_request_line():
+    spec = parse_request_line(
+        '{"method": "POST", "uri": "https://host/a", "data": {"x": 1}, '
+        '"headers": ["Content-Type: text/plain"], "profile": "p"}',
+        DEFAULT_HEADERS,
+    )
+
+    assert spec == {
+        "method": "POST",
+        "uri": "https://host/a",
+        "data": '{"x": 1}',
+        "headers": {"Content-Type": "text/plain"},
+        "profile": "p",
+    }
+
+
+def test_parse_request_line_defaults():
+    spec = parse_request_line('{"uri": "https://host/a"}', DEFAULT_HEADERS)
+
+    assert spec["method"] == "GET"
+    assert spec["data"] == ""
+    assert spec["headers"] == DEFAULT_HEADERS
+    assert spec["headers"] is not DEFAULT_HEADERS
+    assert spec["profile"] is None
+
+
+def test_run_batch_preserves_input_order():
+    lines = ['{"uri": "https://host/%d"}' % i for i in range(20)]
+
+    def request_fn(uri, **kwargs):
+        index = int(uri.rsplit("/", 1)[1])
+        time.sleep((20 - index) * 0.001)
+        return _response(200, '{"index": %d}' % index)
+
+    results = list(run_batch(lines, request_fn, DEFAULT_HEADERS, concurrency=4))
+
+    assert [r["line"] for r in results] == list(range(1, 21))
+    assert [r["body"]["index"] for r in results] == list(range(20))
+
+
+def test_run_batch_completion_order():
+    lines = ['{"uri": "https://host/slow"}', '{"uri": "https://host/fast"}']
+    release = threading.Event()
+
+    def request_fn(uri, **kwargs):
+        # The slow request finishes only once the fast result was yielded.
+        if uri.endswith("slow"):
+            assert release.wait(5)
+        return _response(200, uri)
+
+    results = run_batch(
+        lines,
+        request_fn,
+        DEFAULT_HEADERS,
+        concurrency=2,
+        ordered=False,
+    )
+    first = next(results)
+    release.set()
+
+    assert [first["line"]] + [r["line"] for r in results] == [2, 1]
+
+
+def test_run_batch_reports_errors_per_line():
+    lines = ['{"uri": "https://host/ok"}', "not json", "", '{"method": "GET"}']
+
+    results = list(
+        run_batch(lines, lambda **kwargs: _response(404, "nope"), DEFAULT_HEADERS),
+    )
+
+    assert results[0] == {"line": 1, "status": 404, "body": "nope"}
+    assert results[1]["line"] == 2 and "error" in results[1]
+    assert results[2] == {"line": 4, "error": "Batch request is missing 'uri'"}
+
+
+def test_run_batch_bounds_read_ahead():
+    consumed = []
+
+    def lines():
+        for i in range(100):
+            consumed.append(i)
+            yield '{"uri": "https://host/%d"}' % i
+
+    results = run_batch(
+        lines(),
+        lambda **kwargs: _response(200, "{}"),
+        DEFAULT_HEADERS,
+        concurrency=2,
+    )
+    next(results)
+
+    assert len(consumed) <= 4
+    results.close()
+
+
+def test_credential_resolver_caches_profiles(mocker):
+    load = mocker.patch(
+        "cdpcurl.batch.load_cdp_config",
+        side_effect=lambda a, p, path, profile: (profile + "_ak", profile + "_pk"),
+    )
+    resolver = CredentialResolver(None, None, "tests/data/credentials", "default")
+
+    assert resolver.resolve() == ("default_ak", "default_pk")
+    assert resolver.resolve("custom_profile") == (
+        "custom_profile_ak",
+        "custom_profile_pk",
+    )
+    resolver.resolve()
+    resolver.resolve("custom_profile")
+
+    assert load.call_count == 2
+
+
+def test_inner_main_batch(mocker, monkeypatch, capsys):
+    request = mocker.patch("requests.Session.request")
+    request.side_effect = [_response(200, '{"a": 1}'), _response(500, "boom")]
+    monkeypatch.setattr(
+        "sys.stdin",
+        io.StringIO(
+            '{"method": "POST", "uri": "https://host/a", "data": {}}\n'
+            '{"uri": "https://host/b"}\n',
+        ),
+    )
+
+    status = inner_main(
+        [
+            "--batch",
+            "-",
+            "--concurrency",
+            "1",
+            "--access_key",
+            "ABC",
+            "--private_key",
+            PRIVATE_KEY,
+        ],
+    )
+
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert status == 1
+    assert output == [
+        {"line": 1, "status": 200, "body": {"a": 1}},
+        {"line": 2, "status": 500, "body": "boom"},
+    ]
+    assert request.call_args_list[0].args == ("POST", "https://host/a")
+    assert request.call_args_list[0].kwargs["data"] == b"{}"
+
+
+@pytest.mark.parametrize(
+    "option",
+    [["-v"], ["--trace-file", "trace.log"], ["-w", "%{http_code}"]],
+)
+def test_inner_main_batch_rejects_single_request_output(option, capsys):
+    with pytest.raises(SystemExit):
+        inner_main(["--batch", "-"] + option)
+
+    assert "cannot be combined with --batch" in capsys.readouterr().err
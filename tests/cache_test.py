@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for the response cache.
+"""
+
+import gzip
+import json
+import multiprocessing
+import os
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from cdpcurl.cache import ResponseCache, cache_key, is_cacheable
+from cdpcurl.cdpcurl import inner_main, make_request
+from cdpcurl.mockserver import MockCdpServer, public_key_from_private_key
+from tests.conftest import PRIVATE_KEY
+
+PUBLIC_KEYS = {"ABC": public_key_from_private_key(PRIVATE_KEY)}
+METADATA = {"status": 200, "reason": "OK", "url": "u", "headers": {}}
+
+
+@pytest.fixture()
+def server():
+    with MockCdpServer(public_keys=PUBLIC_KEYS) as server:
+        yield server
+
+
+def _post(uri, cache, data="{}"):
+    return make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        data,
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        cache=cache,
+    )
+
+
+def test_is_cacheable():
+    assert is_cacheable("GET", "https://host/anything")
+    assert is_cacheable("post", "https://host/api/v1/iam/getAccount")
+    assert is_cacheable("POST", "https://host/api/v1/dl/listDatalakes")
+    assert not is_cacheable("POST", "https://host/api/v1/dl/createDatalake")
+    assert not is_cacheable("DELETE", "https://host/api/v1/dl/describeDatalake")
+
+
+def test_cache_key():
+    key = cache_key("POST", "https://host/a", "ABC", b"{}")
+
+    assert key == cache_key("post", "https://host/a", "ABC", "{}")
+    assert key != cache_key("GET", "https://host/a", "ABC", b"{}")
+    assert key != cache_key("POST", "https://host/b", "ABC", b"{}")
+    assert key != cache_key("POST", "https://host/a", "DEF", b"{}")
+    assert key != cache_key("POST", "https://host/a", "ABC", b"{ }")
+    assert cache_key("GET", "u", "ABC", None) == cache_key("GET", "u", "ABC", b"")
+
+
+def test_round_trip(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+
+    assert cache.get("k") is None
+    cache.put("k", METADATA, b"body")
+    metadata, body = cache.get("k")
+
+    assert body == b"body"
+    assert metadata["status"] == 200
+    assert cache.stats == {
+        "hits": 1,
+        "misses": 1,
+        "stores": 1,
+        "evictions": 0,
+        "bypasses": 0,
+    }
+    assert [name for name in os.listdir(tmp_path)] == ["k.entry"]
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cache.put("k", METADATA, b"body")
+
+    assert cache.get("k") is None
+
+
+def test_refresh_and_bypass_modes(tmp_path):
+    ResponseCache(str(tmp_path)).put("old", METADATA, b"old")
+
+    refresh = ResponseCache(str(tmp_path), mode="refresh")
+    assert refresh.get("old") is None
+    refresh.put("new", METADATA, b"new")
+
+    bypass = ResponseCache(str(tmp_path), mode="bypass")
+    assert bypass.get("new") is None
+    bypass.put("other", METADATA, b"other")
+
+    assert sorted(os.listdir(tmp_path)) == ["new.entry", "old.entry"]
+    assert refresh.stats["bypasses"] == bypass.stats["bypasses"] == 1
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    cache.put("a", METADATA, b"a")
+    cache.put("b", METADATA, b"b")
+    os.utime(tmp_path / "a.entry", (1000, 1000))
+    os.utime(tmp_path / "b.entry", (2000, 2000))
+
+    # Reading a marks it as the most recently used.
+    cache.get("a")
+    cache.put("c", METADATA, b"c")
+
+    assert sorted(os.listdir(tmp_path)) == ["a.entry", "c.entry"]
+    assert cache.stats["evictions"] == 1
+
+
+def test_evicts_by_size(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=2500)
+    for index, key in enumerate("abc"):
+        cache.put(key, METADATA, b"x" * 1000)
+        os.utime(tmp_path / (key + ".entry"), (1000 + index, 1000 + index))
+    cache.evict()
+
+    assert sorted(os.listdir(tmp_path)) == ["b.entry", "c.entry"]
+
+
+def test_does_not_store_bodies_over_max_bytes(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10)
+    cache.put("k", METADATA, b"x" * 11)
+
+    assert os.listdir(tmp_path) == []
+
+
+def _hammer(directory, worker):
+    cache = ResponseCache(directory, max_entries=5)
+    for index in range(100):
+        fill = bytes([65 + (worker + index) % 26])
+        cache.put("key%d" % (index % 8), METADATA, fill * 50000)
+        entry = cache.get("key%d" % ((index + 3) % 8))
+        if entry is not None:
+            body = entry[1]
+            assert len(body) == 50000 and body == body[:1] * 50000
+    cache.flush_stats()
+
+
+def test_concurrent_processes(tmp_path):
+    processes = [
+        multiprocessing.Process(target=_hammer, args=(str(tmp_path), worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    stats = ResponseCache(str(tmp_path)).flush_stats()
+    assert stats["stores"] == 400
+    assert stats["hits"] + stats["misses"] == 400
+    assert stats["entries"] <= 5
+
+
+def test_flush_stats_accumulates(tmp_path):
+    first = ResponseCache(str(tmp_path))
+    first.get("k")
+    first.flush_stats()
+    second = ResponseCache(str(tmp_path))
+    second.put("k", METADATA, b"body")
+    second.get("k")
+
+    stats = second.flush_stats()
+
+    assert stats == {
+        "hits": 1,
+        "misses": 1,
+        "stores": 1,
+        "evictions": 0,
+        "bypasses": 0,
+        "entries": 1,
+        "bytes": os.path.getsize(tmp_path / "k.entry"),
+    }
+    assert second.stats["hits"] == 0
+
+
+def test_make_request_serves_from_cache(server, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    uri = server.url + "/api/v1/iam/getAccount"
+
+    first = _post(uri, cache)
+    second = _post(uri, cache)
+
+    assert first.from_cache is False
+    assert second.from_cache is True
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["Content-Type"] == "application/json"
+    assert server.stats() == {"requests": 1, "ok": 1}
+
+    _post(uri, cache, data='{"other": 1}')
+    assert server.stats() == {"requests": 2, "ok": 2}
+
+
+def test_make_request_does_not_cache_mutations_or_errors(server, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+
+    _post(server.url + "/api/v1/iam/createUser", cache)
+    _post(server.url + "/api/v1/iam/createUser", cache)
+    server.error_rate = 1.0
+    _post(server.url + "/api/v1/iam/getAccount", cache)
+    _post(server.url + "/api/v1/iam/getAccount", cache)
+
+    assert server.stats()["requests"] == 4
+    assert os.listdir(tmp_path) == []
+
+
+class ChunkedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.write(b"2\r\n{}\r\n0\r\n\r\n")
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def test_make_request_streams_responses_of_unknown_length(http_server, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+
+    response = make_request(
+        "POST",
+        http_server(ChunkedHandler) + "/api/v1/iam/getAccount",
+        {"Content-Type": "application/json"},
+        "{}",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        stream=True,
+        cache=cache,
+    )
+
+    assert not response._content_consumed
+    assert response.json() == {}
+    assert os.listdir(tmp_path) == []
+
+
+class GzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = json.dumps({"items": ["x" * 100] * 1000}).encode()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        data = gzip.compress(self.body)
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.mark.parametrize("max_bytes, cached", [(10000, False), (1000000, True)])
+def test_make_request_caps_decoded_size(http_server, tmp_path, max_bytes, cached):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_bytes=max_bytes)
+
+    response = make_request(
+        "POST",
+        http_server(GzipHandler) + "/api/v1/iam/getAccount",
+        {"Content-Type": "application/json"},
+        "{}",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        stream=True,
+        cache=cache,
+    )
+
+    assert int(response.headers["Content-Length"]) < 10000
+    assert response._content_consumed is cached
+    assert b"".join(response.iter_content(4096)) == GzipHandler.body
+    assert bool(os.listdir(tmp_path)) is cached
+
+
+def test_make_request_refresh(server, tmp_path):
+    uri = server.url + "/api/v1/iam/getAccount"
+    _post(uri, ResponseCache(str(tmp_path), ttl=60))
+
+    response = _post(uri, ResponseCache(str(tmp_path), ttl=60, mode="refresh"))
+
+    assert response.from_cache is False
+    assert server.stats()["requests"] == 2
+
+
+def test_inner_main_cache(server, tmp_path, capsys):
+    argv = [
+        "-X",
+        "POST",
+        "-d",
+        "{}",
+        "--cache-ttl",
+        "60",
+        "--cache-dir",
+        str(tmp_path),
+        "--cache-stats",
+        "--access_key",
+        "ABC",
+        "--private_key",
+        PRIVATE_KEY,
+        server.url + "/api/v1/iam/getAccount",
+    ]
+
+    inner_main(argv)
+    first = capsys.readouterr()
+    inner_main(argv)
+    second = capsys.readouterr()
+
+    assert second.out == first.out == '{"path": "/api/v1/iam/getAccount"}\n'
+    assert json.loads(first.err)["misses"] == 1
+    assert json.loads(second.err)["hits"] == 1
+    assert server.stats()["requests"] == 1
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Property tests comparing the canonical request builder with the original
+implementation.
+"""
+
+from email.message import Message
+
+import pytest
+
+from benchmarks.bench_canonical import reference_canonical_request_string
+from cdpcurl.cdpv1sign import (
+    create_canonical_request_bytes,
+    create_canonical_request_string,
+)
+
+given = pytest.importorskip("hypothesis").given
+st = pytest.importorskip("hypothesis.strategies")
+
+header_names = st.one_of(
+    st.sampled_from(
+        [
+            "Content-Type",
+            "content-type",
+            "CONTENT-TYPE",
+            "x-altus-date",
+            "X-Altus-Date",
+            "Accept",
+            "x-altus-auth",
+        ]
+    ),
+    st.text(min_size=1, max_size=20),
+)
+header_values = st.one_of(st.none(), st.text(max_size=40))
+uris = st.one_of(
+    st.text(max_size=60),
+    st.builds(
+        "{0}://{1}{2}{3}{4}".format,
+        st.sampled_from(["http", "https"]),
+        st.sampled_from(["h", "api.us-west-1.cdp.cloudera.com", "127.0.0.1:8080"]),
+        st.text(alphabet="/abc;=%&?#é ", max_size=20),
+        st.sampled_from(["", "?", "?a=b", "?a", "?a=b&c=d"]),
+        st.sampled_from(["", "#frag", "#"]),
+    ),
+)
+methods = st.one_of(
+    st.sampled_from(["GET", "post", "Put", "DELETE"]),
+    st.text(max_size=8),
+)
+auth_methods = st.sampled_from(["ed25519v1", ""])
+
+
+@given(
+    methods,
+    uris,
+    st.dictionaries(header_names, header_values, max_size=12),
+    auth_methods,
+)
+def test_canonical_request_matches_reference(method, uri, headers, auth_method):
+    expected = reference_canonical_request_string(method, uri, headers, auth_method)
+
+    assert create_canonical_request_string(method, uri, headers, auth_method) == (
+        expected
+    )
+    assert create_canonical_request_bytes(method, uri, headers, auth_method) == (
+        expected.encode("utf-8")
+    )
+
+
+@given(
+    methods,
+    uris,
+    st.lists(
+        st.tuples(
+            header_names.filter(lambda name: name.isascii() and name.isprintable()),
+            st.text(alphabet="abc ;/", max_size=20),
+        ),
+        max_size=8,
+    ),
+)
+def test_canonical_request_matches_reference_for_messages(method, uri, headers):
+    # Server-side header objects may carry the same header more than once.
+    message = Message()
+    for name, value in headers:
+        message[name] = value
+
+    assert create_canonical_request_string(method, uri, message, "ed25519v1") == (
+        reference_canonical_request_string(method, uri, message, "ed25519v1")
+    )
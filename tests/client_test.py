@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for CdpClient.
+"""
+
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from cdpcurl.client import CdpClient
+from cdpcurl.mockserver import MockCdpServer, public_key_from_private_key
+from cdpcurl.retry import RetryPolicy
+from tests.conftest import PRIVATE_KEY
+
+
+@pytest.fixture()
+def server():
+    with MockCdpServer(
+        public_keys={"ABC": public_key_from_private_key(PRIVATE_KEY)},
+        items=25,
+        page_size=10,
+    ) as server:
+        yield server
+
+
+@pytest.fixture()
+def client(server):
+    return CdpClient(server.url, access_key="ABC", private_key=PRIVATE_KEY)
+
+
+def test_client_resolves_profile(tmp_path):
+    credentials = tmp_path / "credentials"
+    credentials.write_text(
+        "[team]\ncdp_access_key_id = team-key\ncdp_private_key = {0}\n".format(
+            PRIVATE_KEY,
+        ),
+    )
+
+    client = CdpClient(profile="team", credentials_path=str(credentials))
+    assert (client.access_key, client.private_key) == ("team-key", PRIVATE_KEY)
+
+    client = CdpClient(
+        profile="team",
+        credentials_path=str(credentials),
+        access_key="ABC",
+    )
+    assert (client.access_key, client.private_key) == ("ABC", PRIVATE_KEY)
+
+
+def test_client_rejects_bad_key():
+    with pytest.raises(Exception, match="ed25519v1"):
+        CdpClient(access_key="ABC", private_key="not a key")
+
+
+def test_client_url(client, server):
+    assert client.url("/api/v1/iam/getAccount") == (
+        server.url + "/api/v1/iam/getAccount"
+    )
+    assert client.url("https://other/api") == "https://other/api"
+    with pytest.raises(ValueError):
+        CdpClient(access_key="ABC", private_key=PRIVATE_KEY).url("/api")
+
+
+def test_client_call(client):
+    assert client.call("/api/v1/iam/getAccount") == {"path": "/api/v1/iam/getAccount"}
+
+
+def test_client_call_streams(client):
+    with client.call("/api/v1/iam/listUsers", {"pageSize": 5}, stream=True) as response:
+        body = b"".join(response.iter_content(16))
+
+    assert len(json.loads(body)["users"]) == 5
+
+
+def test_client_call_raises_http_errors(server):
+    client = CdpClient(server.url, access_key="DEF", private_key=PRIVATE_KEY)
+
+    with pytest.raises(requests.HTTPError) as error:
+        client.call("/api/v1/iam/getAccount")
+
+    assert error.value.response.status_code == 401
+
+
+def test_client_request_does_not_modify_headers(client):
+    headers = {"Content-Type": "application/json"}
+
+    response = client.request("POST", "/api/v1/iam/getAccount", "{}", headers)
+
+    assert response.status_code == 200
+    assert headers == {"Content-Type": "application/json"}
+
+
+def test_client_paginate(client):
+    pages = list(client.paginate("/api/v1/iam/listUsers", page_size=10))
+
+    assert [len(page["users"]) for page in pages] == [10, 10, 5]
+
+
+def test_client_retries():
+    with MockCdpServer(
+        public_keys={"ABC": public_key_from_private_key(PRIVATE_KEY)},
+        throttle_rate=0.5,
+        seed=1,
+    ) as server:
+        client = CdpClient(
+            server.url,
+            access_key="ABC",
+            private_key=PRIVATE_KEY,
+            retry=RetryPolicy(retries=10, sleep=lambda seconds: None),
+        )
+
+        for _ in range(10):
+            assert client.call("/api/v1/iam/getAccount")
+
+        assert server.stats()["ok"] == 10
+        assert server.stats()["throttled"] > 0
+
+
+def test_client_is_thread_safe(client, server):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda index: client.call("/api/v1/iam/listUsers", {"pageSize": index}),
+                range(1, 21),
+            )
+        )
+
+    assert [len(result["users"]) for result in results] == list(range(1, 21))
+    assert server.stats()["ok"] == 20
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for the x-altus-date clock.
+"""
+
+import itertools
+import threading
+
+from email.utils import formatdate
+
+from cdpcurl.clock import DateProvider, http_date
+
+
+def test_date_provider_formats_each_second_once(mocker):
+    now = iter([0, 0.5, 0.999, 1, 86399.9])
+    format_date = mocker.patch("cdpcurl.clock.formatdate", side_effect=formatdate)
+    clock = DateProvider(now=lambda: next(now))
+
+    dates = [clock() for _ in range(5)]
+
+    assert dates == [
+        "Thu, 01 Jan 1970 00:00:00 GMT",
+        "Thu, 01 Jan 1970 00:00:00 GMT",
+        "Thu, 01 Jan 1970 00:00:00 GMT",
+        "Thu, 01 Jan 1970 00:00:01 GMT",
+        "Thu, 01 Jan 1970 23:59:59 GMT",
+    ]
+    assert format_date.call_count == 3
+
+
+def test_date_provider_offset():
+    clock = DateProvider(now=lambda: 100.5)
+
+    assert clock(-0.5) == "Thu, 01 Jan 1970 00:01:40 GMT"
+    assert clock(600) == "Thu, 01 Jan 1970 00:11:40 GMT"
+    assert clock() == "Thu, 01 Jan 1970 00:01:40 GMT"
+
+
+def test_http_date_is_current_time():
+    before = formatdate(usegmt=True)
+    date = http_date()
+    after = formatdate(usegmt=True)
+
+    assert date in (before, after)
+
+
+def test_date_provider_is_thread_safe():
+    ticks = itertools.count()
+    clock = DateProvider(now=lambda: next(ticks) / 1000)
+    valid = {formatdate(second, usegmt=True) for second in range(100)}
+    dates = []
+
+    def sign():
+        dates.extend(clock() for _ in range(5000))
+
+    threads = [threading.Thread(target=sign) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(dates) == 40000
+    assert set(dates) <= valid
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for request and response compression.
+"""
+
+import gzip
+import io
+import json
+
+import pytest
+import requests
+
+from cdpcurl.cdpcurl import inner_main, make_request
+from cdpcurl.cdpv1sign import create_canonical_request_string
+from cdpcurl.compression import (
+    accept_encoding,
+    compress_body,
+    decompress_body,
+)
+from cdpcurl.mockserver import (
+    MockCdpServer,
+    public_key_from_private_key,
+    response_encoding,
+)
+from tests.conftest import PRIVATE_KEY
+
+PUBLIC_KEYS = {"ABC": public_key_from_private_key(PRIVATE_KEY)}
+BODY = json.dumps({"padding": "x" * 100000}).encode("utf-8")
+ENCODINGS = [
+    "gzip",
+    pytest.param(
+        "zstd",
+        marks=pytest.mark.skipif(
+            "zstd" not in accept_encoding(), reason="zstd is not installed"
+        ),
+    ),
+]
+
+
+@pytest.fixture()
+def server():
+    with MockCdpServer(
+        public_keys=PUBLIC_KEYS,
+        items=200,
+        page_size=200,
+        item_size=100,
+        compress_responses=True,
+    ) as server:
+        yield server
+
+
+def test_accept_encoding():
+    assert accept_encoding().startswith("gzip, deflate")
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_compress_body(encoding):
+    compressed = compress_body(BODY, encoding)
+
+    assert len(compressed) < len(BODY) // 10
+    assert decompress_body(compressed, encoding) == BODY
+    assert decompress_body(compress_body(BODY.decode(), encoding), encoding) == BODY
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_compress_body_streams(encoding):
+    chunks = compress_body(io.BytesIO(BODY), encoding)
+
+    assert not isinstance(chunks, bytes)
+    assert decompress_body(b"".join(chunks), encoding) == BODY
+    chunks = compress_body(iter([BODY[:10], BODY[10:]]), encoding)
+    assert decompress_body(b"".join(chunks), encoding) == BODY
+
+
+def test_compress_body_rejects_unknown_encoding():
+    with pytest.raises(ValueError):
+        compress_body(BODY, "lzma")
+
+
+def test_gzip_body_is_standard_gzip():
+    assert gzip.decompress(compress_body(BODY, "gzip")) == BODY
+
+
+def test_encoding_headers_do_not_change_canonical_string():
+    headers = {
+        "Content-Type": "application/json",
+        "x-altus-date": "Fri, 28 Aug 2020 20:38:38 GMT",
+    }
+    expected = create_canonical_request_string("POST", "https://h/a", headers, "x")
+
+    headers["Content-Encoding"] = "gzip"
+    headers["Accept-Encoding"] = accept_encoding()
+
+    assert create_canonical_request_string("POST", "https://h/a", headers, "x") == (
+        expected
+    )
+
+
+def test_response_encoding():
+    assert response_encoding("gzip, deflate") == "gzip"
+    assert response_encoding("gzip;q=0, deflate") is None
+    assert response_encoding(None) is None
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_make_request_compresses_body(server, encoding):
+    headers = {"Content-Type": "application/json"}
+
+    response = make_request(
+        "POST",
+        server.url + "/api/v1/iam/getAccount",
+        headers,
+        BODY,
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        body_encoding=encoding,
+    )
+
+    assert response.status_code == 200
+    assert headers["Content-Encoding"] == encoding
+    assert response.timings.size_upload < len(BODY) // 10
+
+
+def test_make_request_compresses_streamed_body(server):
+    response = make_request(
+        "POST",
+        server.url + "/api/v1/iam/getAccount",
+        {"Content-Type": "application/json"},
+        io.BytesIO(BODY),
+        "ABC",
+        PRIVATE_KEY,
+        True,
+        session=requests.Session(),
+        body_encoding="gzip",
+    )
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "accept",
+    ["gzip", pytest.param("zstd", marks=ENCODINGS[1].marks), "identity"],
+)
+def test_make_request_decodes_streamed_response(server, accept):
+    response = make_request(
+        "POST",
+        server.url + "/api/v1/iam/listUsers",
+        {"Content-Type": "application/json", "Accept-Encoding": accept},
+        "{}",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        stream=True,
+    )
+    body = b"".join(response.iter_content(1024))
+    response.timings.finish(response)
+
+    assert len(json.loads(body)["users"]) == 200
+    if accept == "identity":
+        assert "Content-Encoding" not in response.headers
+        assert response.timings.size_download == len(body)
+    else:
+        assert response.headers["Content-Encoding"] == accept
+        assert response.timings.size_download < len(body) // 5
+
+
+def test_inner_main_compressed(server, capsys):
+    inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "--compressed",
+            "--compress-body",
+            "gzip",
+            "-w",
+            "%{size_download}",
+            "--access_key",
+            "ABC",
+            "--private_key",
+            PRIVATE_KEY,
+            server.url + "/api/v1/iam/listUsers",
+        ],
+    )
+
+    body, _, size_download = capsys.readouterr().out.rpartition("\n")
+    assert len(json.loads(body)["users"]) == 200
+    assert int(size_download) < len(body) // 5
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.session import close_sessions
+
+# The ed25519 private key that tests sign with, for access key ID "ABC".
+PRIVATE_KEY = "Mzjg58S93/qdg0HuVP6PsLSRDTe+fQZ5++v/mkUUx4k="
+JSON_BODY = b'{"items": []}'
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    """
+    Answers every POST with JSON_BODY.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(JSON_BODY)))
+        self.end_headers()
+        self.wfile.write(JSON_BODY)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def signed_request(uri, data="{}", **kwargs):
+    """
+    POST data to uri with make_request, signed with PRIVATE_KEY.
+    """
+    return make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        data,
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        **kwargs,
+    )
+
+
+@pytest.fixture()
+def http_server():
+    """
+    Start local HTTP servers for the duration of a test. Call the fixture
+    value with a request handler class to get the base URL of a new server.
+    """
+    servers = []
+
+    def serve(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return "http://127.0.0.1:{0}".format(server.server_address[1])
+
+    yield serve
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture()
+def base_uri(http_server):
+    """
+    The base URL of a JsonHandler server, with the session pool emptied
+    before and after the test.
+    """
+    close_sessions()
+    yield http_server(JsonHandler)
+    close_sessions()
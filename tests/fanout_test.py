@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for fan-out to several profiles and hosts.
+"""
+
+import base64
+import json
+
+from unittest.mock import Mock
+
+import pytest
+
+from cdpcurl.cdpcurl import inner_main
+from cdpcurl.fanout import (
+    expand_profiles,
+    fanout_targets,
+    host_uri,
+    is_profile_pattern,
+    region_uri,
+    run_fanout,
+)
+from cdpcurl.mockserver import MockCdpServer, public_key_from_private_key
+from tests.conftest import PRIVATE_KEY
+
+PRIVATE_KEYS = {
+    "team-a": PRIVATE_KEY,
+    "team-b": base64.b64encode(bytes(range(32))).decode(),
+    "other": base64.b64encode(bytes(range(1, 33))).decode(),
+}
+URI = "https://api.us-west-1.cdp.cloudera.com/api/v1/environments2/listEnvironments"
+
+
+@pytest.fixture()
+def credentials(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("CDP_ACCESS_KEY_ID", raising=False)
+    monkeypatch.delenv("CDP_PRIVATE_KEY", raising=False)
+    monkeypatch.delenv("CDP_PROFILE", raising=False)
+    (tmp_path / ".cdp").mkdir()
+    path = tmp_path / ".cdp" / "credentials"
+    path.write_text(
+        "".join(
+            "[{0}]\ncdp_access_key_id = {0}-key\ncdp_private_key = {1}\n".format(
+                profile,
+                private_key,
+            )
+            for profile, private_key in PRIVATE_KEYS.items()
+        ),
+    )
+    return str(path)
+
+
+@pytest.fixture()
+def servers():
+    # Both servers accept the team profiles; neither accepts "other".
+    public_keys = {
+        profile + "-key": public_key_from_private_key(PRIVATE_KEYS[profile])
+        for profile in ("team-a", "team-b")
+    }
+    with MockCdpServer(public_keys=public_keys) as first, MockCdpServer(
+        public_keys=public_keys,
+    ) as second:
+        yield [server.url.split("//")[1] for server in (first, second)]
+
+
+def _response(status, body):
+    response = Mock()
+    response.status_code = status
+    response.json.return_value = json.loads(body)
+    return response
+
+
+def test_is_profile_pattern():
+    assert not is_profile_pattern("default")
+    assert is_profile_pattern("a,b")
+    assert is_profile_pattern("team-*")
+
+
+def test_expand_profiles(credentials):
+    assert expand_profiles("team-*, other,team-a", credentials) == [
+        "team-a",
+        "team-b",
+        "other",
+    ]
+    assert expand_profiles("missing,team-b", credentials) == ["missing", "team-b"]
+    with pytest.raises(Exception, match="No CDP profile matches 'prod-\\*'"):
+        expand_profiles("prod-*", credentials)
+
+
+def test_host_uri():
+    assert host_uri(URI + "?a=1", "localhost:8080") == (
+        "https://localhost:8080/api/v1/environments2/listEnvironments?a=1"
+    )
+
+
+def test_region_uri():
+    assert region_uri(URI, "eu-1") == (
+        "https://api.eu-1.cdp.cloudera.com/api/v1/environments2/listEnvironments"
+    )
+    assert region_uri("https://{region}.example.com/api", "ap-1") == (
+        "https://ap-1.example.com/api"
+    )
+    with pytest.raises(ValueError):
+        region_uri("https://localhost/api", "eu-1")
+
+
+def test_fanout_targets():
+    assert fanout_targets(URI, ["a", "b"], hosts=["h1", "h2:8443"]) == [
+        ("a", "https://h1/api/v1/environments2/listEnvironments"),
+        ("a", "https://h2:8443/api/v1/environments2/listEnvironments"),
+        ("b", "https://h1/api/v1/environments2/listEnvironments"),
+        ("b", "https://h2:8443/api/v1/environments2/listEnvironments"),
+    ]
+    assert fanout_targets(URI, ["a"]) == [("a", URI)]
+
+
+def test_run_fanout():
+    headers = {"Content-Type": "application/json"}
+
+    def request_fn(method, uri, data, headers, profile):
+        headers["x-altus-date"] = "now"
+        if profile == "b":
+            raise Exception("boom")
+        return _response(200, '{"environments": []}')
+
+    results = list(
+        run_fanout(
+            fanout_targets(URI, ["a", "b"], hosts=["h1", "h2"]),
+            request_fn,
+            "POST",
+            "{}",
+            headers,
+            concurrency=2,
+        )
+    )
+
+    assert [(result["profile"], result["host"]) for result in results] == [
+        ("a", "h1"),
+        ("a", "h2"),
+        ("b", "h1"),
+        ("b", "h2"),
+    ]
+    assert results[0]["status"] == 200
+    assert results[0]["body"] == {"environments": []}
+    assert results[2]["error"] == "boom"
+    assert all(result["latency"] >= 0 for result in results)
+    assert headers == {"Content-Type": "application/json"}
+
+
+def test_inner_main_fanout(credentials, servers, capsys):
+    status = inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "--profile",
+            "team-*",
+            "--hosts",
+            ",".join(servers),
+            "http://localhost/api/v1/iam/listUsers",
+        ],
+    )
+
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert status == 0
+    assert [(result["profile"], result["host"]) for result in output] == [
+        ("team-a", servers[0]),
+        ("team-a", servers[1]),
+        ("team-b", servers[0]),
+        ("team-b", servers[1]),
+    ]
+    assert all(result["status"] == 200 for result in output)
+    assert all(len(result["body"]["users"]) == 100 for result in output)
+
+
+def test_inner_main_fanout_merge(credentials, servers, capsys):
+    status = inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "--profile",
+            "team-a,other",
+            "--hosts",
+            servers[0],
+            "--merge",
+            "http://localhost/api/v1/iam/getAccount",
+        ],
+    )
+
+    output = json.loads(capsys.readouterr().out)
+    assert status == 1
+    assert [(result["profile"], result["status"]) for result in output] == [
+        ("team-a", 200),
+        ("other", 401),
+    ]
+
+
+def test_inner_main_fanout_single_profile_uses_access_key(credentials, servers, capsys):
+    status = inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "--profile",
+            "other",
+            "--access_key",
+            "team-b-key",
+            "--private_key",
+            PRIVATE_KEYS["team-b"],
+            "--hosts",
+            ",".join(servers),
+            "http://localhost/api/v1/iam/getAccount",
+        ],
+    )
+
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert status == 0
+    assert [result["profile"] for result in output] == ["other", "other"]
+
+
+def test_inner_main_fanout_rejects_batch(credentials):
+    with pytest.raises(SystemExit):
+        inner_main(["--batch", "-", "--profile", "a,b"])
+
+
+def test_inner_main_fanout_rejects_write_out(credentials, capsys):
+    with pytest.raises(SystemExit):
+        inner_main(["-w", "%{http_code}", "--profile", "a,b", URI])
+
+    assert "several profiles" in capsys.readouterr().err
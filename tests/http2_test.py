@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for the HTTP/2 transport.
+"""
+
+import io
+import json
+import sys
+import warnings
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+from benchmarks.stub import ACCESS_KEY, PRIVATE_KEY, StubHandler, https_stub_server
+from cdpcurl.cdpcurl import inner_main, make_request
+from cdpcurl.mockserver import MockCdpServer, public_key_from_private_key
+from cdpcurl.session import close_sessions, create_session
+from cdpcurl.trace import Tracer
+
+
+@pytest.fixture(autouse=True)
+def pooled_sessions():
+    warnings.simplefilter("ignore")
+    close_sessions()
+    yield
+    close_sessions()
+
+
+@pytest.fixture(scope="module")
+def h2_uri():
+    with https_stub_server(http2=True) as base_uri:
+        yield base_uri + "/api/v1/iam/getAccount"
+
+
+def _request(uri, data="{}", **kwargs):
+    return make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        data,
+        ACCESS_KEY,
+        PRIVATE_KEY,
+        False,
+        verify=False,
+        http2=True,
+        **kwargs,
+    )
+
+
+def test_make_request_http2(h2_uri):
+    output = io.StringIO()
+
+    response = _request(h2_uri, tracer=Tracer(output))
+
+    assert response.status_code == 200
+    assert response.content == StubHandler.body
+    assert response.raw.version == 20
+    assert "* ALPN: server accepted h2\n" in output.getvalue()
+    assert "> POST /api/v1/iam/getAccount HTTP/2\n" in output.getvalue()
+    assert "< HTTP/2 200" in output.getvalue()
+    variables = response.timings.variables()
+    assert variables["num_connects"] == 1
+    assert 0 < variables["time_connect"] <= variables["time_appconnect"]
+    assert variables["time_appconnect"] <= variables["time_starttransfer"]
+    assert variables["size_upload"] == 2
+    assert variables["size_download"] == len(StubHandler.body)
+
+
+def test_make_request_http2_multiplexes(h2_uri):
+    _request(h2_uri)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        responses = list(executor.map(lambda _: _request(h2_uri), range(64)))
+
+    assert all(response.status_code == 200 for response in responses)
+    assert sum(response.timings.num_connects for response in responses) == 0
+
+
+def test_make_request_http2_streams_body(h2_uri):
+    response = _request(h2_uri, data=iter([b'{"a": ', b"1}"]))
+
+    assert response.status_code == 200
+    assert response.timings.size_upload == 8
+
+
+def test_make_request_http2_falls_back_to_http1():
+    with https_stub_server() as base_uri:
+        response = _request(base_uri + "/api/v1/iam/getAccount")
+
+    assert response.status_code == 200
+    assert response.raw.version == 11
+    assert response.content == StubHandler.body
+
+
+def test_make_request_http2_plain_http_decodes_response():
+    with MockCdpServer(
+        public_keys={ACCESS_KEY: public_key_from_private_key(PRIVATE_KEY)},
+        items=50,
+        page_size=50,
+        compress_responses=True,
+    ) as server:
+        response = _request(server.url + "/api/v1/iam/listUsers", stream=True)
+        body = b"".join(response.iter_content(1024))
+        response.timings.finish(response)
+
+    assert response.raw.version == 11
+    assert response.headers["Content-Encoding"] in ("gzip", "zstd")
+    assert len(json.loads(body)["users"]) == 50
+    assert response.timings.size_download < len(body)
+
+
+def test_make_request_http2_connection_error():
+    with https_stub_server() as base_uri:
+        pass
+
+    with pytest.raises(requests.ConnectionError):
+        _request(base_uri + "/api/v1/iam/getAccount")
+
+
+def test_create_session_without_httpx(monkeypatch):
+    monkeypatch.setitem(sys.modules, "cdpcurl.http2", None)
+
+    with pytest.raises(Exception, match=r"cdpcurl\[http2\]"):
+        create_session(http2=True)
+
+
+def test_inner_main_http2(h2_uri, capsys):
+    inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "--http2",
+            "-k",
+            "-v",
+            "--access_key",
+            ACCESS_KEY,
+            "--private_key",
+            PRIVATE_KEY,
+            h2_uri,
+        ],
+    )
+
+    output = capsys.readouterr().out
+    assert "* ALPN: server accepted h2\n" in output
+    assert output.endswith(StubHandler.body.decode() + "\n")
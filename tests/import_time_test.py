@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.conftest import PRIVATE_KEY
+
+# Generous enough for a slow CI machine; a module that pulls in requests or
+# cryptography at import time blows well past it. Override with
+# CDPCURL_IMPORT_BUDGET_MS.
+IMPORT_BUDGET_MS = float(os.environ.get("CDPCURL_IMPORT_BUDGET_MS", "150"))
+
+HEAVY_MODULES = ["requests", "urllib3", "cryptography", "configargparse"]
+
+IMPORT_ONLY = """
+import json, sys
+import {module}
+sys.stderr.write(json.dumps(sorted(sys.modules)))
+"""
+
+RUN_MAIN = """
+import json, sys
+from {module} import inner_main
+try:
+    inner_main({argv!r})
+except SystemExit:
+    pass
+sys.stderr.write(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _modules_loaded_by(module, argv=None):
+    if argv is None:
+        script = IMPORT_ONLY.format(module=module)
+    else:
+        script = RUN_MAIN.format(module=module, argv=argv)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(json.loads(result.stderr))
+
+
+def _import_time_ms(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError("no import time reported for " + module)
+
+
+@pytest.mark.parametrize("module", ["cdpcurl.cdpcurl", "cdpcurl.cdpv1sign"])
+def test_import_loads_no_heavy_modules(module):
+    loaded = _modules_loaded_by(module)
+
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_cdpcurl_help_does_not_import_requests():
+    loaded = _modules_loaded_by("cdpcurl.cdpcurl", ["--help"])
+
+    assert "requests" not in loaded
+    assert "urllib3" not in loaded
+    assert "cryptography" not in loaded
+
+
+def test_cdpsign_does_not_import_requests():
+    loaded = _modules_loaded_by(
+        "cdpcurl.cdpv1sign",
+        ["--access_key", "ABC", "--private_key", PRIVATE_KEY, "https://host/a"],
+    )
+
+    assert "cryptography" in loaded
+    assert "requests" not in loaded
+    assert "urllib3" not in loaded
+
+
+@pytest.mark.parametrize("module", ["cdpcurl.cdpcurl", "cdpcurl.cdpv1sign"])
+def test_import_time_budget(module):
+    # Take the best of a few runs to smooth out scheduling noise.
+    import_time_ms = min(_import_time_ms(module) for _ in range(3))
+
+    assert import_time_ms < IMPORT_BUDGET_MS
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tempfile
+import time
+
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from benchmarks.stub import write_self_signed_cert
+from cdpcurl.cdpcurl import make_paginated_request, make_request
+from cdpcurl.cdpv1sign import make_signature_header
+from cdpcurl.mockserver import (
+    MockCdpServer,
+    list_key,
+    public_key_from_private_key,
+)
+from tests.conftest import PRIVATE_KEY
+
+OTHER_PRIVATE_KEY = "AAECAwQFBgcICQoLDA0ODxAREhMUFRYXGBkaGxwdHh8="
+PUBLIC_KEYS = {"ABC": public_key_from_private_key(PRIVATE_KEY)}
+
+
+@pytest.fixture()
+def mock_server():
+    servers = []
+
+    def start(**kwargs):
+        kwargs.setdefault("public_keys", PUBLIC_KEYS)
+        server = MockCdpServer(**kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.stop()
+
+
+def _post(uri, data="{}", private_key=PRIVATE_KEY):
+    return make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        data,
+        "ABC",
+        private_key,
+        False,
+        session=requests.Session(),
+    )
+
+
+def test_list_key():
+    assert list_key("/api/v1/environments2/listEnvironments") == "environments"
+    assert list_key("/api/v1/iam/listUsers?x=1") == "users"
+    assert list_key("/api/v1/iam/getAccount") is None
+    assert list_key("/api/v1/iam/list") is None
+
+
+def test_accepts_signed_request(mock_server):
+    server = mock_server(body_size=100)
+
+    response = _post(server.url + "/api/v1/iam/getAccount")
+
+    assert response.status_code == 200
+    assert response.json() == {"path": "/api/v1/iam/getAccount", "padding": "x" * 100}
+    assert server.stats() == {"requests": 1, "ok": 1}
+
+
+def test_accepts_signed_request_with_query(mock_server):
+    server = mock_server()
+
+    response = _post(server.url + "/api/v1/iam/getAccount?a=b")
+
+    assert response.status_code == 200
+
+
+def test_rejects_other_key(mock_server):
+    server = mock_server()
+
+    response = _post(
+        server.url + "/api/v1/iam/getAccount", private_key=OTHER_PRIVATE_KEY
+    )
+
+    assert response.status_code == 401
+    assert response.json() == {
+        "code": "UNAUTHENTICATED",
+        "message": "signature does not match",
+    }
+    assert server.stats() == {"requests": 1, "rejected": 1}
+
+
+def test_rejects_unsigned_request(mock_server):
+    server = mock_server()
+
+    response = requests.post(server.url + "/api/v1/iam/getAccount", data="{}")
+
+    assert response.status_code == 401
+    assert response.json()["message"] == "missing x-altus-auth header"
+
+
+def test_rejects_skewed_date(mock_server):
+    server = mock_server(max_skew=60)
+    uri = server.url + "/api/v1/iam/getAccount"
+    headers = {
+        "Content-Type": "application/json",
+        "x-altus-date": formatdate(usegmt=True),
+    }
+    headers["x-altus-auth"] = make_signature_header(
+        "POST", uri, headers, "ABC", PRIVATE_KEY
+    )
+    assert requests.post(uri, headers=headers, data="{}").status_code == 200
+
+    headers["x-altus-date"] = formatdate(timeval=time.time() - 3600, usegmt=True)
+    headers["x-altus-auth"] = make_signature_header(
+        "POST", uri, headers, "ABC", PRIVATE_KEY
+    )
+    response = requests.post(uri, headers=headers, data="{}")
+
+    assert response.status_code == 401
+    assert "seconds from server time" in response.json()["message"]
+
+
+def test_paginates_list_calls(mock_server):
+    server = mock_server(items=25, page_size=10)
+
+    pages = list(
+        make_paginated_request(
+            "POST",
+            server.url + "/api/v1/environments2/listEnvironments",
+            {"Content-Type": "application/json"},
+            "{}",
+            "ABC",
+            PRIVATE_KEY,
+            session=requests.Session(),
+        )
+    )
+
+    assert [len(page["environments"]) for page in pages] == [10, 10, 5]
+    assert [item["index"] for page in pages for item in page["environments"]] == list(
+        range(25)
+    )
+    assert server.stats() == {"requests": 3, "ok": 3}
+
+
+def test_canned_response(mock_server):
+    server = mock_server(responses={"/api/v1/iam/getAccount": {"account": "x"}})
+
+    response = _post(server.url + "/api/v1/iam/getAccount")
+
+    assert response.json() == {"account": "x"}
+
+
+def test_throttles(mock_server):
+    server = mock_server(throttle_rate=1.0, retry_after=7)
+
+    response = _post(server.url + "/api/v1/iam/getAccount")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+    assert server.stats() == {"requests": 1, "throttled": 1}
+
+
+def test_throttles_above_max_rps(mock_server):
+    server = mock_server(public_keys=None, max_rps=3)
+    uri = server.url + "/api/v1/iam/getAccount"
+
+    with requests.Session() as session:
+        statuses = [session.post(uri, data="{}").status_code for _ in range(20)]
+
+    # The one second window may roll over once during the loop.
+    assert 3 <= statuses.count(200) <= 6
+    assert statuses.count(429) == 20 - statuses.count(200)
+
+
+def test_injects_errors(mock_server):
+    server = mock_server(error_rate=1.0)
+
+    response = _post(server.url + "/api/v1/iam/getAccount")
+
+    assert response.status_code == 500
+    assert response.json()["code"] == "INTERNAL"
+
+
+def test_rejects_non_object_body(mock_server):
+    server = mock_server()
+
+    response = _post(server.url + "/api/v1/iam/getAccount", data="[1]")
+
+    assert response.status_code == 400
+
+
+def test_stats_endpoint(mock_server):
+    server = mock_server()
+    _post(server.url + "/api/v1/iam/getAccount")
+
+    response = requests.get(server.url + "/_mock/stats")
+
+    assert response.json() == {"requests": 1, "ok": 1}
+
+
+def test_https(mock_server):
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = write_self_signed_cert(directory)
+        server = mock_server(certfile=cert_path, keyfile=key_path)
+
+        response = make_request(
+            "POST",
+            server.url + "/api/v1/iam/getAccount",
+            {"Content-Type": "application/json"},
+            "{}",
+            "ABC",
+            PRIVATE_KEY,
+            False,
+            verify=cert_path,
+            session=requests.Session(),
+        )
+
+    assert server.url.startswith("https://localhost:")
+    assert response.status_code == 200
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for streaming response output.
+"""
+
+import os
+import subprocess
+import sys
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from cdpcurl.cdpcurl import inner_main
+from tests.conftest import PRIVATE_KEY
+
+CREDENTIAL_ARGS = ["--access_key", "ABC", "--private_key", PRIVATE_KEY]
+
+LARGE_BODY_SIZE = 256 * 1024 * 1024
+RSS_BUDGET_KB = 128 * 1024
+
+
+class BodyHandler(BaseHTTPRequestHandler):
+    body = b'{"quote": "it\'s"}'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class LargeBodyHandler(BodyHandler):
+    def do_GET(self):
+        chunk = b"x" * (1024 * 1024)
+        self.send_response(200)
+        self.send_header("Content-Length", str(LARGE_BODY_SIZE))
+        self.end_headers()
+        for _ in range(LARGE_BODY_SIZE // len(chunk)):
+            self.wfile.write(chunk)
+
+
+@pytest.mark.parametrize(
+    "output_format, expected",
+    [
+        ("string", b'{"quote": "it\'s"}\n'),
+        ("bytes-literal", b'b\'{"quote": "it\\\'s"}\'\n'),
+    ],
+)
+def test_output_formats(http_server, capfdbinary, output_format, expected):
+    base_uri = http_server(BodyHandler)
+
+    inner_main(CREDENTIAL_ARGS + ["-f", output_format, base_uri + "/"])
+
+    output = capfdbinary.readouterr().out
+    assert output == expected
+    if output_format == "bytes-literal":
+        assert output == str(BodyHandler.body).encode("ascii") + b"\n"
+
+
+def test_output_file(http_server, tmp_path):
+    base_uri = http_server(BodyHandler)
+    output = tmp_path / "body.json"
+
+    inner_main(CREDENTIAL_ARGS + ["-o", str(output), base_uri + "/"])
+
+    assert output.read_bytes() == BodyHandler.body
+
+
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="needs os.wait4")
+@pytest.mark.parametrize("to_file", [False, True])
+def test_large_body_memory_is_bounded(http_server, to_file):
+    base_uri = http_server(LargeBodyHandler)
+    argv = [sys.executable, "-m", "cdpcurl"] + CREDENTIAL_ARGS
+    if to_file:
+        argv += ["-o", os.devnull]
+
+    process = subprocess.Popen(
+        argv + [base_uri + "/"],
+        stdout=subprocess.DEVNULL,
+    )
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = status
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    scale = 1024 if sys.platform == "darwin" else 1
+
+    assert status == 0
+    assert rusage.ru_maxrss / scale < RSS_BUDGET_KB
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+
+import pytest
+import requests
+
+from requests import Response
+
+from cdpcurl.cdpcurl import inner_main
+from cdpcurl.cdpv1sign import CdpV1Auth
+from cdpcurl.paginate import iter_items, paginate
+from tests.conftest import PRIVATE_KEY
+
+
+def _response(status_code, body):
+    response = Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+class FakeListApi:
+    """
+    Serves three pages of two items each, keyed by startingToken.
+    """
+
+    def __init__(self):
+        self.bodies = []
+        self._calls = threading.Condition()
+
+    def __call__(self, data):
+        body = json.loads(data)
+        with self._calls:
+            self.bodies.append(body)
+            self._calls.notify_all()
+        page = int(body.get("startingToken", "0"))
+        result = {"items": [page * 2, page * 2 + 1]}
+        if page < 2:
+            result["nextToken"] = str(page + 1)
+        return _response(200, result)
+
+    def wait_for_calls(self, count, timeout=5):
+        """
+        Wait until at least count pages were requested.
+        """
+        with self._calls:
+            return self._calls.wait_for(lambda: len(self.bodies) >= count, timeout)
+
+
+def test_paginate_follows_next_token():
+    api = FakeListApi()
+
+    pages = list(paginate(api, '{"filter": "x"}', page_size=2))
+
+    assert [page["items"] for page in pages] == [[0, 1], [2, 3], [4, 5]]
+    assert api.bodies == [
+        {"filter": "x", "pageSize": 2},
+        {"filter": "x", "pageSize": 2, "startingToken": "1"},
+        {"filter": "x", "pageSize": 2, "startingToken": "2"},
+    ]
+
+
+def test_paginate_prefetches_next_page():
+    api = FakeListApi()
+    pages = paginate(api, "")
+
+    next(pages)
+
+    # The second page is requested before the first one is consumed.
+    assert api.wait_for_calls(2)
+    assert len(api.bodies) == 2
+    pages.close()
+
+
+def test_iter_items():
+    assert list(iter_items(paginate(FakeListApi(), "{}"), "items")) == list(range(6))
+
+
+def test_paginate_raises_http_errors():
+    pages = paginate(lambda data: _response(403, {"code": "FORBIDDEN"}), "{}")
+
+    with pytest.raises(requests.HTTPError) as error:
+        next(pages)
+
+    assert error.value.response.json() == {"code": "FORBIDDEN"}
+
+
+def test_inner_main_paginate_items(mocker, capsys):
+    api = FakeListApi()
+    request = mocker.patch("requests.Session.request")
+    request.side_effect = lambda method, uri, data, **kwargs: api(data)
+
+    status = inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "--paginate-items",
+            "items",
+            "--access_key",
+            "ABC",
+            "--private_key",
+            PRIVATE_KEY,
+            "https://host/api/v1/environments2/listEnvironments",
+        ],
+    )
+
+    output = capsys.readouterr().out.splitlines()
+    assert status == 0
+    assert [json.loads(line) for line in output] == list(range(6))
+    assert request.call_count == 3
+    for call in request.call_args_list:
+        assert isinstance(call.kwargs["auth"], CdpV1Auth)
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import socket
+
+from urllib.parse import urlsplit
+
+import requests
+
+import pytest
+
+from cdpcurl.mockserver import MockCdpServer, public_key_from_private_key
+from cdpcurl.proxy import SigningProxy
+from tests.conftest import PRIVATE_KEY
+
+
+@pytest.fixture()
+def upstream():
+    with MockCdpServer(
+        public_keys={"ABC": public_key_from_private_key(PRIVATE_KEY)},
+        items=5,
+        page_size=2,
+    ) as server:
+        yield server
+
+
+@pytest.fixture()
+def proxy(upstream):
+    with SigningProxy("ABC", PRIVATE_KEY, upstream=upstream.url, port=0) as proxy:
+        yield proxy
+
+
+def _raw_request(proxy, request):
+    url = urlsplit(proxy.url)
+    with socket.create_connection((url.hostname, url.port)) as sock:
+        sock.sendall(request)
+        chunks = []
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return b"".join(chunks)
+            chunks.append(data)
+
+
+def test_signs_and_forwards_origin_form(proxy, upstream):
+    response = requests.post(
+        proxy.url + "/api/v1/iam/listUsers",
+        json={"startingToken": "2"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "users": [
+            {"id": "users-000002", "index": 2},
+            {"id": "users-000003", "index": 3},
+        ],
+        "nextToken": "4",
+    }
+    assert upstream.stats() == {"requests": 1, "ok": 1}
+
+
+def test_signs_and_forwards_absolute_form(proxy, upstream):
+    response = requests.post(
+        upstream.url + "/api/v1/iam/getAccount",
+        data="{}",
+        proxies={"http": proxy.url},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"path": "/api/v1/iam/getAccount"}
+
+
+def test_forwards_absolute_form_over_https(proxy, mocker):
+    make_request = mocker.patch(
+        "cdpcurl.proxy.make_request",
+        side_effect=requests.ConnectionError("refused"),
+    )
+
+    response = requests.post(
+        "http://api.us-west-1.cdp.cloudera.com/api/v1/iam/getAccount",
+        data="{}",
+        proxies={"http": proxy.url},
+    )
+
+    assert response.status_code == 502
+    assert make_request.call_args[0][1] == (
+        "https://api.us-west-1.cdp.cloudera.com/api/v1/iam/getAccount"
+    )
+
+
+def test_refuses_absolute_form_to_other_hosts(proxy, upstream):
+    other = upstream.url.replace("127.0.0.1", "localhost")
+
+    response = requests.post(
+        other + "/api/v1/iam/getAccount",
+        data="{}",
+        proxies={"http": proxy.url},
+    )
+
+    assert response.status_code == 403
+    assert upstream.stats() == {}
+
+
+def test_is_allowed(upstream):
+    proxy = SigningProxy("ABC", PRIVATE_KEY, upstream=upstream.url, port=0)
+    try:
+        assert proxy.is_allowed(upstream.url + "/a")
+        assert proxy.is_allowed("https://api.us-west-1.cdp.cloudera.com/a")
+        assert not proxy.is_allowed("https://evil.example.com/a")
+        assert not proxy.is_allowed(
+            "https://api.us-west-1.cdp.cloudera.com@evil.example.com/a"
+        )
+    finally:
+        proxy.stop()
+
+
+def test_only_forwards_client_accept_encoding(proxy, upstream):
+    upstream.compress_responses = True
+
+    # requests would send its own Accept-Encoding.
+    head, _, body = _raw_request(
+        proxy,
+        b"POST /api/v1/iam/getAccount HTTP/1.1\r\nHost: proxy\r\n"
+        b"Content-Length: 2\r\nConnection: close\r\n\r\n{}",
+    ).partition(b"\r\n\r\n")
+    assert b"content-encoding" not in head.lower()
+    assert json.loads(body) == {"path": "/api/v1/iam/getAccount"}
+
+    response = requests.post(
+        proxy.url + "/api/v1/iam/getAccount",
+        data="{}",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json() == {"path": "/api/v1/iam/getAccount"}
+
+
+def test_rejects_malformed_content_length(proxy):
+    response = _raw_request(
+        proxy,
+        b"POST /api/v1/iam/getAccount HTTP/1.1\r\nHost: proxy\r\n"
+        b"Content-Length: nope\r\n\r\n",
+    )
+
+    assert response.startswith(b"HTTP/1.1 400")
+
+    assert requests.get(proxy.url + "/_cdpcurl/stats").json()["in_flight"] == 0
+
+
+def test_signing_errors_are_server_errors(proxy, mocker):
+    mocker.patch("cdpcurl.proxy.make_request", side_effect=Exception("boom"))
+
+    response = requests.post(proxy.url + "/api/v1/iam/getAccount", data="{}")
+    stats = requests.get(proxy.url + "/_cdpcurl/stats").json()
+
+    assert response.status_code == 500
+    assert response.json() == {"message": "Could not sign request: boom"}
+    assert stats["in_flight"] == 0
+    assert stats["upstream_errors"] == 1
+
+
+def test_replaces_client_signing_headers(proxy):
+    response = requests.post(
+        proxy.url + "/api/v1/iam/getAccount",
+        data="{}",
+        headers={"x-altus-auth": "forged", "x-altus-date": "yesterday"},
+    )
+
+    assert response.status_code == 200
+
+
+def test_forwards_chunked_body(proxy):
+    response = requests.post(
+        proxy.url + "/api/v1/iam/getAccount",
+        data=iter([b'{"a":', b" 1}"]),
+    )
+
+    assert response.status_code == 200
+
+
+def test_passes_upstream_errors_through(proxy, upstream):
+    upstream.error_rate = 1.0
+
+    response = requests.post(proxy.url + "/api/v1/iam/getAccount", data="{}")
+
+    assert response.status_code == 500
+    assert response.json()["code"] == "INTERNAL"
+
+
+def test_stats(proxy):
+    with requests.Session() as session:
+        for _ in range(5):
+            session.post(proxy.url + "/api/v1/iam/getAccount", data="{}")
+        stats = session.get(proxy.url + "/_cdpcurl/stats").json()
+
+    assert stats["requests"] == 5
+    assert stats["statuses"] == {"200": 5}
+    assert stats["in_flight"] == 0
+    assert stats["latency_p50_ms"] > 0
+
+
+def test_upstream_failure_is_bad_gateway():
+    with SigningProxy(
+        "ABC",
+        PRIVATE_KEY,
+        upstream="http://127.0.0.1:9",
+        port=0,
+    ) as proxy:
+        response = requests.get(proxy.url + "/api/v1/iam/getAccount")
+        stats = requests.get(proxy.url + "/_cdpcurl/stats").json()
+
+    assert response.status_code == 502
+    assert stats["upstream_errors"] == 1
+
+
+def test_origin_form_needs_upstream():
+    with SigningProxy("ABC", PRIVATE_KEY, port=0) as proxy:
+        response = requests.get(proxy.url + "/api/v1/iam/getAccount")
+
+    assert response.status_code == 400
+
+
+def test_rejects_bad_private_key():
+    with pytest.raises(Exception, match="ed25519v1"):
+        SigningProxy("ABC", "not a key", port=0)
+
+
+def test_rejects_bad_upstream():
+    with pytest.raises(ValueError):
+        SigningProxy("ABC", PRIVATE_KEY, upstream="ftp://host", port=0)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for client-side rate limiting and adaptive concurrency.
+"""
+
+import io
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from cdpcurl.cdpcurl import inner_main, make_request
+from cdpcurl.mockserver import MockCdpServer, public_key_from_private_key
+from cdpcurl.ratelimit import (
+    AdaptiveConcurrency,
+    TokenBucket,
+    get_concurrency_controller,
+    get_rate_limiter,
+    parse_rate,
+)
+from tests.conftest import PRIVATE_KEY
+
+PUBLIC_KEYS = {"ABC": public_key_from_private_key(PRIVATE_KEY)}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_parse_rate():
+    assert parse_rate("10") == 10
+    assert parse_rate("10/s") == 10
+    assert parse_rate("120/m") == 2
+    assert parse_rate("1800/h") == 0.5
+    with pytest.raises(ValueError):
+        parse_rate("10/d")
+    with pytest.raises(ValueError):
+        parse_rate("0/s")
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(4, burst=2, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.25, 0.25, 0.25]
+    assert clock.now == 0.75
+
+
+def test_token_bucket_refills_up_to_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(10, burst=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        bucket.acquire()
+
+    clock.now += 60
+
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.0, 0.1]
+
+
+def test_token_bucket_is_shared_fairly_between_threads():
+    bucket = TokenBucket(100, burst=1)
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: bucket.acquire(), range(21)))
+
+    assert time.monotonic() - start >= 0.19
+
+
+def test_registry_shares_by_host_and_access_key():
+    limiter = get_rate_limiter("https://shared-host/a", "key1", 5)
+
+    assert get_rate_limiter("https://SHARED-HOST/b", "key1", 5) is limiter
+    assert get_rate_limiter("https://shared-host/a", "key2", 5) is not limiter
+    assert get_rate_limiter("https://shared-host/a", "key1", 8, 2) is limiter
+    assert (limiter.rate, limiter.burst) == (8, 2)
+
+    controller = get_concurrency_controller("https://shared-host/a", "key1")
+    assert get_concurrency_controller("https://shared-host/c", "key1") is controller
+
+
+def test_adaptive_concurrency_increases_additively():
+    controller = AdaptiveConcurrency(initial=2, maximum=4)
+
+    for _ in range(2):
+        controller.release(controller.acquire(), 200)
+    assert controller.limit == 2
+
+    for _ in range(20):
+        controller.release(controller.acquire(), 200)
+    assert controller.limit == 4
+
+
+def test_adaptive_concurrency_decreases_once_per_window():
+    controller = AdaptiveConcurrency(initial=8, maximum=8)
+    slots = [controller.acquire() for _ in range(8)]
+
+    for slot in slots:
+        controller.release(slot, 429)
+    assert controller.limit == 4
+
+    controller.release(controller.acquire(), 503)
+    assert controller.limit == 2
+
+    controller.release(controller.acquire(), error=True)
+    controller.release(controller.acquire(), error=True)
+    assert controller.limit == 1
+    assert controller.in_flight == 0
+
+
+def test_adaptive_concurrency_decreases_on_rising_latency():
+    controller = AdaptiveConcurrency(initial=8, maximum=8, smoothing=1.0)
+
+    controller.release(controller.acquire(), 200, latency=0.01)
+    controller.release(controller.acquire(), 200, latency=0.015)
+    assert controller.limit == 8
+
+    controller.release(controller.acquire(), 200, latency=0.05)
+    assert controller.limit == 4
+
+
+def test_adaptive_concurrency_blocks_at_limit():
+    controller = AdaptiveConcurrency(initial=1, maximum=1)
+    slot = controller.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        controller.acquire()
+        acquired.set()
+
+    threading.Thread(target=acquire, daemon=True).start()
+    assert not acquired.wait(0.1)
+
+    controller.release(slot, 200)
+    assert acquired.wait(5)
+
+
+def test_adaptive_concurrency_validates_limits():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(initial=10, maximum=4)
+
+
+def _post(uri, **kwargs):
+    return make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        "{}",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        **kwargs,
+    )
+
+
+def test_rate_limit_avoids_server_throttling():
+    with MockCdpServer(public_keys=PUBLIC_KEYS, max_rps=30) as server:
+        uri = server.url + "/api/v1/iam/getAccount"
+        limiter = TokenBucket(20, burst=2)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(
+                executor.map(lambda _: _post(uri, rate_limiter=limiter), range(30))
+            )
+
+    assert [response.status_code for response in responses] == [200] * 30
+    assert max(response.timings.time_queued for response in responses) > 0
+
+
+def test_adaptive_concurrency_backs_off_when_throttled():
+    with MockCdpServer(public_keys=PUBLIC_KEYS, throttle_rate=0.3, seed=1) as server:
+        uri = server.url + "/api/v1/iam/getAccount"
+        controller = AdaptiveConcurrency(initial=16, maximum=16)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            statuses = list(
+                executor.map(
+                    lambda _: _post(uri, concurrency=controller).status_code,
+                    range(64),
+                )
+            )
+
+    assert 429 in statuses
+    assert controller.limit < 16
+    assert controller.in_flight == 0
+
+
+def test_inner_main_batch_rate(monkeypatch, capsys):
+    with MockCdpServer(public_keys=PUBLIC_KEYS, max_rps=10) as server:
+        uri = server.url + "/api/v1/iam/getAccount"
+        lines = "".join('{"method": "POST", "uri": "%s"}\n' % uri for _ in range(12))
+        monkeypatch.setattr("sys.stdin", io.StringIO(lines))
+
+        status = inner_main(
+            [
+                "--batch",
+                "-",
+                "--concurrency",
+                "8",
+                "--rate",
+                "8/s",
+                "--burst",
+                "1",
+                "--adaptive-concurrency",
+                "--access_key",
+                "ABC",
+                "--private_key",
+                PRIVATE_KEY,
+            ],
+        )
+
+    assert status == 0
+    assert capsys.readouterr().out.count('"status": 200') == 12
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for streamed request bodies.
+"""
+
+import io
+import os
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from cdpcurl.cdpcurl import inner_main
+from tests.conftest import PRIVATE_KEY
+
+CREDENTIAL_ARGS = ["--access_key", "ABC", "--private_key", PRIVATE_KEY]
+
+BINARY_BODY = bytes(range(256)) * 1024 + b"\r\n\r\n"
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """
+    Records the body and framing headers of each POST.
+    """
+
+    received = []
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size + 2)[:size]
+                if not size:
+                    break
+                body += chunk
+        else:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.received.append(
+            {
+                "body": body,
+                "content-length": self.headers.get("Content-Length"),
+                "transfer-encoding": self.headers.get("Transfer-Encoding"),
+                "x-altus-auth": self.headers.get("x-altus-auth"),
+            },
+        )
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture()
+def echo_uri(http_server):
+    EchoHandler.received = []
+    return http_server(EchoHandler) + "/api/v1/test/doTestThing"
+
+
+def test_data_from_file_is_sent_unmodified(echo_uri, tmp_path, capsys):
+    post_data = tmp_path / "body.bin"
+    post_data.write_bytes(BINARY_BODY)
+
+    inner_main(CREDENTIAL_ARGS + ["-X", "POST", "-d", "@" + str(post_data), echo_uri])
+
+    (received,) = EchoHandler.received
+    assert received["body"] == BINARY_BODY
+    assert received["content-length"] == str(len(BINARY_BODY))
+    assert received["transfer-encoding"] is None
+    assert received["x-altus-auth"]
+
+
+def test_data_from_stdin_pipe_is_chunked(echo_uri, monkeypatch, capsys):
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, "wb") as writer:
+        writer.write(BINARY_BODY[:60000])
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(os.fdopen(read_fd, "rb")))
+
+    inner_main(CREDENTIAL_ARGS + ["-X", "POST", "-d", "@-", echo_uri])
+
+    (received,) = EchoHandler.received
+    assert received["body"] == BINARY_BODY[:60000]
+    assert received["transfer-encoding"] == "chunked"
+
+
+def test_data_from_redirected_stdin_has_length(echo_uri, tmp_path, monkeypatch):
+    post_data = tmp_path / "body.bin"
+    post_data.write_bytes(BINARY_BODY)
+
+    with open(post_data, "rb") as stdin:
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(stdin))
+        inner_main(CREDENTIAL_ARGS + ["-X", "POST", "-d", "@-", echo_uri])
+
+    (received,) = EchoHandler.received
+    assert received["body"] == BINARY_BODY
+    assert received["content-length"] == str(len(BINARY_BODY))
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for retries.
+"""
+
+import io
+import itertools
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from cdpcurl.cdpcurl import inner_main, make_request
+from cdpcurl.clock import DateProvider
+from cdpcurl.mockserver import public_key_from_private_key, verify_request
+from cdpcurl.retry import RetryPolicy, is_read_only_operation, parse_retry_after
+from tests.conftest import PRIVATE_KEY
+
+PUBLIC_KEYS = {"ABC": public_key_from_private_key(PRIVATE_KEY)}
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """
+    Answers the first len(statuses) requests with those statuses, and 200
+    after that. Records the signing date and body of every request, and
+    whether its signature verified.
+    """
+
+    protocol_version = "HTTP/1.1"
+    statuses = []
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        error = verify_request("POST", self.path, self.headers, PUBLIC_KEYS, 1e10)
+        self.received.append((self.headers["x-altus-date"], body, error))
+        status = self.statuses.pop(0) if self.statuses else 200
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture()
+def flaky_server(http_server):
+    def start(*statuses):
+        FlakyHandler.statuses = list(statuses)
+        FlakyHandler.received = []
+        return http_server(FlakyHandler)
+
+    return start
+
+
+def _policy(delays, **kwargs):
+    return RetryPolicy(sleep=delays.append, **kwargs)
+
+
+def _post(uri, data="{}", retry=None, clock=None):
+    return make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        data,
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=requests.Session(),
+        retry=retry,
+        clock=clock,
+    )
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:10 GMT", now=4) == 6.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:10 GMT", now=40) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_is_read_only_operation():
+    assert is_read_only_operation("https://host/api/v1/iam/listUsers")
+    assert is_read_only_operation("https://host/api/v1/iam/getAccount")
+    assert is_read_only_operation("https://host/api/v1/dl/describeDatalake?x")
+    assert not is_read_only_operation("https://host/api/v1/iam/createUser")
+
+
+def test_is_retryable():
+    policy = RetryPolicy()
+    create = "https://host/api/v1/iam/createUser"
+    describe = "https://host/api/v1/iam/describeUser"
+
+    assert policy.is_retryable("POST", create, status=429)
+    assert not policy.is_retryable("POST", create, status=503)
+    assert policy.is_retryable("POST", describe, status=503)
+    assert policy.is_retryable("get", create, status=503)
+    assert not policy.is_retryable("GET", create, status=404)
+    assert policy.is_retryable("GET", create, error=requests.ConnectionError())
+    assert not policy.is_retryable("GET", create, error=ValueError())
+    assert RetryPolicy(retry_methods=["post"]).is_retryable(
+        "POST",
+        create,
+        status=503,
+    )
+
+
+def test_delay_backs_off_with_jitter():
+    policy = RetryPolicy(backoff=1.0, max_backoff=5.0)
+
+    for retry_number, ceiling in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 5.0), (9, 5.0)]:
+        delays = [policy.delay(retry_number) for _ in range(50)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def test_delay_caps_retry_after_without_max_time():
+    response = requests.Response()
+    response.headers["Retry-After"] = "86400"
+
+    assert RetryPolicy().delay(0, response) == 120.0
+    assert RetryPolicy(max_retry_after=5).delay(0, response) == 5.0
+    assert RetryPolicy(max_time=10).delay(0, response) == 86400.0
+
+    response.headers["Retry-After"] = "3"
+    assert RetryPolicy().delay(0, response) == 3.0
+
+
+def test_retries_with_fresh_signatures(flaky_server):
+    uri = flaky_server(429, 503) + "/api/v1/iam/listUsers"
+    delays = []
+    clock = DateProvider(now=itertools.count(1000000, 10).__next__)
+
+    response = _post(uri, retry=_policy(delays), clock=clock)
+
+    assert response.status_code == 200
+    dates = [date for date, _, _ in FlakyHandler.received]
+    assert len(dates) == 3
+    assert len(set(dates)) == 3
+    assert [error for _, _, error in FlakyHandler.received] == [None] * 3
+    assert delays[0] == 0.0
+    assert response.timings.num_retries == 2
+    assert response.timings.time_backoff == sum(delays)
+
+
+def test_gives_up_after_retries(flaky_server):
+    uri = flaky_server(503, 503, 503) + "/api/v1/iam/listUsers"
+    delays = []
+
+    response = _post(uri, retry=_policy(delays, retries=2))
+
+    assert response.status_code == 503
+    assert len(delays) == 2
+    assert response.timings.num_retries == 2
+
+
+def test_does_not_retry_non_idempotent_errors(flaky_server):
+    uri = flaky_server(503) + "/api/v1/iam/createUser"
+
+    response = _post(uri, retry=_policy([]))
+
+    assert response.status_code == 503
+    assert len(FlakyHandler.received) == 1
+
+
+def test_retries_throttled_non_idempotent_request(flaky_server):
+    uri = flaky_server(429) + "/api/v1/iam/createUser"
+
+    response = _post(uri, retry=_policy([]))
+
+    assert response.status_code == 200
+    assert len(FlakyHandler.received) == 2
+
+
+def test_rewinds_file_body(flaky_server):
+    uri = flaky_server(429, 429) + "/api/v1/iam/createUser"
+    body = io.BytesIO(b'xx{"a": 1}')
+    body.read(2)
+
+    response = _post(uri, data=body, retry=_policy([]))
+
+    assert response.status_code == 200
+    assert [body for _, body, _ in FlakyHandler.received] == [b'{"a": 1}'] * 3
+
+
+def test_does_not_retry_generator_body(flaky_server):
+    uri = flaky_server(429) + "/api/v1/iam/createUser"
+
+    response = _post(uri, data=iter([b"{}"]), retry=_policy([]))
+
+    assert response.status_code == 429
+    assert len(FlakyHandler.received) == 1
+
+
+def test_max_time_stops_retries(flaky_server):
+    uri = flaky_server(503) + "/api/v1/iam/listUsers"
+    policy = _policy([], max_time=0.5, backoff=10.0, max_backoff=10.0)
+    policy.delay = lambda retry_number, response=None: 1.0
+
+    response = _post(uri, retry=policy)
+
+    assert response.status_code == 503
+    assert response.timings.num_retries == 0
+
+
+def test_retries_connection_errors(mocker):
+    policy = _policy([])
+    session = requests.Session()
+    request = mocker.patch.object(session, "request")
+    ok = requests.Response()
+    ok.status_code = 200
+    ok._content = b"{}"
+    request.side_effect = [requests.ConnectionError("reset"), ok]
+
+    response = make_request(
+        "GET",
+        "https://host/api/v1/iam/createUser",
+        {},
+        "",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=session,
+        retry=policy,
+    )
+
+    assert response.status_code == 200
+    assert request.call_count == 2
+
+
+def test_inner_main_retry(flaky_server, capsys):
+    uri = flaky_server(429, 429) + "/api/v1/iam/createUser"
+
+    inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "--retry",
+            "3",
+            "-w",
+            "%{http_code} %{num_retries}\\n",
+            "--access_key",
+            "ABC",
+            "--private_key",
+            PRIVATE_KEY,
+            uri,
+        ],
+    )
+
+    assert capsys.readouterr().out == "{}\n200 2\n"
+
+
+def test_inner_main_retry_on(flaky_server):
+    uri = flaky_server(503, 503) + "/api/v1/iam/listUsers"
+
+    with pytest.raises(requests.HTTPError):
+        inner_main(
+            [
+                "-X",
+                "POST",
+                "--retry",
+                "3",
+                "--retry-on",
+                "500",
+                "--access_key",
+                "ABC",
+                "--private_key",
+                PRIVATE_KEY,
+                uri,
+            ],
+        )
+
+    assert len(FlakyHandler.received) == 1
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from cdpcurl.cdpcurl import make_request
+from cdpcurl.session import close_sessions, get_session
+from tests.conftest import PRIVATE_KEY
+
+
+@pytest.fixture(autouse=True)
+def clean_pool():
+    close_sessions()
+    yield
+    close_sessions()
+
+
+def test_get_session_reuses_session_per_host():
+    first = get_session("https://api.us-west-1.cdp.cloudera.com/api/v1/a")
+    second = get_session("https://API.us-west-1.cdp.cloudera.com/api/v1/b")
+
+    assert first is second
+
+
+def test_get_session_keys_on_scheme_port_and_tls_settings():
+    session = get_session("https://host/path")
+
+    assert get_session("http://host/path") is not session
+    assert get_session("https://host:8443/path") is not session
+    assert get_session("https://host/path", verify=False) is not session
+    assert get_session("https://host/path", verify="/etc/ca.pem") is not session
+
+
+def test_get_session_pool_size():
+    session = get_session("https://host/path", pool_size=32)
+
+    assert session.get_adapter("https://host/path")._pool_maxsize == 32
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = (self.headers.get("Cookie") or "").encode()
+        self.send_response(200)
+        self.send_header("Set-Cookie", "session=secret; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def test_pooled_sessions_keep_no_cookies(http_server):
+    uri = http_server(CookieHandler) + "/"
+    session = get_session(uri)
+
+    assert session.get(uri).text == ""
+    assert session.get(uri).text == ""
+    assert len(session.cookies) == 0
+
+
+def test_pooled_http2_sessions_keep_no_cookies(http_server):
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    uri = http_server(CookieHandler) + "/"
+    session = get_session(uri, http2=True)
+
+    assert session.get(uri).text == ""
+    assert session.get(uri).text == ""
+    assert len(session.cookies) == 0
+
+
+def test_make_request_uses_given_session(mocker):
+    session = mocker.Mock()
+
+    make_request(
+        "GET",
+        "https://host/path",
+        {"content-type": "application/json"},
+        "",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        session=session,
+    )
+
+    session.request.assert_called_once()
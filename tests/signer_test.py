@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for the reusable request signer.
+"""
+
+import io
+import json
+
+import pytest
+
+from cdpcurl import cdpv1sign
+from cdpcurl.cdpv1sign import (
+    CdpV1Signer,
+    create_canonical_request_string,
+    create_encoded_authn_params_string,
+    create_signature_header,
+    create_signature_string,
+    get_signer,
+    inner_main,
+    make_signature_header,
+    sign_many,
+)
+from tests.conftest import PRIVATE_KEY
+
+
+def test_signer_matches_stage_functions():
+    uri = "https://cdpapitest.cloudera.com/api/v1/test/doTestThing"
+    headers = {
+        "content-type": "application/json",
+        "x-altus-date": "Tue, 3 Jun 2008 11:05:30 GMT",
+    }
+
+    canonical_string = create_canonical_request_string(
+        "POST",
+        uri,
+        headers,
+        "ed25519v1",
+    )
+    expected = create_signature_header(
+        create_encoded_authn_params_string("ABC", "ed25519v1"),
+        create_signature_string(canonical_string, PRIVATE_KEY),
+    )
+
+    assert CdpV1Signer("ABC", PRIVATE_KEY).sign("POST", uri, headers) == expected
+    assert make_signature_header("POST", uri, headers, "ABC", PRIVATE_KEY) == expected
+
+
+def test_get_signer_caches_per_credential():
+    signer = get_signer("ABC", PRIVATE_KEY)
+
+    assert get_signer("ABC", PRIVATE_KEY) is signer
+    assert get_signer("DEF", PRIVATE_KEY) is not signer
+
+
+def test_signer_rejects_other_key_types():
+    with pytest.raises(Exception, match="Only ed25519v1 keys are supported"):
+        CdpV1Signer("ABC", "NOPE")
+
+    with pytest.raises(Exception, match="Not an Ed25519 private key"):
+        CdpV1Signer("ABC", "A" * 44)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sign_many_matches_make_signature_header(monkeypatch, workers):
+    monkeypatch.setattr(cdpv1sign, "PARALLEL_SIGN_CHUNK_SIZE", 4)
+    date = "Tue, 3 Jun 2008 11:05:30 GMT"
+    requests = [
+        ("POST", "https://host/api/v1/test/%d" % i, "application/json")
+        for i in range(20)
+    ]
+    requests.append(("GET", "https://host/", None))
+
+    signed = sign_many(requests, "ABC", PRIVATE_KEY, date=date, workers=workers)
+
+    assert len(signed) == len(requests)
+    for (method, uri, content_type), headers in zip(requests, signed):
+        expected = {"x-altus-date": date}
+        if content_type is not None:
+            expected["Content-Type"] = content_type
+        expected["x-altus-auth"] = make_signature_header(
+            method,
+            uri,
+            expected,
+            "ABC",
+            PRIVATE_KEY,
+        )
+        assert headers == expected
+
+
+def test_inner_main_batch(monkeypatch, capsys):
+    monkeypatch.setattr(
+        "sys.stdin",
+        io.StringIO(
+            '{"method": "POST", "uri": "https://host/a"}\n'
+            "\n"
+            "not json\n"
+            '{"uri": "https://host/b", "content_type": "text/plain"}\n'
+            '{"uri": 5}\n'
+            '{"method": 1, "uri": "https://host/c"}\n',
+        ),
+    )
+
+    status = inner_main(
+        ["--batch", "-", "--access_key", "ABC", "--private_key", PRIVATE_KEY],
+    )
+
+    output = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert status == 0
+    assert [result["line"] for result in output] == [1, 3, 4, 5, 6]
+    assert "error" in output[1]
+    assert output[3] == {"line": 5, "error": "Batch request 'uri' must be a string"}
+    assert output[4] == {
+        "line": 6,
+        "error": "Batch request 'method' must be a string",
+    }
+    assert output[0]["headers"]["Content-Type"] == "application/json"
+    assert output[2]["headers"]["Content-Type"] == "text/plain"
+    assert output[2]["headers"]["x-altus-auth"] == make_signature_header(
+        "GET",
+        "https://host/b",
+        output[2]["headers"],
+        "ABC",
+        PRIVATE_KEY,
+    )
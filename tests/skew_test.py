@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for clock skew estimation and correction.
+"""
+
+import datetime
+import json
+import time
+
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from cdpcurl.cdpcurl import inner_main, make_request
+from cdpcurl.cdpv1sign import CdpV1Auth
+from cdpcurl.mockserver import MockCdpServer, public_key_from_private_key
+from cdpcurl.session import close_sessions
+from cdpcurl.skew import SkewEstimator, response_skew
+from tests.conftest import PRIVATE_KEY
+
+PUBLIC_KEYS = {"ABC": public_key_from_private_key(PRIVATE_KEY)}
+URL = "https://api.us-west-1.cdp.cloudera.com/api/v1/iam/getAccount"
+
+
+def _response(skew, status=200, sent_skew=0.0, url=URL):
+    # Date is truncated to the second, so center it on the wanted skew.
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response.elapsed = datetime.timedelta(0)
+    response.headers["Date"] = formatdate(time.time() + skew - 0.5, usegmt=True)
+    response.request = requests.Request(
+        "POST",
+        url,
+        headers={"x-altus-date": formatdate(time.time() + sent_skew, usegmt=True)},
+    ).prepare()
+    return response
+
+
+@pytest.fixture()
+def skewed_server():
+    close_sessions()
+    server = MockCdpServer(public_keys=PUBLIC_KEYS, clock_offset=600).start()
+    yield server
+    server.stop()
+    close_sessions()
+
+
+def _post(uri, skew=None):
+    return make_request(
+        "POST",
+        uri,
+        {"Content-Type": "application/json"},
+        "{}",
+        "ABC",
+        PRIVATE_KEY,
+        False,
+        skew=skew,
+    )
+
+
+def test_response_skew():
+    assert response_skew(_response(60)) == pytest.approx(60, abs=1)
+    assert response_skew(_response(-60)) == pytest.approx(-60, abs=1)
+
+    response = _response(0)
+    del response.headers["Date"]
+    assert response_skew(response) is None
+
+
+def test_estimator_smooths_samples():
+    skew = SkewEstimator(alpha=0.5)
+    assert skew.estimate(URL) is None
+    assert skew.offset(URL) == 0.0
+
+    skew.observe(_response(10))
+    assert skew.estimate(URL) == pytest.approx(10, abs=1)
+    first = skew.estimate(URL)
+
+    skew.observe(_response(14))
+    assert skew.estimate(URL) == pytest.approx((first + 14) / 2, abs=1)
+    assert skew.offset(URL) == skew.estimate(URL)
+
+    # A clock step replaces the estimate.
+    skew.observe(_response(-100))
+    assert skew.estimate(URL) == pytest.approx(-100, abs=1)
+
+    # Each host has its own estimate.
+    assert skew.estimate("https://other.example.com/") is None
+
+
+def test_estimator_ignores_offsets_below_a_second():
+    skew = SkewEstimator()
+    response = _response(0)
+    response.headers["Date"] = formatdate(time.time(), usegmt=True)
+
+    skew.observe(response)
+
+    assert abs(skew.estimate(URL)) < 1
+    assert skew.offset(URL) == 0.0
+
+
+def test_estimator_counts_rejections():
+    skew = SkewEstimator()
+
+    assert not skew.observe(_response(600, status=200))
+    assert not skew.observe(_response(600, status=401, sent_skew=590))
+    assert not skew.observe(_response(600, status=500))
+    assert skew.observe(_response(600, status=401))
+    assert skew.observe(_response(-600, status=403))
+    assert skew.rejections == 2
+
+
+def test_estimator_state_file(tmp_path):
+    state_path = str(tmp_path / "state" / "skew.json")
+    skew = SkewEstimator(state_path=state_path)
+    skew.observe(_response(42))
+    skew.save()
+
+    loaded = SkewEstimator(state_path=state_path)
+    assert loaded.estimate(URL) == skew.estimate(URL)
+
+    with open(state_path, "w") as state_file:
+        json.dump(
+            {
+                "old.example.com": {"skew": 5.0, "updated": time.time() - 2e5},
+                "new.example.com": {"skew": 7.0, "updated": time.time()},
+            },
+            state_file,
+        )
+    loaded = SkewEstimator(state_path=state_path)
+    assert loaded.estimate("https://old.example.com/") is None
+    assert loaded.estimate("https://new.example.com/") == 7.0
+
+    # Nothing is written when nothing was learned.
+    with open(state_path, "w") as state_file:
+        state_file.write("not json")
+    loaded = SkewEstimator(state_path=state_path)
+    assert loaded.estimate(URL) is None
+    loaded.save()
+    with open(state_path, "r") as state_file:
+        assert state_file.read() == "not json"
+
+
+def test_make_request_corrects_skew(skewed_server):
+    uri = skewed_server.url + "/api/v1/iam/getAccount"
+    assert _post(uri).status_code == 401
+
+    skew = SkewEstimator()
+    first = _post(uri, skew)
+    second = _post(uri, skew)
+
+    assert first.status_code == 200
+    assert first.timings.num_skew_rejections == 1
+    assert second.status_code == 200
+    assert second.timings.num_skew_rejections == 0
+    assert skew.rejections == 1
+    assert skew.estimate(uri) == pytest.approx(600, abs=2)
+    assert skewed_server.stats()["rejected"] == 2
+
+
+def test_auth_corrects_skew(skewed_server):
+    uri = skewed_server.url + "/api/v1/iam/getAccount"
+    skew = SkewEstimator()
+
+    with requests.Session() as session:
+        session.auth = CdpV1Auth("ABC", PRIVATE_KEY, skew=skew)
+        first = session.post(uri, json={})
+        second = session.post(uri, json={})
+
+    assert first.status_code == 401
+    assert second.status_code == 200
+    assert skew.rejections == 1
+
+
+def test_inner_main_skew_correction_is_opt_in(skewed_server, capsys):
+    argv = [
+        "-X",
+        "POST",
+        "-d",
+        "{}",
+        "--access_key",
+        "ABC",
+        "--private_key",
+        PRIVATE_KEY,
+        skewed_server.url + "/api/v1/iam/getAccount",
+    ]
+
+    with pytest.raises(requests.HTTPError):
+        inner_main(argv)
+    assert skewed_server.stats()["rejected"] == 1
+
+    assert inner_main(["--skew-correction"] + argv) == 0
+    assert "1 request(s) rejected for clock skew" in capsys.readouterr().err
+    assert skewed_server.stats()["rejected"] == 2
+
+
+def test_inner_main_skew_state(skewed_server, tmp_path, capsys):
+    state_path = str(tmp_path / "skew.json")
+    argv = [
+        "-X",
+        "POST",
+        "-d",
+        "{}",
+        "--access_key",
+        "ABC",
+        "--private_key",
+        PRIVATE_KEY,
+        "--skew-state",
+        state_path,
+        skewed_server.url + "/api/v1/iam/getAccount",
+    ]
+
+    assert inner_main(argv) == 0
+    assert "1 request(s) rejected for clock skew" in capsys.readouterr().err
+    with open(state_path, "r") as state_file:
+        assert list(json.load(state_file)) == [skewed_server.url.split("//")[1]]
+
+    assert inner_main(argv) == 0
+    assert "clock skew" not in capsys.readouterr().err
+    assert skewed_server.stats()["rejected"] == 1
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for request timings and --write-out.
+"""
+
+import json
+import socket
+
+import pytest
+
+from cdpcurl.cdpcurl import inner_main
+from cdpcurl.timing import write_out
+from tests.conftest import JSON_BODY, PRIVATE_KEY, signed_request
+
+
+def test_write_out():
+    variables = {"http_code": 200, "time_total": 0.5, "size_download": 10}
+
+    assert (
+        write_out("%{http_code} %{time_total}s %{nope} 100%%\\n\\t", variables)
+        == "200 0.500000s %{nope} 100%\n\t"
+    )
+    assert json.loads(write_out("%{json}", variables)) == variables
+
+
+def test_make_request_timings(base_uri):
+    first = signed_request(base_uri + "/api/v1/first").timings.variables()
+    second = signed_request(base_uri + "/api/v1/second").timings.variables()
+
+    assert first["num_connects"] == 1
+    assert 0 < first["time_namelookup"] <= first["time_connect"]
+    assert first["time_appconnect"] == 0
+    assert first["time_connect"] <= first["time_pretransfer"]
+    assert first["time_pretransfer"] <= first["time_starttransfer"]
+    assert first["time_starttransfer"] <= first["time_total"]
+    assert first["time_signing"] > 0
+    assert first["size_download"] == len(JSON_BODY)
+    assert first["size_upload"] == 2
+    assert first["http_code"] == 200
+
+    assert second["num_connects"] == 0
+    assert second["time_connect"] == 0
+    assert second["time_starttransfer"] > 0
+
+
+def test_make_request_tries_each_address_once(base_uri, mocker):
+    getaddrinfo = socket.getaddrinfo
+    connect = socket.socket.connect
+    attempts = []
+
+    def resolve(host, port, *args, **kwargs):
+        if host == "localhost":
+            return [
+                (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", port)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+            ]
+        return getaddrinfo(host, port, *args, **kwargs)
+
+    def refuse_first(sock, address):
+        attempts.append(address[0])
+        if address[0] == "192.0.2.1":
+            raise ConnectionRefusedError()
+        return connect(sock, address)
+
+    mocker.patch("socket.getaddrinfo", resolve)
+    mocker.patch("socket.socket.connect", refuse_first)
+
+    response = signed_request(
+        base_uri.replace("127.0.0.1", "localhost") + "/api/v1/first"
+    )
+
+    assert response.status_code == 200
+    assert attempts == ["192.0.2.1", "127.0.0.1"]
+
+
+def test_inner_main_write_out(base_uri, capsys):
+    inner_main(
+        [
+            "-X",
+            "POST",
+            "-d",
+            "{}",
+            "-w",
+            "%{http_code} %{size_download}\\n",
+            "--access_key",
+            "ABC",
+            "--private_key",
+            PRIVATE_KEY,
+            base_uri + "/api/v1/first",
+        ],
+    )
+
+    assert capsys.readouterr().out == JSON_BODY.decode() + "\n200 %d\n" % len(JSON_BODY)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2025 Cloudera, Inc.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test cases for live request tracing.
+"""
+
+import http.client
+import io
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cdpcurl.trace import Tracer
+from tests.conftest import signed_request
+
+
+def test_text_trace(base_uri):
+    output = io.StringIO()
+    tracer = Tracer(output)
+
+    signed_request(base_uri + "/api/v1/first", tracer=tracer)
+    signed_request(base_uri + "/api/v1/second", tracer=tracer)
+
+    lines = output.getvalue().splitlines()
+    assert lines[0].startswith("* Connected to 127.0.0.1 (127.0.0.1) port ")
+    assert lines[1] == "> POST /api/v1/first HTTP/1.1"
+    assert "> Content-Type: application/json" in lines
+    assert any(line.startswith("> x-altus-auth: ") for line in lines)
+    assert "* request body: 2 bytes sent" in lines
+    assert "< HTTP/1.1 200 OK" in lines
+    assert "< Content-Type: application/json" in lines
+    assert any(line.startswith("* Re-using existing connection") for line in lines)
+    assert http.client.HTTPConnection.debuglevel == 0
+
+
+def test_json_trace(base_uri):
+    output = io.StringIO()
+
+    signed_request(base_uri + "/api/v1/first", tracer=Tracer(output, "json"))
+
+    events = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [event["event"] for event in events] == [
+        "info",
+        "request",
+        "request_body",
+        "response",
+    ]
+    assert events[1]["request_line"] == "POST /api/v1/first HTTP/1.1"
+    assert ["Content-Type", "application/json"] in events[1]["headers"]
+    assert events[2]["bytes"] == 2
+    assert events[3]["status"] == 200
+    assert all("time" in event for event in events)
+
+
+def test_concurrent_traces_are_separate(base_uri):
+    outputs = [io.StringIO() for _ in range(8)]
+
+    def traced(index):
+        signed_request(
+            base_uri + "/api/v1/call%d" % index, tracer=Tracer(outputs[index])
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(traced, range(8)))
+
+    for index, output in enumerate(outputs):
+        request_lines = [
+            line for line in output.getvalue().splitlines() if " HTTP/1.1" in line
+        ]
+        assert request_lines[0] == "> POST /api/v1/call%d HTTP/1.1" % index
+        assert len(request_lines) == 2
+
+
+def test_untraced_request_writes_nothing(base_uri, capsys):
+    signed_request(base_uri + "/api/v1/first")
+
+    assert capsys.readouterr().out == ""
+
+
+def test_unknown_trace_format():
+    with pytest.raises(ValueError, match="Unknown trace format"):
+        Tracer(io.StringIO(), "xml")
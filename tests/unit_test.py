@@ -15,7 +15,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import datetime
 from unittest.mock import MagicMock, Mock
 
 import pytest
@@ -23,19 +22,14 @@ import pytest
 from requests import Response
 
 from cdpcurl.cdpcurl import make_request
+from cdpcurl.clock import DateProvider
 
-
-@pytest.fixture(autouse=True)
-def mock_utc(mocker):
-    mocker.patch(
-        "cdpcurl.cdpcurl.__now",
-        return_value=datetime.datetime.fromtimestamp(0, tz=datetime.timezone.utc),
-    )
+EPOCH = DateProvider(now=lambda: 0)
 
 
 @pytest.fixture()
 def cdp_request(mocker) -> MagicMock:
-    return mocker.patch("cdpcurl.cdpcurl.requests.request")
+    return mocker.patch("requests.Session.request")
 
 
 @pytest.fixture(autouse=True)
@@ -43,6 +37,8 @@ def cdp_response(cdp_request, mocker) -> Mock:
     mock_response = mocker.Mock(spec=Response)
     mock_response.status_code = 200
     mock_response.text = "some text"
+    mock_response.content = b"some text"
+    mock_response.raw = None
     cdp_request.return_value = mock_response
     return mock_response
 
@@ -58,6 +54,7 @@ def test_make_request(cdp_request):
         "access_key": "ABC",
         "private_key": "Mzjg58S93/qdg0HuVP6PsLSRDTe+fQZ5++v/mkUUx4k=",
         "data_binary": False,
+        "clock": EPOCH,
     }
 
     expected = {
@@ -74,6 +71,7 @@ def test_make_request(cdp_request):
         headers=expected,
         data=params["data"].encode("utf-8"),
         verify=True,
+        stream=False,
     )
 
 
@@ -89,6 +87,7 @@ def test_make_request_invalid_date_header():
         "access_key": "ABC",
         "private_key": "NOPE",
         "data_binary": False,
+        "clock": EPOCH,
         "verify": False,
     }
 
@@ -111,6 +110,7 @@ def test_make_request_invalid_auth_header():
         "access_key": "ABC",
         "private_key": "NOPE",
         "data_binary": False,
+        "clock": EPOCH,
         "verify": False,
     }
 
@@ -132,6 +132,7 @@ def test_make_request_invalid_private_key():
         "access_key": "ABC",
         "private_key": "NOPE",
         "data_binary": False,
+        "clock": EPOCH,
         "verify": False,
     }
 
@@ -150,6 +151,7 @@ def test_make_request_verify_ssl(cdp_request):
         "access_key": "ABC",
         "private_key": "Mzjg58S93/qdg0HuVP6PsLSRDTe+fQZ5++v/mkUUx4k=",
         "data_binary": False,
+        "clock": EPOCH,
         "verify": True,
     }
 
@@ -167,6 +169,7 @@ def test_make_request_verify_ssl(cdp_request):
         headers=expected,
         data=params["data"].encode("utf-8"),
         verify=params["verify"],
+        stream=False,
     )
 
 
@@ -181,6 +184,7 @@ def test_make_request_with_binary_data(cdp_request):
         "access_key": "ABC",
         "private_key": "Mzjg58S93/qdg0HuVP6PsLSRDTe+fQZ5++v/mkUUx4k=",
         "data_binary": True,
+        "clock": EPOCH,
     }
 
     expected = {
@@ -197,6 +201,7 @@ def test_make_request_with_binary_data(cdp_request):
         headers=expected,
         data=params["data"],
         verify=True,
+        stream=False,
     )
 
 
@@ -212,6 +217,7 @@ def test_make_request_additional_header(cdp_request):
         "access_key": "ABC",
         "private_key": "Mzjg58S93/qdg0HuVP6PsLSRDTe+fQZ5++v/mkUUx4k=",
         "data_binary": False,
+        "clock": EPOCH,
     }
 
     expected = {
@@ -229,4 +235,5 @@ def test_make_request_additional_header(cdp_request):
         headers=expected,
         data=params["data"].encode("utf-8"),
         verify=True,
+        stream=False,
     )